@@ -3,12 +3,18 @@
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
-
-from .const import CONFIG_SELECTOR_IP, DOMAIN, PLATFORMS
-from .coordinator import EcoManeDataCoordinator
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import Event, HomeAssistant
+
+from .api import async_register_views
+from .const import CONFIG_SELECTOR_IP, DOMAIN, FLEET_SCHEDULER, PLATFORMS
+from .coordinator import EcoManeDataCoordinator, backfill_store, topology_store
+from .scheduler import EcoManeFleetScheduler
+from .services import (
+    async_setup_services,
+    async_unload_entry_services,
+    async_unload_services,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,11 +25,11 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     ip = config_entry.data[CONFIG_SELECTOR_IP]
 
     # DataCoordinatorを作成
-    coordinator = EcoManeDataCoordinator(hass, ip)
-    # 初期データ取得
-    await coordinator.async_config_entry_first_refresh()
-    if not coordinator.last_update_success:
-        raise ConfigEntryNotReady("async_config_entry_first_refresh() failed")
+    coordinator = EcoManeDataCoordinator(hass, ip, config_entry.options)
+    # 保存した回路構成があればエンティティを先に作成し、デバイスとの同期は後で行う
+    # (保存がなければ使用量のエンティティのみ作成し、回路はページの取得ごとに追加)
+    # ECOマネへの取得はセットアップを待たせないよう、スケジューラへの登録後に行う
+    await coordinator.async_load_topology()
 
     # データを hass.data に保存
     hass.data.setdefault(DOMAIN, {})
@@ -33,6 +39,36 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     # エンティティの追加
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
 
+    # 統合全体のスケジューラに登録し、他の ECOマネと重ならないよう polling する
+    # 回路別電力・電力量の取得は起動を待たせずに直ちに開始
+    # (エンティティの追加の通知を受けられるようプラットフォームの準備後に登録)
+    scheduler: EcoManeFleetScheduler = hass.data[DOMAIN].setdefault(
+        FLEET_SCHEDULER, EcoManeFleetScheduler(hass)
+    )
+    scheduler.async_register(config_entry.entry_id, coordinator, refresh_now=True)
+
+    # 監視対象の回路は全体の巡回とは別に短い間隔で取得
+    if (unsub_watch := coordinator.async_start_watch()) is not None:
+        config_entry.async_on_unload(unsub_watch)
+
+    # サービスと HTTP API の登録 (全ての ECOマネで共通)
+    async_setup_services(hass)
+    async_register_views(hass)
+
+    # Home Assistant の停止時は設定エントリがアンロードされないため、ここで後始末する
+    async def async_stop(event: Event) -> None:
+        """Stop polling and close the session, parser processes and export."""
+        scheduler.async_unregister(config_entry.entry_id)
+        # 書き込みを待っている時系列の行もここで書き出される
+        await coordinator.async_close()
+
+    config_entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_stop)
+    )
+
+    # オプション変更時に再読み込み
+    config_entry.async_on_unload(config_entry.add_update_listener(async_reload_entry))
+
     # 正常にセットアップ出来たら True を返却
     return True
 
@@ -47,7 +83,32 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
 
     # クリーンアップ処理
     if unload_ok:
-        # EcoManeDataCoordinatorを削除
-        hass.data[DOMAIN].pop(config_entry.entry_id, None)
+        # 閉じた HTTP セッションで更新しないよう、先にスケジューラから外す
+        scheduler: EcoManeFleetScheduler = hass.data[DOMAIN][FLEET_SCHEDULER]
+        scheduler.async_unregister(config_entry.entry_id)
+
+        # EcoManeDataCoordinatorを削除し、HTTP セッションを閉じる
+        coordinator: EcoManeDataCoordinator | None = hass.data[DOMAIN].pop(
+            config_entry.entry_id, None
+        )
+        if coordinator is not None:
+            await coordinator.async_close()
+        async_unload_entry_services(hass, config_entry.entry_id)
+
+        # 最後の ECOマネであればスケジューラも削除
+        if scheduler.is_empty:
+            hass.data[DOMAIN].pop(FLEET_SCHEDULER)
+            async_unload_services(hass)
 
     return unload_ok
+
+
+async def async_reload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Reload a config entry when its options change."""
+    await hass.config_entries.async_reload(config_entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove the cached circuit topology and backfill checkpoint of a deleted entry."""
+    await topology_store(hass, config_entry.entry_id).async_remove()
+    await backfill_store(hass, config_entry.entry_id).async_remove()
@@ -0,0 +1,241 @@
+"""Local read-only HTTP API for Eco Mane HEMS component."""
+
+from __future__ import annotations
+
+import asyncio
+from http import HTTPStatus
+import logging
+import math
+from typing import Any
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.json import json_bytes
+
+from .const import (
+    API_STREAM_KEEPALIVE,
+    API_URL,
+    API_VIEWS,
+    DOMAIN,
+    SIGNAL_AVAILABILITY_UPDATED,
+    SIGNAL_TOPOLOGY_UPDATED,
+    SIGNAL_VALUES_UPDATED,
+    TIER_POWER,
+    TIER_USAGE,
+)
+from .coordinator import EcoManeData, EcoManeDataCoordinator, TopologyDiff
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _value(values: Any, index: int) -> float | None:
+    """Value at an index, or None if it is unknown."""
+    value = EcoManeData.value(values, index)
+    return None if math.isnan(value) else value
+
+
+def snapshot_dict(coordinator: EcoManeDataCoordinator) -> dict[str, Any]:
+    """All usage totals and circuits of the latest snapshot."""
+    data = coordinator.snapshot
+    return {
+        "version": coordinator.version,
+        "available": coordinator.last_update_success,
+        "usage": {
+            desc.key: {
+                "name": desc.translation_key,
+                "value": _value(data.usage, number),
+                "unit": desc.native_unit_of_measurement,
+            }
+            for number, desc in enumerate(coordinator.usage_sensor_descs)
+        },
+        "circuits": [
+            {
+                "selNo": circuit.selNo,
+                "place": circuit.place,
+                "circuit": circuit.circuit,
+                "power": _value(data.power, circuit.index),
+                "energy": _value(data.energy, circuit.index),
+            }
+            for circuit in coordinator.topology
+        ],
+    }
+
+
+def delta_dict(
+    coordinator: EcoManeDataCoordinator, changed: set[tuple[str, int | str]]
+) -> dict[str, Any]:
+    """Values of the changed keys (tier, usage number or selNo)."""
+    data = coordinator.snapshot
+    descs = coordinator.usage_sensor_descs
+    usage: dict[str, float | None] = {}
+    circuits: dict[str, dict[str, float | None]] = {}
+    for tier, key in changed:
+        if tier == TIER_USAGE:
+            usage[descs[int(key)].key] = _value(data.usage, int(key))
+        elif (index := coordinator.circuit_index(str(key))) is not None:
+            values = data.power if tier == TIER_POWER else data.energy
+            circuits.setdefault(str(key), {})[tier] = _value(values, index)
+    return {"version": coordinator.version, "usage": usage, "circuits": circuits}
+
+
+def _coordinator(hass: HomeAssistant, entry_id: str) -> EcoManeDataCoordinator | None:
+    """Coordinator of a loaded config entry."""
+    coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+    return coordinator if isinstance(coordinator, EcoManeDataCoordinator) else None
+
+
+class EcoManeSnapshotView(HomeAssistantView):
+    """Latest values of all circuits and usage totals as JSON."""
+
+    url = f"{API_URL}/snapshot"
+    name = "api:ecomane:snapshot"
+
+    def __init__(self) -> None:
+        """Initialize the view."""
+        # entry_id ごとの最後に作成した応答 (版が同じ間は使い回す)
+        self._cache: dict[str, tuple[str, bytes]] = {}
+
+    async def get(self, request: web.Request, entry_id: str) -> web.Response:
+        """Return the snapshot unless the client already has this version."""
+        coordinator = _coordinator(request.app[KEY_HASS], entry_id)
+        if coordinator is None:
+            return self.json_message("Entry not found", HTTPStatus.NOT_FOUND)
+        version = coordinator.version
+        etag = f'"{version}"'
+        headers = {hdrs.ETAG: etag, hdrs.CACHE_CONTROL: "no-cache"}
+        if_none_match = request.headers.get(hdrs.IF_NONE_MATCH, "")
+        if etag in if_none_match or if_none_match.strip() == "*":
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+        cached = self._cache.get(entry_id)
+        if cached is None or cached[0] != version:
+            cached = self._cache[entry_id] = (
+                version,
+                json_bytes(snapshot_dict(coordinator)),
+            )
+        return web.Response(
+            body=cached[1], content_type="application/json", headers=headers
+        )
+
+
+class EcoManeStreamView(HomeAssistantView):
+    """Server-sent events pushing the changed values after each refresh."""
+
+    url = f"{API_URL}/stream"
+    name = "api:ecomane:stream"
+
+    async def get(self, request: web.Request, entry_id: str) -> web.StreamResponse:
+        """Send the snapshot, then a delta whenever values change."""
+        hass: HomeAssistant = request.app[KEY_HASS]
+        coordinator = _coordinator(hass, entry_id)
+        if coordinator is None:
+            return self.json_message("Entry not found", HTTPStatus.NOT_FOUND)
+
+        # 送信が遅れた間の変化はまとめて送る (送信待ちが際限なく増えないように)
+        pending: set[tuple[str, int | str]] = set()
+        resend_snapshot = True
+        send_availability = False
+        wake = asyncio.Event()
+
+        @callback
+        def values_updated(changed: set[tuple[str, int | str]]) -> None:
+            pending.update(changed)
+            wake.set()
+
+        @callback
+        def topology_updated(diff: TopologyDiff) -> None:
+            nonlocal resend_snapshot
+            resend_snapshot = True
+            wake.set()
+
+        @callback
+        def availability_updated(available: bool) -> None:
+            nonlocal send_availability
+            send_availability = True
+            wake.set()
+
+        unsubs = [
+            async_dispatcher_connect(
+                hass, SIGNAL_VALUES_UPDATED.format(entry_id), values_updated
+            ),
+            async_dispatcher_connect(
+                hass, SIGNAL_TOPOLOGY_UPDATED.format(entry_id), topology_updated
+            ),
+            async_dispatcher_connect(
+                hass,
+                SIGNAL_AVAILABILITY_UPDATED.format(entry_id),
+                availability_updated,
+            ),
+        ]
+        response = web.StreamResponse(
+            headers={
+                hdrs.CONTENT_TYPE: "text/event-stream",
+                hdrs.CACHE_CONTROL: "no-cache",
+            }
+        )
+        try:
+            await response.prepare(request)
+            # エントリが再読み込み・削除されるまで配信
+            while _coordinator(hass, entry_id) is coordinator:
+                wake.clear()
+                if resend_snapshot:
+                    resend_snapshot = send_availability = False
+                    pending.clear()
+                    await self._send(
+                        response,
+                        "snapshot",
+                        coordinator.version,
+                        snapshot_dict(coordinator),
+                    )
+                elif pending:
+                    changed = set(pending)
+                    pending.clear()
+                    await self._send(
+                        response,
+                        "delta",
+                        coordinator.version,
+                        delta_dict(coordinator, changed),
+                    )
+                if send_availability:
+                    send_availability = False
+                    await self._send(
+                        response,
+                        "availability",
+                        coordinator.version,
+                        {
+                            "version": coordinator.version,
+                            "available": coordinator.last_update_success,
+                        },
+                    )
+                try:
+                    await asyncio.wait_for(wake.wait(), API_STREAM_KEEPALIVE)
+                except TimeoutError:
+                    await response.write(b": keepalive\n\n")
+        except ConnectionResetError:
+            _LOGGER.debug("Event stream client of %s disconnected", entry_id)
+        finally:
+            for unsub in unsubs:
+                unsub()
+        return response
+
+    @staticmethod
+    async def _send(
+        response: web.StreamResponse, event: str, version: str, data: dict[str, Any]
+    ) -> None:
+        """Write a server-sent event."""
+        await response.write(
+            b"event: %s\nid: %s\ndata: %s\n\n"
+            % (event.encode(), version.encode(), json_bytes(data))
+        )
+
+
+@callback
+def async_register_views(hass: HomeAssistant) -> None:
+    """Register the API views once for all config entries."""
+    if hass.data[DOMAIN].get(API_VIEWS) or getattr(hass, "http", None) is None:
+        return
+    hass.data[DOMAIN][API_VIEWS] = True
+    hass.http.register_view(EcoManeSnapshotView())
+    hass.http.register_view(EcoManeStreamView())
@@ -0,0 +1,227 @@
+"""Backfill of long-term statistics for Eco Mane HEMS component."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, timedelta
+import logging
+from typing import Any
+
+import aiohttp
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_import_statistics,
+    get_last_statistics,
+    statistic_during_period,
+    statistics_during_period,
+)
+from homeassistant.const import Platform, UnitOfEnergy
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    BACKFILL_BATCH_SIZE,
+    BACKFILL_REQUEST_DELAY,
+    DOMAIN,
+    SENSOR_CIRCUIT_ENERGY_SERVICE_TYPE,
+)
+from .coordinator import EcoManeCircuit, EcoManeDataCoordinator, backfill_store
+from .sensor import circuit_unique_id
+
+_LOGGER = logging.getLogger(__name__)
+
+# 記録された統計の source (エンティティ自身の統計)
+RECORDER_SOURCE = "recorder"
+
+
+def _day_gaps(
+    hass: HomeAssistant, statistic_ids: list[str], start: datetime, end: datetime
+) -> dict[str, tuple[float, bool]]:
+    """Sum before a day and whether later rows exist, for circuits without rows."""
+    gaps: dict[str, tuple[float, bool]] = {}
+    recorded = statistics_during_period(
+        hass, start, end, set(statistic_ids), "hour", None, {"sum"}
+    )
+    for statistic_id in statistic_ids:
+        # Home Assistant が動いていた日は記録済み (1時間でもあれば取り込まない)
+        if recorded.get(statistic_id):
+            continue
+        rows = get_last_statistics(hass, 1, statistic_id, False, {"sum"}).get(
+            statistic_id
+        )
+        if not rows:
+            gaps[statistic_id] = (0.0, False)
+            continue
+        last_sum = rows[0].get("sum") or 0.0
+        if rows[0]["start"] < start.timestamp():
+            gaps[statistic_id] = (last_sum, False)
+            continue
+        # 後の記録がある場合は、その日以降の増加分を差し引いた累計
+        change = statistic_during_period(
+            hass, start, None, statistic_id, {"change"}, None
+        ).get("change")
+        gaps[statistic_id] = (last_sum - (change or 0.0), True)
+    return gaps
+
+
+class EcoManeBackfill:
+    """Catch up yesterday's energy of each circuit in its sensor's statistics.
+
+    The device pages only expose yesterday's energy of each circuit, so a run
+    imports one day; older missing days cannot be filled and are only logged,
+    and the usage totals have no past values and are not imported.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, coordinator: EcoManeDataCoordinator
+    ) -> None:
+        """Initialize the backfill of a config entry."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._coordinator = coordinator
+        # 回路ごとに最後に取り込んだ日付 (中断しても続きから再開する)
+        self._store = backfill_store(hass, entry_id)
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        """Return True while a backfill is in progress."""
+        return self._task is not None and not self._task.done()
+
+    @callback
+    def async_start(self) -> bool:
+        """Start a backfill in the background unless one is running."""
+        if self.running:
+            return False
+        self._task = self._hass.async_create_background_task(
+            self._async_run(), f"{DOMAIN}_backfill_{self._entry_id}"
+        )
+        return True
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop a running backfill (the checkpoint is kept)."""
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _async_run(self) -> None:
+        """Import yesterday's energy of the circuits not imported yet."""
+        checkpoint = await self._store.async_load() or {"circuits": {}}
+        imported: dict[str, dict[str, Any]] = checkpoint["circuits"]
+        day = dt_util.now().date() - timedelta(days=1)
+        self._log_lost_days(imported, day)
+        start = dt_util.start_of_local_day(day)
+        end = dt_util.start_of_local_day(day + timedelta(days=1))
+        # エンティティのない回路 (回路をまとめている場合など) は取り込めない
+        registry = er.async_get(self._hass)
+        statistic_ids: dict[str, str] = {}
+        for circuit in self._coordinator.topology:
+            entity_id = registry.async_get_entity_id(
+                Platform.SENSOR,
+                DOMAIN,
+                circuit_unique_id(
+                    self._entry_id, SENSOR_CIRCUIT_ENERGY_SERVICE_TYPE, circuit.selNo
+                ),
+            )
+            if entity_id is not None:
+                statistic_ids[circuit.selNo] = entity_id
+        pending = [
+            circuit
+            for circuit in self._coordinator.topology
+            if circuit.selNo in statistic_ids
+            and imported.get(circuit.selNo, {}).get("last_day", "") < day.isoformat()
+        ]
+        _LOGGER.info(
+            "Backfilling %s of %s circuits for %s",
+            len(pending),
+            len(self._coordinator.topology),
+            day,
+        )
+
+        for batch_start in range(0, len(pending), BACKFILL_BATCH_SIZE):
+            # 失敗後の再試行中は ECOマネの負荷を増やさない (次回は続きから)
+            if self._coordinator.backing_off:
+                _LOGGER.warning("Backfill paused while the device is unavailable")
+                return
+            if batch_start:
+                await asyncio.sleep(BACKFILL_REQUEST_DELAY)
+            batch = pending[batch_start : batch_start + BACKFILL_BATCH_SIZE]
+            try:
+                energies = await self._coordinator.async_fetch_yesterday_energy(batch)
+            except (UpdateFailed, aiohttp.ClientError, TimeoutError) as err:
+                _LOGGER.warning("Backfill stopped: %s", err)
+                return
+            # 回路の統計の記録をまとめて確認する
+            gaps = await get_instance(self._hass).async_add_executor_job(
+                _day_gaps,
+                self._hass,
+                [statistic_ids[circuit.selNo] for circuit in batch],
+                start,
+                end,
+            )
+            for circuit, energy in zip(batch, energies, strict=True):
+                if energy is None:
+                    _LOGGER.debug("No energy of %s for %s", circuit.selNo, day)
+                    continue
+                statistic_id = statistic_ids[circuit.selNo]
+                if (gap := gaps.get(statistic_id)) is not None:
+                    self._import(circuit, statistic_id, end, energy, *gap)
+                imported[circuit.selNo] = {"last_day": day.isoformat()}
+            await self._store.async_save(checkpoint)
+        _LOGGER.info("Backfill for %s finished", day)
+
+    def _log_lost_days(self, imported: dict[str, dict[str, Any]], day: date) -> None:
+        """Log the days before yesterday that were missed since the last run."""
+        last_days = [
+            date.fromisoformat(last_day)
+            for circuit in imported.values()
+            if (last_day := circuit.get("last_day"))
+        ]
+        if not last_days or (first := min(last_days) + timedelta(days=1)) >= day:
+            return
+        # ECOマネのページでは一昨日以前の電力量は読めない
+        _LOGGER.warning(
+            "Energy from %s to %s can no longer be read from the device and is not imported",
+            first,
+            day - timedelta(days=1),
+        )
+
+    @callback
+    def _import(
+        self,
+        circuit: EcoManeCircuit,
+        statistic_id: str,
+        end: datetime,
+        energy: float,
+        last_sum: float,
+        later_rows: bool,
+    ) -> None:
+        """Add the daily energy of a circuit as the last hour of the day."""
+        _LOGGER.debug("Importing %s kWh of %s", energy, statistic_id)
+        metadata = StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=None,
+            source=RECORDER_SOURCE,
+            statistic_id=statistic_id,
+            unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        )
+        # 値はその日の終わりの電力量 (翌日の最初の記録はリセットとして扱われる)
+        async_import_statistics(
+            self._hass,
+            metadata,
+            [
+                StatisticData(
+                    start=end - timedelta(hours=1), state=energy, sum=last_sum + energy
+                )
+            ],
+        )
+        if later_rows:
+            # 再起動後に記録された累計にもその日の分を加える
+            get_instance(self._hass).async_adjust_statistics(
+                statistic_id, end, energy, UnitOfEnergy.KILO_WATT_HOUR
+            )
@@ -0,0 +1,197 @@
+"""Capture and replay of raw Eco Mane HEMS responses."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+import struct
+import time
+from typing import Any
+
+from .const import (
+    CAPTURE_MAX_BYTES,
+    CAPTURE_SEGMENT_BYTES,
+    SENSOR_CIRCUIT_ENDPOINT,
+    SENSOR_CIRCUIT_ENERGY_CGI,
+    SENSOR_TODAY_CGI,
+)
+from .parser import parse_circuit_bodies, parse_energy_bodies, parse_usage_body
+
+_LOGGER = logging.getLogger(__name__)
+
+# 記録の先頭 (ヘッダの JSON の長さ)
+_HEADER_LENGTH = struct.Struct(">I")
+_SEGMENT_PATTERN = "capture-*.bin.gz"
+
+
+# 取得した応答 (本文は ECOマネの Shift-JIS のまま)
+@dataclass(frozen=True, slots=True)
+class CapturedResponse:
+    """Raw response of the device with its URL and time."""
+
+    timestamp: float  # 取得時刻 (UNIX 時間)
+    endpoint: str
+    url: str
+    body: bytes
+
+
+class ResponseArchive:
+    """Size-bounded ring of gzip segments holding raw responses."""
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = CAPTURE_MAX_BYTES,
+        segment_bytes: int = CAPTURE_SEGMENT_BYTES,
+    ) -> None:
+        """Initialize the archive in a directory."""
+        self.directory = directory
+        self._max_bytes = max_bytes  # 圧縮後の全体の上限
+        self._segment_bytes = segment_bytes  # 1つのセグメントの圧縮前の上限
+        self._pending: list[CapturedResponse] = []  # 書き込み待ちの応答
+        self._segment: Path | None = None
+        self._segment_size = 0  # 書き込み中のセグメントの圧縮前の大きさ
+        self.captured = 0
+
+    def append(self, endpoint: str, url: str, body: bytes) -> None:
+        """Queue a response for the next flush (on the event loop)."""
+        self._pending.append(CapturedResponse(time.time(), endpoint, url, body))
+
+    @property
+    def has_pending(self) -> bool:
+        """Return True if responses wait for a flush."""
+        return bool(self._pending)
+
+    def flush(self) -> None:
+        """Write the queued responses to disk (in the executor)."""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self._segment is None:
+            self._segment = self._new_segment()
+        # gzip のメンバーを追記 (読み込み時は連結した1つのストリームになる)
+        with gzip.open(self._segment, "ab") as file:
+            for response in pending:
+                written = _write_record(file, response)
+                self._segment_size += written
+        self.captured += len(pending)
+        if self._segment_size >= self._segment_bytes:
+            self._segment = None
+            self._trim()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summary of the archive for the diagnostics download."""
+        return {
+            "directory": str(self.directory),
+            "captured": self.captured,
+            "pending": len(self._pending),
+        }
+
+    def _new_segment(self) -> Path:
+        """Path of a new segment after the existing ones."""
+        segments = _segments(self.directory)
+        number = (
+            int(segments[-1].name.split("-")[1].split(".")[0]) + 1 if segments else 1
+        )
+        self._segment_size = 0
+        return self.directory / f"capture-{number:06d}.bin.gz"
+
+    def _trim(self) -> None:
+        """Delete the oldest segments beyond the size limit."""
+        segments = _segments(self.directory)
+        total = sum(segment.stat().st_size for segment in segments)
+        while segments and total > self._max_bytes:
+            oldest = segments.pop(0)
+            total -= oldest.stat().st_size
+            oldest.unlink()
+            _LOGGER.debug("Capture segment %s removed", oldest.name)
+
+
+def _segments(directory: Path) -> list[Path]:
+    """Segments of an archive, oldest first."""
+    return sorted(directory.glob(_SEGMENT_PATTERN))
+
+
+def _write_record(file: Any, response: CapturedResponse) -> int:
+    """Write a record and return its size."""
+    header = json.dumps(
+        {
+            "timestamp": response.timestamp,
+            "endpoint": response.endpoint,
+            "url": response.url,
+            "size": len(response.body),
+        }
+    ).encode()
+    file.write(_HEADER_LENGTH.pack(len(header)))
+    file.write(header)
+    file.write(response.body)
+    return _HEADER_LENGTH.size + len(header) + len(response.body)
+
+
+def read_archive(directory: str | os.PathLike[str]) -> Iterator[CapturedResponse]:
+    """Read the responses of an archive in capture order."""
+    for segment in _segments(Path(directory)):
+        with gzip.open(segment, "rb") as file:
+            try:
+                while True:
+                    length = file.read(_HEADER_LENGTH.size)
+                    if len(length) < _HEADER_LENGTH.size:
+                        break
+                    header = json.loads(file.read(_HEADER_LENGTH.unpack(length)[0]))
+                    body = file.read(header["size"])
+                    yield CapturedResponse(
+                        header["timestamp"], header["endpoint"], header["url"], body
+                    )
+            except EOFError:
+                # 書き込み中に止まったセグメントの末尾
+                _LOGGER.warning("Truncated capture segment %s", segment.name)
+
+
+# 再生の結果
+@dataclass
+class ReplayStats:
+    """Parser throughput and failures of a replayed archive."""
+
+    responses: dict[str, int] = field(default_factory=dict)  # エンドポイントごと
+    failures: dict[str, int] = field(default_factory=dict)  # 値を読めなかった応答
+    bytes_parsed: int = 0
+    seconds: float = 0.0  # 解析にかかった時間
+
+    @property
+    def throughput(self) -> float:
+        """Parsed bytes per second."""
+        return self.bytes_parsed / self.seconds if self.seconds else 0.0
+
+
+def replay_archive(
+    responses: Iterator[CapturedResponse], usage_keys: list[str]
+) -> ReplayStats:
+    """Feed captured responses through the parsers as fast as possible."""
+    stats = ReplayStats()
+    for response in responses:
+        endpoint = response.endpoint
+        start = time.perf_counter()
+        if endpoint == SENSOR_TODAY_CGI:
+            failed = None in parse_usage_body(response.body, usage_keys)
+        elif endpoint == SENSOR_CIRCUIT_ENDPOINT:
+            page = parse_circuit_bodies([response.body])[0]
+            failed = page.total_page == 0 or not page.circuits
+        elif endpoint == SENSOR_CIRCUIT_ENERGY_CGI:
+            failed = parse_energy_bodies([response.body])[0] is None
+        else:
+            continue
+        stats.seconds += time.perf_counter() - start
+        stats.bytes_parsed += len(response.body)
+        stats.responses[endpoint] = stats.responses.get(endpoint, 0) + 1
+        if failed:
+            stats.failures[endpoint] = stats.failures.get(endpoint, 0) + 1
+            _LOGGER.warning(
+                "Could not parse %s captured at %s", response.url, response.timestamp
+            )
+    return stats
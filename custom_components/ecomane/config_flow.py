@@ -5,15 +5,60 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.core import HomeAssistant, callback
+import homeassistant.helpers.config_validation as cv
 
 from .const import (
+    CIRCUIT_ENTITIES,
     CONFIG_SELECTOR_IP,
     CONFIG_SELECTOR_NAME,
+    DEFAULT_ADAPTIVE_FASTER,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_CAPTURE,
+    DEFAULT_CIRCUIT_ENTITIES,
+    DEFAULT_ENERGY_CONCURRENCY,
+    DEFAULT_ENERGY_INTEGRATION,
+    DEFAULT_ENERGY_INTERVAL,
+    DEFAULT_EXPORT,
     DEFAULT_IP_ADDRESS,
     DEFAULT_NAME,
+    DEFAULT_PARSER_EXECUTOR,
+    DEFAULT_POWER_INTERVAL,
+    DEFAULT_TELEMETRY,
+    DEFAULT_USAGE_INTERVAL,
+    DEFAULT_WATCH_INTERVAL,
     DOMAIN,
+    MAX_ENERGY_CONCURRENCY,
+    MAX_TIER_INTERVAL,
+    MAX_WATCH_INTERVAL,
+    MIN_TIER_INTERVAL,
+    MIN_WATCH_INTERVAL,
+    OPTION_ADAPTIVE_FASTER,
+    OPTION_ADAPTIVE_POLLING,
+    OPTION_CAPTURE,
+    OPTION_CIRCUIT_ENTITIES,
+    OPTION_ENERGY_CONCURRENCY,
+    OPTION_ENERGY_INTEGRATION,
+    OPTION_ENERGY_INTERVAL,
+    OPTION_EXPORT,
+    OPTION_PARSER_EXECUTOR,
+    OPTION_POWER_INTERVAL,
+    OPTION_TELEMETRY,
+    OPTION_USAGE_INTERVAL,
+    OPTION_WATCH_CIRCUITS,
+    OPTION_WATCH_INTERVAL,
+    PARSER_EXECUTORS,
+)
+
+# polling 間隔 (秒) の入力値
+INTERVAL_VALIDATOR = vol.All(
+    vol.Coerce(int), vol.Range(min=MIN_TIER_INTERVAL, max=MAX_TIER_INTERVAL)
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -67,3 +112,119 @@ class EcoManeConfigFlow(ConfigFlow, domain=DOMAIN):
             data_schema=data_schema,
             errors=errors,
         )
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return EcoManeOptionsFlow()
+
+
+class EcoManeOptionsFlow(OptionsFlow):
+    """Handle an options flow for Eco Mane."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+
+        _LOGGER.debug("async_step_init")
+        if user_input is not None:
+            # オプションを保存
+            return self.async_create_entry(data=user_input)
+
+        # オプション入力フォームのスキーマ
+        options = self.config_entry.options
+
+        # 監視対象に選べる回路 (selNo: 場所 回路名), 見つからない回路も選択を残す
+        watch_circuits: list[str] = options.get(OPTION_WATCH_CIRCUITS, [])
+        circuit_choices = {selNo: selNo for selNo in watch_circuits}
+        coordinator = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        if coordinator is not None:
+            circuit_choices.update(
+                {
+                    circuit.selNo: f"{circuit.place} {circuit.circuit}"
+                    for circuit in coordinator.topology
+                }
+            )
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    OPTION_ENERGY_CONCURRENCY,
+                    default=options.get(
+                        OPTION_ENERGY_CONCURRENCY, DEFAULT_ENERGY_CONCURRENCY
+                    ),
+                ): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=MAX_ENERGY_CONCURRENCY)
+                ),
+                vol.Required(
+                    OPTION_POWER_INTERVAL,
+                    default=options.get(OPTION_POWER_INTERVAL, DEFAULT_POWER_INTERVAL),
+                ): INTERVAL_VALIDATOR,
+                vol.Required(
+                    OPTION_ENERGY_INTERVAL,
+                    default=options.get(
+                        OPTION_ENERGY_INTERVAL, DEFAULT_ENERGY_INTERVAL
+                    ),
+                ): INTERVAL_VALIDATOR,
+                vol.Required(
+                    OPTION_ENERGY_INTEGRATION,
+                    default=options.get(
+                        OPTION_ENERGY_INTEGRATION, DEFAULT_ENERGY_INTEGRATION
+                    ),
+                ): bool,
+                vol.Required(
+                    OPTION_USAGE_INTERVAL,
+                    default=options.get(OPTION_USAGE_INTERVAL, DEFAULT_USAGE_INTERVAL),
+                ): INTERVAL_VALIDATOR,
+                vol.Required(
+                    OPTION_ADAPTIVE_POLLING,
+                    default=options.get(
+                        OPTION_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+                    ),
+                ): bool,
+                vol.Required(
+                    OPTION_ADAPTIVE_FASTER,
+                    default=options.get(
+                        OPTION_ADAPTIVE_FASTER, DEFAULT_ADAPTIVE_FASTER
+                    ),
+                ): bool,
+                vol.Required(
+                    OPTION_PARSER_EXECUTOR,
+                    default=options.get(
+                        OPTION_PARSER_EXECUTOR, DEFAULT_PARSER_EXECUTOR
+                    ),
+                ): vol.In(PARSER_EXECUTORS),
+                vol.Required(
+                    OPTION_CIRCUIT_ENTITIES,
+                    default=options.get(
+                        OPTION_CIRCUIT_ENTITIES, DEFAULT_CIRCUIT_ENTITIES
+                    ),
+                ): vol.In(CIRCUIT_ENTITIES),
+                vol.Required(
+                    OPTION_WATCH_CIRCUITS, default=watch_circuits
+                ): cv.multi_select(circuit_choices),
+                vol.Required(
+                    OPTION_WATCH_INTERVAL,
+                    default=options.get(OPTION_WATCH_INTERVAL, DEFAULT_WATCH_INTERVAL),
+                ): vol.All(
+                    vol.Coerce(int),
+                    vol.Range(min=MIN_WATCH_INTERVAL, max=MAX_WATCH_INTERVAL),
+                ),
+                vol.Required(
+                    OPTION_TELEMETRY,
+                    default=options.get(OPTION_TELEMETRY, DEFAULT_TELEMETRY),
+                ): bool,
+                vol.Required(
+                    OPTION_EXPORT,
+                    default=options.get(OPTION_EXPORT, DEFAULT_EXPORT),
+                ): bool,
+                vol.Required(
+                    OPTION_CAPTURE,
+                    default=options.get(OPTION_CAPTURE, DEFAULT_CAPTURE),
+                ): bool,
+            }
+        )
+
+        # オプション入力フォームを表示
+        return self.async_show_form(step_id="init", data_schema=data_schema)
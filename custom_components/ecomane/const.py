@@ -20,6 +20,22 @@ ENTITY_NAME = "EcoManeHEMS"
 CONFIG_SELECTOR_IP = "ip"
 CONFIG_SELECTOR_NAME = "name"
 
+# Options セレクタ
+OPTION_ENERGY_CONCURRENCY = "energy_concurrency"
+OPTION_POWER_INTERVAL = "power_interval"
+OPTION_ENERGY_INTERVAL = "energy_interval"
+OPTION_ENERGY_INTEGRATION = "energy_integration"
+OPTION_USAGE_INTERVAL = "usage_interval"
+OPTION_PARSER_EXECUTOR = "parser_executor"
+OPTION_TELEMETRY = "telemetry"
+OPTION_CAPTURE = "capture"
+OPTION_EXPORT = "export"
+OPTION_CIRCUIT_ENTITIES = "circuit_entities"
+OPTION_ADAPTIVE_POLLING = "adaptive_polling"
+OPTION_ADAPTIVE_FASTER = "adaptive_faster"
+OPTION_WATCH_CIRCUITS = "watch_circuits"
+OPTION_WATCH_INTERVAL = "watch_interval"
+
 # キー
 KEY_IP_ADDRESS = "ip_address"
 
@@ -28,6 +44,7 @@ SENSOR_TODAY_CGI = "ecoTopMoni.cgi"
 
 # 回路
 SENSOR_CIRCUIT_CGI = "elecCheck_6000.cgi?disp=2"
+SENSOR_CIRCUIT_ENDPOINT = "elecCheck_6000.cgi"
 SENSOR_CIRCUIT_SELECTOR_PREFIX = "ojt"
 SENSOR_CIRCUIT_PREFIX = "em_circuit"
 SENSOR_CIRCUIT_SELECTOR_PLACE = "txt"
@@ -42,5 +59,130 @@ SENSOR_CIRCUIT_ENERGY_SELECTOR = "ttx_01"
 SENSOR_CIRCUIT_ENERGY_SERVICE_TYPE = "energy"
 
 # 時間間隔
-RETRY_INTERVAL = 120  # 再試行間隔: 120秒
 POLLING_INTERVAL = 60  # ECOマネへのpolling間隔: 60秒
+
+# 更新の種別 (種別ごとに polling 間隔を設定できる)
+TIER_POWER = "power"  # 回路別電力 (elecCheck_6000.cgi)
+TIER_ENERGY = "energy"  # 回路別電力量 (resultGraphDiv_4242.cgi)
+TIER_USAGE = "usage"  # 使用量 (ecoTopMoni.cgi)
+DEFAULT_POWER_INTERVAL = POLLING_INTERVAL  # 回路別電力の polling 間隔: 60秒
+DEFAULT_ENERGY_INTERVAL = 300  # 回路別電力量の polling 間隔: 300秒
+DEFAULT_USAGE_INTERVAL = 120  # 使用量の polling 間隔: 120秒
+MIN_TIER_INTERVAL = 5  # polling 間隔の下限: 5秒
+MAX_TIER_INTERVAL = 3600  # polling 間隔の上限: 3600秒
+
+# HTTP セッション (ECOマネは非力な組み込み Web サーバのため接続数を絞る)
+HTTP_CONNECTION_LIMIT = 4  # 同時接続数の上限
+HTTP_KEEPALIVE_TIMEOUT = 15  # keep-alive 保持時間: 15秒 (1回の更新中のみ接続を再利用)
+HTTP_REQUEST_TIMEOUT = 30  # 1リクエストのタイムアウト: 30秒
+
+# 回路別電力量の同時取得数
+DEFAULT_ENERGY_CONCURRENCY = 4
+MAX_ENERGY_CONCURRENCY = 16
+
+# HTML 解析の executor
+PARSER_EXECUTOR_THREAD = "thread"  # Home Assistant の thread pool
+PARSER_EXECUTOR_PROCESS = "process"  # 専用の process pool
+PARSER_EXECUTORS = [PARSER_EXECUTOR_THREAD, PARSER_EXECUTOR_PROCESS]
+DEFAULT_PARSER_EXECUTOR = PARSER_EXECUTOR_THREAD
+PARSER_PROCESS_WORKERS = 2  # process pool のワーカー数
+
+# 回路のエンティティの単位 (回路数が多い場合はページ・デバイスごとにまとめる)
+CIRCUIT_ENTITIES_CIRCUIT = "circuit"  # 回路ごとに電力・電力量の2つ
+CIRCUIT_ENTITIES_PAGE = "page"  # elecCheck_6000.cgi のページごとに1つ
+CIRCUIT_ENTITIES_DEVICE = "device"  # ECOマネごとに1つ
+CIRCUIT_ENTITIES = [
+    CIRCUIT_ENTITIES_CIRCUIT,
+    CIRCUIT_ENTITIES_PAGE,
+    CIRCUIT_ENTITIES_DEVICE,
+]
+DEFAULT_CIRCUIT_ENTITIES = CIRCUIT_ENTITIES_CIRCUIT
+CONTEXT_CIRCUIT_GROUP = "circuit_group"  # まとめたエンティティへの通知の種別
+CIRCUIT_GROUP_DEVICE = "all"  # デバイスごとにまとめた場合のグループ
+
+# 回路構成のキャッシュ (.storage)
+STORAGE_VERSION = 1
+STORAGE_KEY_TOPOLOGY = "topology"
+STORAGE_KEY_BACKFILL = "backfill"  # 統計の取り込みの進捗
+TOPOLOGY_SAVE_DELAY = 10  # 回路構成の保存の遅延: 10秒
+# 回路構成の変化を通知する dispatcher のシグナル (entry_id で区別)
+SIGNAL_TOPOLOGY_UPDATED = f"{DOMAIN}_topology_updated_{{}}"
+# 値の変化 (変化したキー) を通知する dispatcher のシグナル (entry_id で区別)
+SIGNAL_VALUES_UPDATED = f"{DOMAIN}_values_updated_{{}}"
+# 取得の成否 (可用性) の変化を通知する dispatcher のシグナル (entry_id で区別)
+SIGNAL_AVAILABILITY_UPDATED = f"{DOMAIN}_availability_updated_{{}}"
+
+# 応答の変化検出に使うハッシュの長さ (バイト)
+FINGERPRINT_SIZE = 16
+
+# 応答の逐次受信 (必要な値を受信した時点で残りを読まずに応答を閉じる)
+STREAM_CHUNK_SIZE = 2048  # 1回に読み込む大きさ (バイト)
+STREAM_DRAIN_BYTES = 4096  # 残りがこれ以下なら読み切って接続を再利用する
+
+# 複数の ECOマネを polling するためのスケジューラ
+FLEET_SCHEDULER = "fleet_scheduler"  # hass.data[DOMAIN] でのキー
+FLEET_MAX_REQUESTS = 16  # 統合全体での同時リクエスト数の上限
+FLEET_MAX_PARSE_JOBS = 2  # 統合全体での同時解析数の上限
+FLEET_JITTER_RATIO = 0.05  # 予定時刻のずらし幅 (polling 間隔に対する比率)
+FLEET_MAX_JITTER = 3  # 予定時刻のずらし幅の上限: 3秒
+
+# 性能の計測 (既定では無効)
+DEFAULT_TELEMETRY = False
+# 処理時間のヒストグラムの区切り (秒)
+TELEMETRY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 応答時間・値の変化・エラーに応じた polling 間隔の調整
+DEFAULT_ADAPTIVE_POLLING = True
+# 設定した間隔より短くするのは許可した場合のみ (ECOマネの負荷を増やさない)
+DEFAULT_ADAPTIVE_FASTER = False
+ADAPTIVE_MIN_SCALE = 0.5  # 短くする場合の設定した間隔に対する倍率の下限
+ADAPTIVE_MAX_SCALE = 4.0  # 設定した間隔に対する倍率の上限
+ADAPTIVE_FAST_RATIO = 0.1  # 更新時間が間隔のこの割合未満なら速いとみなす
+ADAPTIVE_SLOW_RATIO = 0.5  # 更新時間が間隔のこの割合を超えたら遅いとみなす
+ADAPTIVE_SHRINK = 0.8  # 間隔を短くする倍率
+ADAPTIVE_GROW = 1.5  # 間隔を長くする倍率
+BACKOFF_INITIAL = 10  # 失敗後の最初の再試行までの時間: 10秒
+BACKOFF_MAX = 900  # 失敗後の再試行までの時間の上限: 900秒
+
+# 監視対象の回路の高頻度な取得 (回路のあるページのみを全体の巡回とは別に取得)
+DEFAULT_WATCH_INTERVAL = 5  # 監視対象の回路の取得間隔: 5秒
+MIN_WATCH_INTERVAL = 2  # 監視対象の回路の取得間隔の下限: 2秒
+MAX_WATCH_INTERVAL = 60  # 監視対象の回路の取得間隔の上限: 60秒
+WATCH_BUFFER_SIZE = 720  # 回路ごとに保持する記録の数 (5秒間隔で1時間分)
+
+# 回路別電力からの電力量の積算 (ECOマネの電力量は定期的な補正のみに使用)
+DEFAULT_ENERGY_INTEGRATION = False
+ENERGY_RECONCILE_INTERVAL = 900  # ECOマネの電力量で補正する間隔の下限: 900秒
+ENERGY_INTEGRATION_MAX_GAP = 900  # 積算する電力の記録の間隔の上限: 900秒
+
+# 昨日の電力量の長期統計への取り込み (ecomane.backfill_yesterday サービス)
+SERVICE_BACKFILL = "backfill_yesterday"
+BACKFILLS = "backfills"  # hass.data[DOMAIN] でのキー
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+BACKFILL_BATCH_SIZE = 8  # 1回にまとめて取り込む回路数
+BACKFILL_REQUEST_DELAY = 1.0  # 通常の polling を妨げないためのリクエストの間隔: 1秒
+
+# 更新処理のプロファイル (ecomane.profile サービス)
+SERVICE_PROFILE = "profile"
+ATTR_CYCLES = "cycles"
+DEFAULT_PROFILE_CYCLES = 3
+MAX_PROFILE_CYCLES = 100
+PROFILE_DIRECTORY = "ecomane_profile"  # 設定ディレクトリ内の保存先
+PROFILE_TOP = 30  # 集計に載せる関数・割り当て箇所の数
+PROFILE_TRACEMALLOC_FRAMES = 5  # 割り当てごとに記録するスタックの深さ
+
+# 応答の記録 (既定では無効, 解析の不具合をオフラインで再現するため)
+DEFAULT_CAPTURE = False
+CAPTURE_DIRECTORY = "ecomane_capture"  # 設定ディレクトリ内の保存先
+CAPTURE_MAX_BYTES = 50 * 1024 * 1024  # 圧縮後の全体の上限: 50MB (古い順に削除)
+CAPTURE_SEGMENT_BYTES = 4 * 1024 * 1024  # 1つのセグメントの圧縮前の上限: 4MB
+
+# 全ての値の時系列の書き出し (既定では無効, 日ごとに列ごとのファイルへ追記)
+DEFAULT_EXPORT = False
+EXPORT_DIRECTORY = "ecomane_export"  # 設定ディレクトリ内の保存先
+EXPORT_FLUSH_INTERVAL = 300  # 書き込みをまとめる間隔: 5分
+
+# 最新の値を他の利用者に配信するローカルの HTTP API
+API_VIEWS = "api_views"  # hass.data[DOMAIN] でのキー (登録済みであれば True)
+API_URL = "/api/ecomane/{entry_id}"
+API_STREAM_KEEPALIVE = 30  # server-sent events の keep-alive の間隔: 30秒
@@ -1,43 +1,145 @@
 """Coordinator for Eco Mane HEMS component."""
 
+from array import array
 import asyncio
-from collections.abc import Generator
-from dataclasses import dataclass
+from collections.abc import Callable, Coroutine, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+from dataclasses import asdict, dataclass
 from datetime import timedelta
+import hashlib
 import logging
+import math
+import multiprocessing
+from pathlib import Path
+import time
+from typing import Any, TypeVar
+import uuid
 
 import aiohttp
-from bs4 import BeautifulSoup, NavigableString
-from bs4.element import Tag
 
+from homeassistant.components import persistent_notification
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.const import UnitOfEnergy, UnitOfMass, UnitOfVolume
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
+from .capture import ResponseArchive
 from .const import (
+    BACKFILL_REQUEST_DELAY,
+    CAPTURE_DIRECTORY,
+    CIRCUIT_ENTITIES_CIRCUIT,
+    CIRCUIT_ENTITIES_DEVICE,
+    CIRCUIT_GROUP_DEVICE,
+    CONTEXT_CIRCUIT_GROUP,
+    DEFAULT_ADAPTIVE_FASTER,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_CAPTURE,
+    DEFAULT_CIRCUIT_ENTITIES,
+    DEFAULT_ENERGY_CONCURRENCY,
+    DEFAULT_ENERGY_INTEGRATION,
+    DEFAULT_ENERGY_INTERVAL,
+    DEFAULT_EXPORT,
+    DEFAULT_PARSER_EXECUTOR,
+    DEFAULT_POWER_INTERVAL,
+    DEFAULT_TELEMETRY,
+    DEFAULT_USAGE_INTERVAL,
+    DEFAULT_WATCH_INTERVAL,
+    DOMAIN,
+    ENERGY_RECONCILE_INTERVAL,
     ENTITY_NAME,
-    KEY_IP_ADDRESS,
-    POLLING_INTERVAL,
-    RETRY_INTERVAL,
+    EXPORT_DIRECTORY,
+    FINGERPRINT_SIZE,
+    HTTP_CONNECTION_LIMIT,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_REQUEST_TIMEOUT,
+    OPTION_ADAPTIVE_FASTER,
+    OPTION_ADAPTIVE_POLLING,
+    OPTION_CAPTURE,
+    OPTION_CIRCUIT_ENTITIES,
+    OPTION_ENERGY_CONCURRENCY,
+    OPTION_ENERGY_INTEGRATION,
+    OPTION_ENERGY_INTERVAL,
+    OPTION_EXPORT,
+    OPTION_PARSER_EXECUTOR,
+    OPTION_POWER_INTERVAL,
+    OPTION_TELEMETRY,
+    OPTION_USAGE_INTERVAL,
+    OPTION_WATCH_CIRCUITS,
+    OPTION_WATCH_INTERVAL,
+    PARSER_EXECUTOR_PROCESS,
+    PARSER_PROCESS_WORKERS,
+    PROFILE_DIRECTORY,
     SENSOR_CIRCUIT_CGI,
+    SENSOR_CIRCUIT_ENDPOINT,
     SENSOR_CIRCUIT_ENERGY_CGI,
     SENSOR_CIRCUIT_ENERGY_SELECTOR,
     SENSOR_CIRCUIT_PREFIX,
-    SENSOR_CIRCUIT_SELECTOR_BUTTON,
-    SENSOR_CIRCUIT_SELECTOR_CIRCUIT,
-    SENSOR_CIRCUIT_SELECTOR_PLACE,
-    SENSOR_CIRCUIT_SELECTOR_POWER,
-    SENSOR_CIRCUIT_SELECTOR_PREFIX,
     SENSOR_TODAY_CGI,
+    SIGNAL_AVAILABILITY_UPDATED,
+    SIGNAL_TOPOLOGY_UPDATED,
+    SIGNAL_VALUES_UPDATED,
+    STORAGE_KEY_BACKFILL,
+    STORAGE_KEY_TOPOLOGY,
+    STORAGE_VERSION,
+    STREAM_CHUNK_SIZE,
+    STREAM_DRAIN_BYTES,
+    TIER_ENERGY,
+    TIER_POWER,
+    TIER_USAGE,
+    TOPOLOGY_SAVE_DELAY,
 )
+from .export import TimeSeriesExport
+from .integration import EnergyIntegrator
+from .parser import (
+    ParsedCircuit,
+    ParsedCircuitPage,
+    StreamingDivParser,
+    parse_circuit_bodies,
+    parse_energy_bodies,
+    parse_energy_history_bodies,
+    parse_usage_body,
+    streamed_energy,
+    streamed_usage,
+)
+from .polling import AdaptivePollingController
+from .profiler import CycleProfiler
+from .telemetry import EcoManeTelemetry
+from .watch import CircuitWatchList
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+
+async def _gather_or_cancel(*coros: Coroutine) -> list:
+    """Run coroutines concurrently and cancel the rest when one fails."""
+    tasks = [asyncio.create_task(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+def topology_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Store of the circuit topology of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}_{STORAGE_KEY_TOPOLOGY}")
+
+
+def backfill_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Store of the statistics backfill checkpoint of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}_{STORAGE_KEY_BACKFILL}")
+
 
 # 電力センサーのエンティティのディスクリプション
 @dataclass(frozen=True, kw_only=True)
@@ -55,6 +157,103 @@ class EcoManeCircuitEnergySensorEntityDescription(SensorEntityDescription):
     service_type: str
 
 
+# 回路別電力量の取得対象
+@dataclass(frozen=True, kw_only=True)
+class CircuitEnergyTarget:
+    """Circuit whose energy is fetched from resultGraphDiv_4242.cgi."""
+
+    page_num: int
+    total_page: int
+    selNo: str
+    index: int  # 回路の番号 (em_circuit_NN)
+
+    @property
+    def prefix(self) -> str:
+        """Prefix of the circuit used in logs and fingerprint keys."""
+        return f"{SENSOR_CIRCUIT_PREFIX}_{self.index:02d}"
+
+
+# 回路の構成 (再起動後もすぐにエンティティを作成できるよう保存する)
+@dataclass(frozen=True, kw_only=True, slots=True)
+class EcoManeCircuit:
+    """Circuit discovered on the elecCheck_6000.cgi pages."""
+
+    index: int  # 回路の番号 (em_circuit_NN)
+    selNo: str
+    place: str  # txt
+    circuit: str  # txt2
+    page: int  # 回路のあるページ
+
+    @property
+    def prefix(self) -> str:
+        """Prefix of the data keys of the circuit."""
+        return f"{SENSOR_CIRCUIT_PREFIX}_{self.index:02d}"
+
+
+# 回路の構成の変化 (selNo で回路を識別)
+@dataclass(frozen=True, kw_only=True)
+class TopologyDiff:
+    """Circuits added, removed or renamed since the previous crawl."""
+
+    added: list[EcoManeCircuit]
+    removed: list[EcoManeCircuit]
+    renamed: list[EcoManeCircuit]  # 場所・回路名が変わった回路 (新しい構成)
+
+    @staticmethod
+    def between(old: list[EcoManeCircuit], new: list[EcoManeCircuit]) -> "TopologyDiff":
+        """Compare two topologies by selNo (moved circuits are not a change)."""
+        old_circuits = {circuit.selNo: circuit for circuit in old}
+        new_circuits = {circuit.selNo: circuit for circuit in new}
+        return TopologyDiff(
+            added=[c for c in new if c.selNo not in old_circuits],
+            removed=[c for c in old if c.selNo not in new_circuits],
+            renamed=[
+                c
+                for c in new
+                if (previous := old_circuits.get(c.selNo)) is not None
+                and (previous.place, previous.circuit) != (c.place, c.circuit)
+            ],
+        )
+
+    def __bool__(self) -> bool:
+        """Return True if anything changed."""
+        return bool(self.added or self.removed or self.renamed)
+
+
+# 更新結果 (数値は回路の番号・使用量の順番で参照する配列, 未取得は NaN)
+class EcoManeData:
+    """Snapshot of the values read from the device."""
+
+    __slots__ = ("energy", "power", "usage")
+
+    def __init__(self, usage_count: int) -> None:
+        """Initialize an empty snapshot."""
+        self.usage = array("d", [math.nan] * usage_count)  # 使用量
+        self.power = array("d")  # 回路別電力 (W)
+        self.energy = array("d")  # 回路別電力量 (kWh)
+
+    def resize(self, circuit_count: int) -> None:
+        """Grow or shrink the per-circuit arrays to the number of circuits."""
+        for values in (self.power, self.energy):
+            if len(values) < circuit_count:
+                values.extend([math.nan] * (circuit_count - len(values)))
+            else:
+                del values[circuit_count:]
+
+    def move_energy(self, indexes: Mapping[int, int], circuit_count: int) -> None:
+        """Move the circuit energy to the new indexes (previous index: new index)."""
+        energy = array("d", [math.nan] * circuit_count)
+        for previous, index in indexes.items():
+            if previous < len(self.energy) and index < circuit_count:
+                energy[index] = self.energy[previous]
+        self.energy[:] = energy
+
+    @staticmethod
+    def value(values: array, index: int) -> float:
+        """Value at an index, or NaN if there is none."""
+        return values[index] if index < len(values) else math.nan
+
+
 # 使用量センサーのエンティティのディスクリプション
 @dataclass(frozen=True, kw_only=True)
 class EcoManeUsageSensorEntityDescription(SensorEntityDescription):
@@ -136,297 +335,1316 @@ class EcoManeDataCoordinator(DataUpdateCoordinator):
 
     _attr_circuit_total: int  # 総回路数
     _attr_usage_sensor_descs: list[EcoManeUsageSensorEntityDescription]
-    _data_dict: dict[str, str]
+    _data: EcoManeData
 
-    def __init__(self, hass: HomeAssistant, ip_address: str) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        ip_address: str,
+        options: Mapping[str, Any] | None = None,
+    ) -> None:
         """Initialize my coordinator."""
+        options = options or {}
+
+        # 種別ごとの polling 間隔 (最も短い間隔で coordinator を駆動する)
+        self._tier_intervals = {
+            TIER_POWER: options.get(OPTION_POWER_INTERVAL, DEFAULT_POWER_INTERVAL),
+            TIER_ENERGY: options.get(OPTION_ENERGY_INTERVAL, DEFAULT_ENERGY_INTERVAL),
+            TIER_USAGE: options.get(OPTION_USAGE_INTERVAL, DEFAULT_USAGE_INTERVAL),
+        }
+        self._tier_last_refresh: dict[str, float] = {}  # 種別ごとの最終更新時刻
+
+        # 回路別電力量を電力から積算する場合、ECOマネの電力量は定期的な補正のみに使う
+        self._integrator: EnergyIntegrator | None = None
+        if options.get(OPTION_ENERGY_INTEGRATION, DEFAULT_ENERGY_INTEGRATION):
+            self._integrator = EnergyIntegrator()
+            self._tier_intervals[TIER_ENERGY] = max(
+                self._tier_intervals[TIER_ENERGY], ENERGY_RECONCILE_INTERVAL
+            )
+
+        # polling 間隔 (更新の予定は統合全体のスケジューラが行う)
+        # ECOマネの応答時間・値の変化・エラーに応じて全種別の間隔を伸縮する
+        self._polling = AdaptivePollingController(
+            min(self._tier_intervals.values()),
+            options.get(OPTION_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING),
+            options.get(OPTION_ADAPTIVE_FASTER, DEFAULT_ADAPTIVE_FASTER),
+        )
+
         super().__init__(
             hass,
             _LOGGER,
             name=ENTITY_NAME,
-            update_interval=timedelta(
-                seconds=POLLING_INTERVAL
-            ),  # data polling interval
+            update_interval=None,
         )
 
-        self._data_dict = {KEY_IP_ADDRESS: ip_address}
-        self._session = None
+        self._data = EcoManeData(len(ecomane_usage_sensors_descs))
         self._circuit_count = 0
         self._ip_address = ip_address
+        # 回路別電力量の同時取得数
+        self._energy_concurrency = options.get(
+            OPTION_ENERGY_CONCURRENCY, DEFAULT_ENERGY_CONCURRENCY
+        )
+        self._total_page = 1  # 前回取得した回路のページ数
+
+        # 接続の生成数と再利用数
+        self._connections_created = 0
+        self._connections_reused = 0
+        # 全ての取得で共有する HTTP セッション
+        self._session = self._create_session()
+
+        # HTML の解析を行う executor (thread の場合は Home Assistant の executor を使用)
+        self._process_pool: ProcessPoolExecutor | None = None
+        if (
+            options.get(OPTION_PARSER_EXECUTOR, DEFAULT_PARSER_EXECUTOR)
+            == PARSER_EXECUTOR_PROCESS
+        ):
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=PARSER_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        # 応答ごとのハッシュ (URL をキー) と前回の解析結果, エンドポイントごとの一致数
+        self._fingerprints: dict[str, bytes] = {}
+        self._parsed_pages: dict[str, tuple[int, ParsedCircuitPage]] = {}
+        self._fingerprint_stats: dict[str, dict[str, int]] = {}
+        # エンドポイントごとの途中で閉じた応答の数と読まずに済んだバイト数
+        self._stream_stats: dict[str, dict[str, int]] = {}
+        # 直前の更新で値が変化したキー (種別, 番号) と全エンティティへの通知の要否
+        self._changed_keys: set[tuple[str, int | str]] = set()
+        self._notify_all = True
+        # 値の版 (ETag に使う, 再読み込みで版が重ならないよう生成ごとの識別子を付ける)
+        self._version = 0
+        self._version_tag = uuid.uuid4().hex[:8]
+        # 最後に通知した可用性 (変化した時に版を進める)
+        self._published_available = self.last_update_success
+
+        # 統合全体での同時リクエスト数と同時解析数の制限
+        self._request_limit: asyncio.Semaphore | contextlib.nullcontext = (
+            contextlib.nullcontext()
+        )
+        self._parse_limit: asyncio.Semaphore | contextlib.nullcontext = (
+            contextlib.nullcontext()
+        )
+
+        # 更新1回あたりの解析時間 (executor 内, event loop 上)
+        self._parse_executor_time = 0.0
+        self._parse_loop_time = 0.0
+        # 処理時間・受信量などの計測 (オプションで有効にした場合のみ)
+        self._telemetry = EcoManeTelemetry(
+            options.get(OPTION_TELEMETRY, DEFAULT_TELEMETRY)
+        )
+
+        # 取得した応答の記録 (オプションで有効にした場合のみ)
+        self._capture: ResponseArchive | None = None
+        if options.get(OPTION_CAPTURE, DEFAULT_CAPTURE):
+            self._capture = ResponseArchive(self._entry_path(CAPTURE_DIRECTORY))
+        # 全ての値の時系列の書き出し (オプションで有効にした場合のみ)
+        self._export: TimeSeriesExport | None = None
+        if options.get(OPTION_EXPORT, DEFAULT_EXPORT):
+            self._export = TimeSeriesExport(self._entry_path(EXPORT_DIRECTORY))
+        # 更新処理のプロファイル (ecomane.profile サービスで開始した場合のみ)
+        self._profiler: CycleProfiler | None = None
+
+        # 回路の構成とその保存先
+        self._topology: list[EcoManeCircuit] = []
+        self._crawl_topology: list[EcoManeCircuit] = []
+        self._circuit_indexes: dict[str, int] = {}  # selNo から回路の番号
+        # 回路のエンティティの単位と、まとめる場合の selNo からグループ
+        self._circuit_entities: str = options.get(
+            OPTION_CIRCUIT_ENTITIES, DEFAULT_CIRCUIT_ENTITIES
+        )
+        self._circuit_groups: dict[str, str] = {}
+        self._topology_diff: TopologyDiff | None = None  # 未通知の構成の変化
+        # 巡回の途中で先に通知した回路 (巡回の完了時の構成の比較に含める)
+        self._early_circuits: dict[str, EcoManeCircuit] = {}
+        self._store: Store[dict[str, Any]] | None = None
+        if self.config_entry is not None:
+            self._store = topology_store(hass, self.config_entry.entry_id)
+
+        # 監視対象の回路 (selNo) と高頻度な取得の間隔・実行中の取得
+        self._watch = CircuitWatchList(options.get(OPTION_WATCH_CIRCUITS, []))
+        self._watch_interval = options.get(
+            OPTION_WATCH_INTERVAL, DEFAULT_WATCH_INTERVAL
+        )
+        self._watch_task: asyncio.Task | None = None
 
         self._attr_circuit_total = 0
         self._attr_usage_sensor_descs = ecomane_usage_sensors_descs
 
-    def natural_number_generator(self) -> Generator:
-        """Natural number generator."""
-        count = 1
-        while True:
-            yield count
-            count += 1
+    async def async_load_topology(self) -> bool:
+        """Load the circuit topology saved by a previous run."""
+        if self._store is None or (stored := await self._store.async_load()) is None:
+            return False
+        try:
+            topology = [EcoManeCircuit(**circuit) for circuit in stored["circuits"]]
+        except (KeyError, TypeError) as err:
+            _LOGGER.warning("Ignoring invalid circuit topology cache: %s", err)
+            return False
+        self._set_topology(topology)
+        _LOGGER.debug("Loaded %s circuits from the topology cache", len(topology))
+        return True
+
+    def _set_topology(self, topology: list[EcoManeCircuit]) -> None:
+        """Set the circuit topology."""
+        self._topology = topology
+        self._circuit_indexes = {circuit.selNo: circuit.index for circuit in topology}
+        self._circuit_groups = {
+            circuit.selNo: group
+            for circuit in topology
+            if (group := self.circuit_group(circuit)) is not None
+        }
+        self._attr_circuit_total = len(topology)
+        if topology:
+            self._total_page = max(circuit.page for circuit in topology)
+
+    def _topology_to_store(self) -> dict[str, Any]:
+        """Data of the circuit topology to save."""
+        return {"circuits": [asdict(circuit) for circuit in self._topology]}
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create the keep-alive HTTP session shared by all fetches."""
+        # 共有のコネクタでは接続数と keep-alive を ECOマネに合わせられないため専用とし、
+        # Home Assistant の停止時に async_close で閉じる
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_CONNECTION_LIMIT,
+            limit_per_host=HTTP_CONNECTION_LIMIT,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=HTTP_REQUEST_TIMEOUT),
+            trace_configs=[trace_config],
+        )
+
+    async def _on_connection_create_end(
+        self,
+        session: aiohttp.ClientSession,
+        trace_config_ctx: object,
+        params: aiohttp.TraceConnectionCreateEndParams,
+    ) -> None:
+        """Count newly opened connections."""
+        self._connections_created += 1
+
+    async def _on_connection_reuseconn(
+        self,
+        session: aiohttp.ClientSession,
+        trace_config_ctx: object,
+        params: aiohttp.TraceConnectionReuseconnParams,
+    ) -> None:
+        """Count reused keep-alive connections."""
+        self._connections_reused += 1
+
+    def _entry_path(self, directory: str) -> Path:
+        """Directory of this config entry in the configuration directory."""
+        return Path(
+            self.hass.config.path(
+                directory,
+                self.config_entry.entry_id
+                if self.config_entry is not None
+                else self._ip_address.replace(":", "_"),
+            )
+        )
+
+    async def async_close(self) -> None:
+        """Close the HTTP session and the parser processes.
+
+        Called on unload and when Home Assistant stops, so it may run twice.
+        """
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+        if self._profiler is not None:
+            self._profiler.cancel()
+            self._profiler = None
+        if not self._session.closed:
+            await self._session.close()
+        # 書き込みを待っている行を残さない
+        await self.async_flush_export(force=True)
+        if self._process_pool is not None:
+            await self.hass.async_add_executor_job(self._process_pool.shutdown)
+            self._process_pool = None
+        _LOGGER.debug(
+            "HTTP session closed. connections created:%s reused:%s",
+            self._connections_created,
+            self._connections_reused,
+        )
+
+    def set_fleet_limits(
+        self, request_limit: asyncio.Semaphore, parse_limit: asyncio.Semaphore
+    ) -> None:
+        """Share the integration-wide request and parse limits."""
+        self._request_limit = request_limit
+        self._parse_limit = parse_limit
+
+    async def _async_fetch(self, url: str, endpoint: str, cycle: bool = True) -> bytes:
+        """Fetch a page from the device (cycle=False if outside the update)."""
+        async with self._request_limit, self._session.get(url) as response:
+            start = time.perf_counter()
+            if response.status != 200:
+                _LOGGER.error(
+                    "Error fetching data from %s. Status code: %s",
+                    url,
+                    response.status,
+                )
+                raise UpdateFailed(
+                    f"Error fetching data from {url}. Status code: {response.status}"
+                )
+            # shift-jis のデコードは解析と共に executor で行う
+            body = await response.read()
+            self._telemetry.record_fetch(
+                endpoint, time.perf_counter() - start, len(body), cycle
+            )
+            if self._capture is not None:
+                self._capture.append(endpoint, url, body)
+            return body
+
+    async def _async_fetch_divs(
+        self, url: str, endpoint: str, div_ids: list[str]
+    ) -> tuple[bytes, dict[str, str]]:
+        """Fetch a page until the given divs have been received.
+
+        Returns the bytes read and the text of the divs found in them.
+        """
+        async with self._request_limit, self._session.get(url) as response:
+            start = time.perf_counter()
+            if response.status != 200:
+                _LOGGER.error(
+                    "Error fetching data from %s. Status code: %s",
+                    url,
+                    response.status,
+                )
+                raise UpdateFailed(
+                    f"Error fetching data from {url}. Status code: {response.status}"
+                )
+            # 記録する場合は解析の再現のため最後まで読む
+            stop_early = self._capture is None
+            parser = StreamingDivParser(div_ids)
+            chunks: list[bytes] = []
+            size = 0
+            parse_time = 0.0
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                chunks.append(chunk)
+                size += len(chunk)
+                parse_start = time.perf_counter()
+                done = parser.feed(chunk)
+                parse_time += time.perf_counter() - parse_start
+                if done and stop_early:
+                    break
+            else:
+                parser.close()
+            if not response.content.at_eof():
+                remaining = (
+                    response.content_length - size
+                    if response.content_length is not None
+                    else None
+                )
+                if remaining is not None and remaining <= STREAM_DRAIN_BYTES:
+                    # 残りがわずかなら読み切って接続を再利用する
+                    size += len(await response.read())
+                else:
+                    # 残りを受信せずに接続を閉じる
+                    response.close()
+                    stats = self._stream_stats.setdefault(
+                        endpoint, {"early_closes": 0, "bytes_skipped": 0}
+                    )
+                    stats["early_closes"] += 1
+                    stats["bytes_skipped"] += remaining or 0
+            body = b"".join(chunks)
+            self._telemetry.record_fetch(endpoint, time.perf_counter() - start, size)
+            self._record_loop_time("stream_parse", parse_time)
+            if self._capture is not None:
+                self._capture.append(endpoint, url, body)
+            return body, parser.values
+
+    def _fingerprint(self, endpoint: str, url: str, body: bytes) -> bytes | None:
+        """Return the hash of a changed response, or None if it is unchanged."""
+        digest = hashlib.blake2b(body, digest_size=FINGERPRINT_SIZE).digest()
+        stats = self._fingerprint_stats.setdefault(endpoint, {"hits": 0, "misses": 0})
+        if self._fingerprints.get(url) == digest:
+            stats["hits"] += 1
+            return None
+        stats["misses"] += 1
+        return digest
+
+    async def _async_parse(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Decode and parse response bodies outside the event loop."""
+        async with self._parse_limit:
+            start = time.perf_counter()
+            if self._process_pool is not None:
+                result = await self.hass.loop.run_in_executor(
+                    self._process_pool, func, *args
+                )
+            else:
+                result = await self.hass.async_add_executor_job(func, *args)
+            self._parse_executor_time += time.perf_counter() - start
+        return result
 
-    async def _async_update_data(self) -> dict[str, str]:
+    def _record_loop_time(self, name: str, seconds: float) -> None:
+        """Add time spent parsing on the event loop."""
+        self._parse_loop_time += seconds
+        self._telemetry.record_loop(name, seconds)
+
+    async def _async_update_data(self) -> EcoManeData:
         """Update Eco Mane Data."""
-        _LOGGER.debug("_async_update_data: Updating EcoMane data")  # debug
-        await self.update_usage_data()
-        await self.update_circuit_power_data()
-        return self._data_dict
+        now = time.monotonic()
+        # 予定時刻のずれを吸収するため、次回まで待つより今回の方が近い種別を更新
+        scale = self._polling.scale
+        tolerance = self._polling.steady_interval / 2
+        tiers = {
+            tier
+            for tier, interval in self._tier_intervals.items()
+            if now - self._tier_last_refresh.get(tier, -math.inf)
+            >= interval * scale - tolerance
+        }
+        if (profiler := self._profiler) is None:
+            return await self._async_update_tiers(tiers)
+        return await self._async_profile_update(profiler, tiers)
+
+    @callback
+    def async_start_profile(self, cycles: int) -> bool:
+        """Profile the next update cycles unless a profile is running."""
+        if self._profiler is not None:
+            return False
+        self._profiler = CycleProfiler(self._entry_path(PROFILE_DIRECTORY), cycles)
+        return True
+
+    async def _async_profile_update(
+        self, profiler: CycleProfiler, tiers: set[str]
+    ) -> EcoManeData:
+        """Update the data of the given tiers while profiling the cycle."""
+        if not profiler.started:
+            # 基準のスナップショットは event loop を止めないよう executor で取る
+            await self.hass.async_add_executor_job(profiler.take_baseline)
+        profiler.start_cycle()
+        try:
+            return await self._async_update_tiers(tiers)
+        finally:
+            if profiler.stop_cycle():
+                self._profiler = None
+                # 結果の書き込みで次の更新を遅らせない
+                self.hass.async_create_background_task(
+                    self._async_write_profile(profiler),
+                    f"{DOMAIN}_profile_{self._ip_address}",
+                )
+
+    async def _async_write_profile(self, profiler: CycleProfiler) -> None:
+        """Write the profile results and tell the user where they are."""
+        try:
+            paths = await self.hass.async_add_executor_job(profiler.write)
+        except OSError as err:
+            _LOGGER.error("Error writing the profile: %s", err)
+            return
+        _LOGGER.info("Profile of %s cycles written to %s", profiler.completed, paths)
+        persistent_notification.async_create(
+            self.hass,
+            f"Profile of {profiler.completed} update cycles written to "
+            + ", ".join(str(path) for path in paths.values()),
+            title="Eco Mane profile",
+            notification_id=f"{DOMAIN}_profile_{self._ip_address}",
+        )
+
+    async def _async_update_tiers(self, tiers: set[str]) -> EcoManeData:
+        """Update the data of the given tiers."""
+        now = time.monotonic()
+        self._changed_keys = set()
+        # 日付が変わったら積算した電力量を 0 に戻し、ECOマネの電力量で補正する
+        if self._roll_over_energy():
+            tiers = tiers | {TIER_ENERGY}
+        # 回路別電力量の取得には回路ページの selNo が必要
+        if TIER_ENERGY in tiers:
+            tiers = tiers | {TIER_POWER}
+        _LOGGER.debug("_async_update_data: Updating EcoMane data %s", tiers)  # debug
+        self._parse_executor_time = 0.0
+        self._parse_loop_time = 0.0
+        self._telemetry.start_cycle()
+        start = time.perf_counter()
+
+        # 使用量と回路別電力を並行して取得
+        coros: list[Coroutine] = []
+        if TIER_USAGE in tiers:
+            coros.append(self.update_usage_data())
+        if TIER_POWER in tiers:
+            coros.append(self.update_circuit_power_data(TIER_ENERGY in tiers))
+        try:
+            await _gather_or_cancel(*coros)
+        except UpdateFailed:
+            await self._async_flush_capture()
+            # 失敗後は全ての種別を取得し、全てのエンティティを更新し直す
+            self._tier_last_refresh.clear()
+            self._changed_keys = set()
+            self._fingerprints.clear()
+            self._parsed_pages.clear()
+            self._telemetry.end_cycle(
+                time.perf_counter() - start,
+                self._polling.interval,
+                success=False,
+            )
+            # 連続した失敗ごとに再試行までの時間を倍にする
+            self._polling.record_failure()
+            raise
+        duration = time.perf_counter() - start
+        await self._async_flush_capture()
+        self._export_sample()
+        await self.async_flush_export()
+        self._telemetry.end_cycle(duration, self._polling.interval, success=True)
+        self._polling.record_success(duration, bool(self._changed_keys))
+
+        for tier in tiers:
+            self._tier_last_refresh[tier] = now
+        # 回路の構成の変化をセンサーのプラットフォームに通知
+        if (diff := self._topology_diff) is not None:
+            self._topology_diff = None
+            _LOGGER.info(
+                "Circuit topology changed: %s added, %s removed, %s renamed",
+                len(diff.added),
+                len(diff.removed),
+                len(diff.renamed),
+            )
+            self._send_topology_diff(diff)
+        _LOGGER.debug(
+            "Parse time executor:%.3fs event loop:%.3fs changed:%s fingerprints:%s",
+            self._parse_executor_time,
+            self._parse_loop_time,
+            len(self._changed_keys),
+            self._fingerprint_stats,
+        )
+        return self._data
+
+    async def _async_flush_capture(self) -> None:
+        """Write the responses captured in the cycle to the archive."""
+        if self._capture is None or not self._capture.has_pending:
+            return
+        try:
+            await self.hass.async_add_executor_job(self._capture.flush)
+        except OSError as err:
+            _LOGGER.warning("Error writing captured responses: %s", err)
+
+    def _export_sample(self) -> None:
+        """Queue the values of the refresh for the time-series export."""
+        if self._export is None:
+            return
+        data = self._data
+        values = {
+            f"usage.{desc.key}": EcoManeData.value(data.usage, number)
+            for number, desc in enumerate(ecomane_usage_sensors_descs)
+        }
+        for circuit in self._topology:
+            values[f"power.{circuit.selNo}"] = EcoManeData.value(
+                data.power, circuit.index
+            )
+            values[f"energy.{circuit.selNo}"] = EcoManeData.value(
+                data.energy, circuit.index
+            )
+        self._export.append(time.time(), values)
+
+    async def async_flush_export(self, force: bool = False) -> None:
+        """Write the exported rows once enough have been batched."""
+        export = self._export
+        if export is None or not (export.flush_due or (force and export.has_pending)):
+            return
+        try:
+            await self.hass.async_add_executor_job(export.flush)
+        except OSError as err:
+            _LOGGER.warning("Error writing exported values: %s", err)
+
+    def _roll_over_energy(self) -> bool:
+        """Reset the integrated energy when the day changes."""
+        integrator = self._integrator
+        today = dt_util.now().date()
+        if integrator is None or integrator.day == today:
+            return False
+        rolled_over = integrator.day is not None
+        integrator.roll_over(today)
+        if rolled_over:
+            energy = self._data.energy
+            for circuit in self._topology:
+                index = circuit.index
+                if index < len(energy) and not math.isnan(energy[index]):
+                    self._set_value((TIER_ENERGY, circuit.selNo), energy, index, 0.0)
+        return rolled_over
+
+    def _integrate_energy(
+        self,
+        selNo: str,
+        index: int,
+        timestamp: float,
+        watts: float,
+        changed: set[tuple[str, int | str]] | None = None,
+    ) -> None:
+        """Add the energy of a circuit since its previous power sample."""
+        if self._integrator is None:
+            return
+        kwh = self._integrator.integrate(selNo, timestamp, watts)
+        energy = self._data.energy
+        # ECOマネの電力量を取得するまでは積算の基準がない
+        if kwh and index < len(energy) and not math.isnan(energy[index]):
+            self._set_value(
+                (TIER_ENERGY, selNo), energy, index, energy[index] + kwh, changed
+            )
+
+    def _move_circuit_values(self) -> None:
+        """Move the values of the circuits whose index changed in this crawl."""
+        crawled = {circuit.selNo: circuit.index for circuit in self._crawl_topology}
+        indexes = {
+            circuit.index: crawled[circuit.selNo]
+            for circuit in self._topology
+            if circuit.selNo in crawled
+        }
+        if all(previous == index for previous, index in indexes.items()):
+            return
+        # 電力量 (積算の基準) は selNo で新しい番号に移す
+        self._data.move_energy(indexes, self._circuit_count)
+        # 電力は巡回中に新しい番号に書き込み済みだが、上書き前の値は別の回路のもので
+        # 変化の判定に使えないため、全てのエンティティに通知する
+        self._notify_all = True
+
+    def _publish_values(self, changed: set[tuple[str, int | str]]) -> None:
+        """Advance the version of the values and send the changed keys."""
+        self._version += 1
+        if self.config_entry is not None:
+            async_dispatcher_send(
+                self.hass,
+                SIGNAL_VALUES_UPDATED.format(self.config_entry.entry_id),
+                changed,
+            )
+
+    def _publish_availability(self) -> None:
+        """Advance the version and send the availability when it changes."""
+        available = self.last_update_success
+        if available == self._published_available:
+            return
+        self._published_available = available
+        self._version += 1
+        if self.config_entry is not None:
+            async_dispatcher_send(
+                self.hass,
+                SIGNAL_AVAILABILITY_UPDATED.format(self.config_entry.entry_id),
+                available,
+            )
+
+    def _send_topology_diff(self, diff: TopologyDiff) -> None:
+        """Send a topology change to the sensor platform."""
+        self._version += 1
+        if self.config_entry is not None:
+            async_dispatcher_send(
+                self.hass,
+                SIGNAL_TOPOLOGY_UPDATED.format(self.config_entry.entry_id),
+                diff,
+            )
+
+    def _publish_new_circuits(self) -> None:
+        """Add the entities of the circuits found so far in the current crawl."""
+        added = [
+            circuit
+            for circuit in self._crawl_topology
+            if circuit.selNo not in self._circuit_indexes
+        ]
+        if not added:
+            return
+        for circuit in added:
+            self._circuit_indexes[circuit.selNo] = circuit.index
+            self._early_circuits[circuit.selNo] = circuit
+            if (group := self.circuit_group(circuit)) is not None:
+                self._circuit_groups[circuit.selNo] = group
+        _LOGGER.debug("Circuits found on the way: %s", len(added))
+        self._send_topology_diff(TopologyDiff(added=added, removed=[], renamed=[]))
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the entities whose values changed in the last update."""
+        if self._changed_keys:
+            self._publish_values(self._changed_keys)
+        self._publish_availability()
+        if self._notify_all or not self.last_update_success:
+            # 初回と失敗・復旧時は可用性が変わるため全てのエンティティに通知
+            self._notify_all = not self.last_update_success
+            super().async_update_listeners()
+            return
+        changed = self._contexts(self._changed_keys)
+        for update_callback, context in list(self._listeners.values()):
+            # context のないエンティティ (診断用センサー) には毎回通知
+            if context is None or context in changed:
+                update_callback()
+
+    def _contexts(
+        self, changed: set[tuple[str, int | str]]
+    ) -> set[tuple[str, int | str]]:
+        """Entity contexts to notify for the changed keys."""
+        if self._circuit_entities == CIRCUIT_ENTITIES_CIRCUIT:
+            return changed
+        # 回路の値の変化はその回路をまとめたエンティティに通知
+        contexts: set[tuple[str, int | str]] = set()
+        for tier, key in changed:
+            if tier == TIER_USAGE:
+                contexts.add((tier, key))
+            elif (group := self._circuit_groups.get(str(key))) is not None:
+                contexts.add((CONTEXT_CIRCUIT_GROUP, group))
+        return contexts
+
+    def circuit_group(self, circuit: EcoManeCircuit) -> str | None:
+        """Aggregate entity of a circuit, or None if it has its own entities."""
+        if self._circuit_entities == CIRCUIT_ENTITIES_CIRCUIT:
+            return None
+        if self._circuit_entities == CIRCUIT_ENTITIES_DEVICE:
+            return CIRCUIT_GROUP_DEVICE
+        return str(circuit.page)
+
+    def circuit_group_members(self, group: str) -> list[EcoManeCircuit]:
+        """Circuits of an aggregate entity in the order of the device."""
+        members = {
+            circuit.selNo: circuit
+            for circuit in (*self._topology, *self._early_circuits.values())
+            if self._circuit_groups.get(circuit.selNo) == group
+        }
+        return sorted(members.values(), key=lambda circuit: circuit.index)
+
+    def _set_value(
+        self,
+        key: tuple[str, int | str],
+        values: array,
+        index: int,
+        value: float,
+        changed: set[tuple[str, int | str]] | None = None,
+    ) -> None:
+        """Write a value and remember its key (tier, number or selNo) if it changed."""
+        old = values[index]
+        if old != value and not (math.isnan(old) and math.isnan(value)):
+            values[index] = value
+            (self._changed_keys if changed is None else changed).add(key)
+
+    def _circuit_page_url(self, page_num: int) -> str:
+        """URL of a circuit page."""
+        return f"http://{self._ip_address}/{SENSOR_CIRCUIT_CGI}&page={page_num}"
 
     async def update_usage_data(self) -> None:
         """Update usage data."""
         _LOGGER.debug("update_usage_data")
         try:
-            # デバイスからデータを取得
-            url = f"http://{self._ip_address}/{SENSOR_TODAY_CGI}"
-            async with aiohttp.ClientSession() as session:
-                response: aiohttp.ClientResponse = await session.get(url)
-                if response.status != 200:
-                    _LOGGER.error(
-                        "Error fetching data from %s. Status code: %s",
-                        url,
-                        response.status,
-                    )
-                    raise UpdateFailed(
-                        f"Error fetching data from {url}. Status code: {response.status}"
-                    )
-                # テキストデータを取得する際にエンコーディングを指定
-                text_data = await response.text(encoding="shift-jis")
-                await self.parse_usage_data(text_data)
-                _LOGGER.debug("EcoMane usage data updated successfully")
+            with self._telemetry.timer("update_usage_data"):
+                # デバイスからデータを取得
+                url = f"http://{self._ip_address}/{SENSOR_TODAY_CGI}"
+                body, streamed = await self._async_fetch_divs(
+                    url,
+                    SENSOR_TODAY_CGI,
+                    [desc.key for desc in ecomane_usage_sensors_descs],
+                )
+                # 前回と同じ応答であれば解析を省略 (値を含む受信済みの部分で比較)
+                start = time.perf_counter()
+                digest = self._fingerprint(SENSOR_TODAY_CGI, url, body)
+                self._record_loop_time("parse_usage_data", time.perf_counter() - start)
+                if digest is not None:
+                    await self.parse_usage_data(body, streamed)
+                    self._fingerprints[url] = digest
+            _LOGGER.debug("EcoMane usage data updated successfully")
         except Exception as err:
             _LOGGER.error("Error updating usage data: %s", err)
             raise UpdateFailed("update_usage_data failed") from err
         # finally:
 
-    async def parse_usage_data(self, text: str) -> dict:
+    async def parse_usage_data(
+        self, body: bytes, streamed: dict[str, str] | None = None
+    ) -> EcoManeData:
         """Parse data from the content."""
+        with self._telemetry.timer("parse_usage_data"):
+            keys = [desc.key for desc in ecomane_usage_sensors_descs]
+            # 受信しながら読めた値をそのまま使い、読めない場合のみ本文を解析
+            values = streamed_usage(streamed, keys) if streamed is not None else None
+            if values is None:
+                # 指定したIDを持つdivタグの値を取得して使用量の順番に格納
+                values = await self._async_parse(parse_usage_body, body, keys)
+            start = time.perf_counter()
+            usage = self._data.usage
+            for number, value in enumerate(values):
+                if value is not None:
+                    self._set_value((TIER_USAGE, number), usage, number, value)
+            self._record_loop_time("parse_usage_data", time.perf_counter() - start)
+        return self._data
 
-        # BeautifulSoupを使用してHTMLを解析
-        soup = BeautifulSoup(text, "html.parser")
-        # 指定したIDを持つdivタグの値を取得して辞書に格納
-        for usage_sensor_desc in ecomane_usage_sensors_descs:
-            key = usage_sensor_desc.key
-            div = soup.find("div", id=key)
-            if div:
-                value = div.text.strip()
-                self._data_dict[key] = value
-        return self._data_dict
-
-    async def update_circuit_power_data(self) -> dict:
+    async def update_circuit_power_data(
+        self, update_energy: bool = True
+    ) -> EcoManeData:
         """Update power data."""
-        _LOGGER.debug("update_circuit_power_data")
+        _LOGGER.debug("update_circuit_power_data update_energy:%s", update_energy)
         try:
-            # デバイスからデータを取得
-            url = f"http://{self._ip_address}/{SENSOR_CIRCUIT_CGI}"
-            async with aiohttp.ClientSession() as session:
-                self._circuit_count = 0
-                for (
-                    page_num
-                ) in self.natural_number_generator():  # 1ページ目から順に取得
-                    url = f"http://{self._ip_address}/{SENSOR_CIRCUIT_CGI}&page={page_num}"
-                    response: aiohttp.ClientResponse = await session.get(url)
-                    if response.status != 200:
-                        _LOGGER.error(
-                            "Error fetching data from %s. Status code: %s",
-                            url,
-                            response.status,
+            with self._telemetry.timer("update_circuit_power_data"):
+                # デバイスからデータを取得
+                # 前回のページ数までは 1ページ目と同時に投機的に取得を開始
+                page_tasks = {
+                    page_num: asyncio.create_task(
+                        self._async_fetch(
+                            self._circuit_page_url(page_num), SENSOR_CIRCUIT_ENDPOINT
                         )
-                        raise UpdateFailed(
-                            f"Error fetching data from {url}. Page: {page_num} Status code: {response.status}"
-                        )
-                    # テキストデータを取得する際に shift-jis エンコーディングを指定
-                    text_data = await response.text(encoding="shift-jis")
-                    # text_data からデータを取得, 最大ページ total_page に達したら終了
-                    total_page = await self.parse_circuit_power_data(
-                        text_data, page_num
                     )
-                    if page_num >= total_page:
-                        break
+                    for page_num in range(1, self._total_page + 1)
+                }
+                try:
+                    self._circuit_count = 0
+                    self._crawl_topology = []
+                    energy_targets: list[CircuitEnergyTarget] = []
+
+                    # 1ページ目から最大ページ数 total_page を取得
+                    total_page, targets = await self.parse_circuit_power_data(
+                        [await page_tasks[1]], 1
+                    )
+                    energy_targets.extend(targets)
+                    total_page = max(total_page, 1)
+                    self._publish_new_circuits()
+
+                    # 不足しているページの取得を開始 (余分なページは最後に取り消す)
+                    for page_num in range(2, total_page + 1):
+                        if page_num not in page_tasks:
+                            page_tasks[page_num] = asyncio.create_task(
+                                self._async_fetch(
+                                    self._circuit_page_url(page_num),
+                                    SENSOR_CIRCUIT_ENDPOINT,
+                                )
+                            )
+                    self._total_page = total_page
+
+                    # 2ページ目以降はまとめて解析 (回路の番号を揃えるためページ順に渡す)
+                    if total_page > 1 and self._topology:
+                        _, targets = await self.parse_circuit_power_data(
+                            [await page_tasks[n] for n in range(2, total_page + 1)], 2
+                        )
+                        energy_targets.extend(targets)
+                    else:
+                        # 初回の巡回では1ページずつ解析し、回路のエンティティを順に追加
+                        for page_num in range(2, total_page + 1):
+                            _, targets = await self.parse_circuit_power_data(
+                                [await page_tasks[page_num]], page_num
+                            )
+                            energy_targets.extend(targets)
+                            self._publish_new_circuits()
+                finally:
+                    for task in page_tasks.values():
+                        # 未使用の取得は取り消し、完了済みの例外は回収する
+                        if not task.cancel() and not task.cancelled():
+                            task.exception()
                 self._attr_circuit_total = self._circuit_count
+                if self._crawl_topology != self._topology:
+                    self._move_circuit_values()
+                self._data.resize(self._circuit_count)
                 _LOGGER.debug("Total number of circuits: %s", self._attr_circuit_total)
+
+                # 回路の構成が変わった場合は保存し、追加・削除・名称変更を通知
+                if self._crawl_topology != self._topology:
+                    previous = [*self._topology, *self._early_circuits.values()]
+                    self._early_circuits = {}
+                    diff = TopologyDiff.between(previous, self._crawl_topology)
+                    if diff:
+                        self._topology_diff = diff
+                    self._set_topology(self._crawl_topology)
+                    if self._store is not None:
+                        self._store.async_delay_save(
+                            self._topology_to_store, TOPOLOGY_SAVE_DELAY
+                        )
+                    if self._integrator is not None:
+                        self._integrator.forget(set(self._circuit_indexes))
+
+                # 回路別電力から電力量を積算 (値の変わらないページの回路も含める)
+                if self._integrator is not None:
+                    timestamp = time.time()
+                    power = self._data.power
+                    for circuit in self._crawl_topology:
+                        self._integrate_energy(
+                            circuit.selNo,
+                            circuit.index,
+                            timestamp,
+                            power[circuit.index],
+                        )
         except Exception as err:
             _LOGGER.error("Error updating circuit power data: %s", err)
             raise UpdateFailed("update_circuit_power_data failed") from err
         # finally:
 
         _LOGGER.debug("EcoMane circuit power data updated successfully")
-        return self._data_dict
 
-    async def parse_circuit_power_data(self, text: str, page_num: int) -> int:
-        """Parse data from the content."""
-        # BeautifulSoupを使用してHTMLを解析
-        soup = BeautifulSoup(text, "html.parser")
-        # 最大ページ数を取得
-        maxp = soup.find("input", {"name": "maxp"})
+        # 回路別電力量を並行して取得
+        if update_energy:
+            await self.update_circuits_energy_data(energy_targets)
+        return self._data
+
+    async def parse_circuit_power_data(
+        self, bodies: list[bytes], first_page_num: int
+    ) -> tuple[int, list[CircuitEnergyTarget]]:
+        """Parse data from the contents of consecutive pages."""
+        with self._telemetry.timer("parse_circuit_power_data"):
+            start = time.perf_counter()
+            page_nums = range(first_page_num, first_page_num + len(bodies))
+            urls = [self._circuit_page_url(page_num) for page_num in page_nums]
+            digests = [
+                self._fingerprint(SENSOR_CIRCUIT_ENDPOINT, url, body)
+                for url, body in zip(urls, bodies, strict=True)
+            ]
+            # 前回から変化したページのみ解析
+            changed_bodies = [
+                body for body, digest in zip(bodies, digests, strict=True) if digest
+            ]
+            self._record_loop_time(
+                "parse_circuit_power_data", time.perf_counter() - start
+            )
+            parsed_pages = iter(
+                await self._async_parse(parse_circuit_bodies, changed_bodies)
+                if changed_bodies
+                else []
+            )
+            return self._apply_circuit_pages(
+                page_nums, urls, digests, parsed_pages, first_page_num
+            )
+
+    def _apply_circuit_pages(
+        self,
+        page_nums: range,
+        urls: list[str],
+        digests: list[bytes | None],
+        parsed_pages: Iterator[ParsedCircuitPage],
+        first_page_num: int,
+    ) -> tuple[int, list[CircuitEnergyTarget]]:
+        """Store the parsed pages, reusing the cached ones for unchanged pages."""
+        start = time.perf_counter()
+        targets: list[CircuitEnergyTarget] = []
         total_page = 0
-        if isinstance(maxp, Tag):
-            value = maxp.get("value", "0")
-            # Ensure value is a string before converting to int
-            if isinstance(value, str):
-                total_page = int(value)
+        for page_num, url, digest in zip(page_nums, urls, digests, strict=True):
+            start_index = self._circuit_count
+            if digest is None:
+                # 変化していないページは前回の解析結果を使用
+                cached_index, page = self._parsed_pages[url]
+                write = cached_index != start_index
+            else:
+                page = next(parsed_pages)
+                write = True
+                self._fingerprints[url] = digest
+            self._parsed_pages[url] = (start_index, page)
+            self._apply_circuit_page(page, page_num, targets, write)
+            if page_num == first_page_num:
+                total_page = page.total_page
+        self._record_loop_time("parse_circuit_power_data", time.perf_counter() - start)
+        return total_page, targets
+
+    def _apply_circuit_page(
+        self,
+        page: ParsedCircuitPage,
+        page_num: int,
+        targets: list[CircuitEnergyTarget],
+        write: bool = True,
+    ) -> None:
+        """Store the circuits of a parsed page (values only when write is True)."""
+        total_page = page.total_page
 
         # ページ内の各センサーエンティティのデータを取得
-        for button_num in range(1, 9):
+        for button_num, circuit in enumerate(page.circuits, start=1):
             sensor_num = self._circuit_count
-            prefix = f"{SENSOR_CIRCUIT_PREFIX}_{sensor_num:02d}"
-            div_id = f"{SENSOR_CIRCUIT_SELECTOR_PREFIX}_{button_num:02d}"  # ojt_??
-
-            div_element: Tag | NavigableString | None = soup.find("div", id=div_id)
-            if isinstance(div_element, Tag):
-                # 回路の(ボタンの)selNo
-                button_div = div_element.find(
-                    "div",
-                    class_=SENSOR_CIRCUIT_SELECTOR_BUTTON,  # btn btn_58
-                )  # btn btn_58
-                if isinstance(button_div, Tag):
-                    a_tag = button_div.find("a")
-                    # <a href="javascript:moveCircuitChange('selNo')">...</a>
-                    if isinstance(a_tag, Tag) and "href" in a_tag.attrs:
-                        href_value = a_tag["href"]
-                        # JavaScriptの関数呼び出しを分解
-                        if isinstance(href_value, str):
-                            js_parts = href_value.split("moveCircuitChange('")
-                        if len(js_parts) > 1:
-                            selNo = js_parts[1].split("')")[0]
-                            self._data_dict[
-                                f"{prefix}_{SENSOR_CIRCUIT_SELECTOR_BUTTON}"
-                            ] = selNo
-
-                # 場所
-                element: Tag | NavigableString | int | None = div_element.find(
-                    "div",
-                    class_=SENSOR_CIRCUIT_SELECTOR_PLACE,  # txt
+            selNo = circuit.selNo
+
+            # 回路の電力 (selNo, 場所, 回路は回路の構成に保持)
+            if write:
+                self._write_circuit(sensor_num, circuit)
+
+            # 回路の構成に追加
+            self._crawl_topology.append(
+                EcoManeCircuit(
+                    index=sensor_num,
+                    selNo=selNo,
+                    place=circuit.place or "",
+                    circuit=circuit.circuit or "",
+                    page=page_num,
                 )
-                if isinstance(element, Tag):
-                    self._data_dict[f"{prefix}_{SENSOR_CIRCUIT_SELECTOR_PLACE}"] = (
-                        element.get_text()
-                    )  # txt
-
-                # 回路
-                element = div_element.find(
-                    "div", class_=SENSOR_CIRCUIT_SELECTOR_CIRCUIT
-                )  # txt2
-                if isinstance(element, Tag):
-                    self._data_dict[f"{prefix}_{SENSOR_CIRCUIT_SELECTOR_CIRCUIT}"] = (
-                        element.get_text()
-                    )  # txt2
-
-                # 電力
-                element = div_element.find(
-                    "div", class_=SENSOR_CIRCUIT_SELECTOR_POWER
-                )  # num
-                if isinstance(element, Tag):
-                    self._data_dict[f"{prefix}_{SENSOR_CIRCUIT_SELECTOR_POWER}"] = (
-                        element.get_text().split("W")[0]
-                    )
+            )
 
-                # 電力量を取得
-                await self.update_circuit_energy_data(
-                    page_num, total_page, selNo, prefix
+            # 電力量の取得対象に追加
+            targets.append(
+                CircuitEnergyTarget(
+                    page_num=page_num,
+                    total_page=total_page,
+                    selNo=selNo,
+                    index=sensor_num,
                 )
+            )
 
-                # 回路数をカウント
-                self._circuit_count += 1
+            # 回路数をカウント
+            self._circuit_count += 1
 
-                # デバッグログ
-                _LOGGER.debug(
-                    "page:%s id:%s prefix:%s selNo:%s circuit_power:%s circuit_energy:%s",
-                    page_num,
-                    div_id,
-                    prefix,
-                    selNo,
-                    self._data_dict[f"{prefix}_{SENSOR_CIRCUIT_SELECTOR_POWER}"],
-                    self._data_dict[f"{prefix}_{SENSOR_CIRCUIT_ENERGY_SELECTOR}"],
-                )
-            else:
-                _LOGGER.debug("div_element not found div_id:%s", div_id)
-                break
+            # デバッグログ
+            _LOGGER.debug(
+                "page:%s button:%s index:%s selNo:%s circuit_power:%s",
+                page_num,
+                button_num,
+                sensor_num,
+                selNo,
+                circuit.watts,
+            )
 
-        return total_page
+    def _write_circuit(self, index: int, circuit: ParsedCircuit) -> None:
+        """Write the power of a circuit to the snapshot."""
+        if index >= len(self._data.power):
+            self._data.resize(index + 1)
+        self._set_value(
+            (TIER_POWER, circuit.selNo), self._data.power, index, circuit.watts
+        )  # num
 
-    async def update_circuit_energy_data(
-        self, page_num: int, total_page: int, selNo: str, prefix: str
+    async def update_circuits_energy_data(
+        self, targets: list[CircuitEnergyTarget]
     ) -> None:
+        """Update energy data of all circuits concurrently."""
+        semaphore = asyncio.Semaphore(self._energy_concurrency)
+
+        async def fetch(target: CircuitEnergyTarget) -> tuple[bytes, dict[str, str]]:
+            async with semaphore:
+                return await self.update_circuit_energy_data(target)
+
+        responses = await _gather_or_cancel(*(fetch(target) for target in targets))
+
+        # 回路別電力量をまとめて解析
+        energies = await self.parse_circuit_energy_data(responses, targets)
+
+        # 取得結果を回路の番号の位置に反映
+        start = time.perf_counter()
+        energy_values = self._data.energy
+        drifts: list[float] = []
+        for target, energy in zip(targets, energies, strict=True):
+            if energy is not None:
+                # 積算した電力量と ECOマネの電力量の差を記録して補正する
+                if self._integrator is not None:
+                    local = EcoManeData.value(energy_values, target.index)
+                    energy = self._integrator.reconcile(target.selNo, local, energy)
+                    if not math.isnan(local):
+                        drifts.append(abs(self._integrator.last_drift[target.selNo]))
+                self._set_value(
+                    (TIER_ENERGY, target.selNo), energy_values, target.index, energy
+                )
+        self._record_loop_time("parse_circuit_energy_data", time.perf_counter() - start)
+        if drifts:
+            _LOGGER.debug(
+                "Integrated energy reconciled for %s circuits: mean drift %.3f kWh, max drift %.3f kWh",
+                len(drifts),
+                sum(drifts) / len(drifts),
+                max(drifts),
+            )
+
+    async def update_circuit_energy_data(
+        self, target: CircuitEnergyTarget
+    ) -> tuple[bytes, dict[str, str]]:
         """Update circuit energy data."""
         _LOGGER.debug(
             "update_circuit_energye_data page_num:%s total_page:%s selNo:%s prefix:%s",
-            page_num,
-            total_page,
-            selNo,
-            prefix,
+            target.page_num,
+            target.total_page,
+            target.selNo,
+            target.prefix,
         )
         try:
             # デバイスからデータを取得
-            url = f"http://{self._ip_address}/{SENSOR_CIRCUIT_ENERGY_CGI}?page={page_num}&maxp={total_page}&disp=0&selNo={selNo}&check=2"
-            async with aiohttp.ClientSession() as session:
-                response: aiohttp.ClientResponse = await session.get(url)
-                if response.status != 200:
-                    _LOGGER.error(
-                        "Error fetching data from %s. Status code: %s",
-                        url,
-                        response.status,
-                    )
-                    raise UpdateFailed(
-                        f"Error fetching data from {url}. Status code: {response.status}"
-                    )
-                # テキストデータを取得する際にエンコーディングを指定
-                text_data = await response.text(encoding="shift-jis")
-
-                # 回路別電力量を取得
-                circuit_energy = await self.parse_circuit_energy_data(text_data, prefix)
-                _LOGGER.debug(
-                    "EcoMane circuit energy data updated successfully. circuit_energy:%f",
-                    circuit_energy,
+            with self._telemetry.timer("update_circuit_energy_data"):
+                # 電力量 (ttx_01) を受信した時点で残りのグラフは読まない
+                return await self._async_fetch_divs(
+                    self._circuit_energy_url(target),
+                    SENSOR_CIRCUIT_ENERGY_CGI,
+                    [SENSOR_CIRCUIT_ENERGY_SELECTOR],
                 )
         except Exception as err:
             _LOGGER.error("Error updating circuit energy data: %s", err)
             raise UpdateFailed("update_circuit_energy_data failed") from err
         # finally:
 
-    async def parse_circuit_energy_data(self, text: str, prefix: str) -> float:
-        """Parse data from the content."""
+    def _circuit_energy_url(self, target: CircuitEnergyTarget) -> str:
+        """URL of the energy page of a circuit."""
+        return f"http://{self._ip_address}/{SENSOR_CIRCUIT_ENERGY_CGI}?page={target.page_num}&maxp={target.total_page}&disp=0&selNo={target.selNo}&check=2"
 
-        # BeautifulSoupを使用してHTMLを解析
-        soup = BeautifulSoup(text, "html.parser")
-        # 今日の消費電力量を取得 (<div id="ttx_01" class="ttx">今日:1.02kWh　昨日:3.16kWh</div>)
-        ttx = soup.find("div", id=SENSOR_CIRCUIT_ENERGY_SELECTOR)  # ttx_01
-        if isinstance(ttx, Tag):
-            today_parts = ttx.get_text().split("今日:")
-            if len(today_parts) > 1:
-                today_energy = today_parts[1].split("kWh")[0]
-                sensor_id = f"{prefix}_{SENSOR_CIRCUIT_ENERGY_SELECTOR}"
-                self._data_dict[sensor_id] = today_energy
+    async def parse_circuit_energy_data(
+        self,
+        responses: list[tuple[bytes, dict[str, str]]],
+        targets: list[CircuitEnergyTarget],
+    ) -> list[float | None]:
+        """Parse data from the contents (None for unchanged ones)."""
+        with self._telemetry.timer("parse_circuit_energy_data"):
+            start = time.perf_counter()
+            bodies = [body for body, _ in responses]
+            # 書き込み先の回路が変わった場合も解析し直すため、キーに prefix を含める
+            keys = [
+                f"{target.prefix} {self._circuit_energy_url(target)}"
+                for target in targets
+            ]
+            digests = [
+                self._fingerprint(SENSOR_CIRCUIT_ENERGY_CGI, key, body)
+                for key, body in zip(keys, bodies, strict=True)
+            ]
+            # 積算した電力量の補正には変化していない応答の値も必要
+            changed = [
+                index
+                for index, digest in enumerate(digests)
+                if digest is not None or self._integrator is not None
+            ]
+            energies: list[float | None] = [None] * len(bodies)
+            # 受信しながら読めた値を使い、読めなかった応答のみ本文を解析
+            parsed: list[float | None] = [
+                streamed_energy(responses[index][1]) for index in changed
+            ]
+            fallback = [
+                position for position, energy in enumerate(parsed) if energy is None
+            ]
+            self._record_loop_time(
+                "parse_circuit_energy_data", time.perf_counter() - start
+            )
+            if not changed:
+                return energies
+
+            # 前回から変化した応答のみ解析
+            if fallback:
+                reparsed = await self._async_parse(
+                    parse_energy_bodies, [bodies[changed[pos]] for pos in fallback]
+                )
+                for position, energy in zip(fallback, reparsed, strict=True):
+                    parsed[position] = energy
+            for index, energy in zip(changed, parsed, strict=True):
+                energies[index] = energy
+                if (digest := digests[index]) is not None:
+                    self._fingerprints[keys[index]] = digest
                 _LOGGER.debug(
-                    "prefix:%s circuit_energy:%s",
-                    prefix,
-                    self._data_dict[sensor_id],
+                    "prefix:%s circuit_energy:%s", targets[index].prefix, energy
                 )
-        return float(today_energy)
-
-    async def async_config_entry_first_refresh(self) -> None:
-        """Perform the first refresh with retry logic."""
-        while True:
-            try:
-                self.data = await self._async_update_data()
-                break
-            except UpdateFailed as err:
-                _LOGGER.warning(
-                    "Initial data fetch failed, retrying in %d seconds: %s",
-                    RETRY_INTERVAL,
-                    err,
+            return energies
+
+    @callback
+    def async_start_watch(self) -> CALLBACK_TYPE | None:
+        """Start refreshing the watched circuits on their own fast timer."""
+        if not self._watch:
+            return None
+        _LOGGER.debug(
+            "Watching circuits %s every %s seconds",
+            sorted(self._watch.circuits),
+            self._watch_interval,
+        )
+        return async_track_time_interval(
+            self.hass,
+            self._async_watch_tick,
+            timedelta(seconds=self._watch_interval),
+            name=f"{DOMAIN} watched circuits",
+        )
+
+    @callback
+    def _async_watch_tick(self, _now: Any) -> None:
+        """Start a refresh of the watched circuits unless one is still running."""
+        # 失敗後の再試行中は ECOマネの負荷を増やさない (停止後は取得しない)
+        if self._watch_task is not None or self.backing_off or self._session.closed:
+            return
+        self._watch_task = self.hass.async_create_background_task(
+            self.async_refresh_watched(), f"{DOMAIN}_watch_{self._ip_address}"
+        )
+        self._watch_task.add_done_callback(self._watch_done)
+
+    def _watch_done(self, _task: asyncio.Task) -> None:
+        """Forget the finished refresh of the watched circuits."""
+        self._watch_task = None
+
+    async def async_refresh_watched(self) -> None:
+        """Fetch only the pages of the watched circuits and record their power."""
+        watch = self._watch
+        pages = watch.pages((c.selNo, c.page) for c in self._topology)
+        if not pages:
+            return
+        urls = [self._circuit_page_url(page_num) for page_num in pages]
+        try:
+            bodies = await _gather_or_cancel(
+                *(
+                    self._async_fetch(url, SENSOR_CIRCUIT_ENDPOINT, cycle=False)
+                    for url in urls
+                )
+            )
+            timestamp = time.time()
+            # 前回から変化したページのみ解析
+            digests = [
+                hashlib.blake2b(body, digest_size=FINGERPRINT_SIZE).digest()
+                for body in bodies
+            ]
+            parsed_pages = [
+                watch.cached_page(page_num, digest)
+                for page_num, digest in zip(pages, digests, strict=True)
+            ]
+            changed = [index for index, page in enumerate(parsed_pages) if page is None]
+            if changed:
+                parsed = await self._async_parse(
+                    parse_circuit_bodies, [bodies[index] for index in changed]
                 )
-                await asyncio.sleep(RETRY_INTERVAL)  # Retry interval
+                for index, page in zip(changed, parsed, strict=True):
+                    parsed_pages[index] = watch.cache_page(
+                        pages[index], digests[index], page
+                    )
+        except (UpdateFailed, aiohttp.ClientError, TimeoutError) as err:
+            # 全体の巡回が失敗を扱うため、ここでは記録のみ
+            watch.failures += 1
+            _LOGGER.debug("Error refreshing watched circuits: %s", err)
+            return
+        watch.refreshes += 1
+
+        # 監視対象の回路の値を記録し、変化したエンティティのみに通知
+        changed_keys: set[tuple[str, int | str]] = set()
+        power = self._data.power
+        for url, page in zip(urls, parsed_pages, strict=True):
+            for circuit in page.circuits:
+                if circuit.selNo not in watch.circuits:
+                    continue
+                watch.record(circuit.selNo, timestamp, circuit.watts)
+                index = self._circuit_indexes.get(circuit.selNo)
+                if index is not None and index < len(power):
+                    self._set_value(
+                        (TIER_POWER, circuit.selNo),
+                        power,
+                        index,
+                        circuit.watts,
+                        changed_keys,
+                    )
+                    # 監視対象の回路は短い間隔の記録で電力量を積算
+                    if self._integrator is not None:
+                        self._integrate_energy(
+                            circuit.selNo,
+                            index,
+                            timestamp,
+                            circuit.watts,
+                            changed_keys,
+                        )
+            # 全体の巡回で前回と同じ応答でも値を書き戻すよう、ページのハッシュを破棄
+            self._fingerprints.pop(url, None)
+        if not changed_keys:
+            return
+        self._publish_values(changed_keys)
+        contexts = self._contexts(changed_keys)
+        for update_callback, context in list(self._listeners.values()):
+            if context in contexts:
+                update_callback()
+
+    async def async_fetch_yesterday_energy(
+        self, circuits: list[EcoManeCircuit]
+    ) -> list[float | None]:
+        """Fetch yesterday's energy of circuits one request at a time."""
+        bodies: list[bytes] = []
+        for number, circuit in enumerate(circuits):
+            # 通常の polling を妨げないよう間隔を空けて取得
+            if number:
+                await asyncio.sleep(BACKFILL_REQUEST_DELAY)
+            target = CircuitEnergyTarget(
+                page_num=circuit.page,
+                total_page=self._total_page,
+                selNo=circuit.selNo,
+                index=circuit.index,
+            )
+            bodies.append(
+                await self._async_fetch(
+                    self._circuit_energy_url(target),
+                    SENSOR_CIRCUIT_ENERGY_CGI,
+                    cycle=False,
+                )
+            )
+        return await self._async_parse(parse_energy_history_bodies, bodies)
 
     @property
     def circuit_total(self) -> int:
         """Total number of power sensors."""
         return self._attr_circuit_total
 
+    @property
+    def poll_interval(self) -> timedelta:
+        """Current effective interval of the scheduled refreshes."""
+        return timedelta(seconds=self._polling.interval)
+
+    @property
+    def backing_off(self) -> bool:
+        """Return True while retrying after failed updates."""
+        return self._polling.backoff is not None
+
+    @property
+    def changed_keys(self) -> set[tuple[str, int | str]]:
+        """Keys (tier, usage number or selNo) whose values changed in the last update."""
+        return self._changed_keys
+
+    @property
+    def telemetry(self) -> EcoManeTelemetry:
+        """Performance measurements of the updates."""
+        return self._telemetry
+
+    @property
+    def energy_integrator(self) -> EnergyIntegrator | None:
+        """Local energy integration, or None if the device energy is used."""
+        return self._integrator
+
+    @property
+    def capture(self) -> ResponseArchive | None:
+        """Archive of the raw responses, or None if capture is disabled."""
+        return self._capture
+
+    @property
+    def circuit_entities(self) -> str:
+        """Unit of the circuit entities (circuit, page or device)."""
+        return self._circuit_entities
+
+    @property
+    def circuit_groups(self) -> list[str]:
+        """Groups of the aggregate entities, or empty if circuits have their own."""
+        return sorted(
+            set(self._circuit_groups.values()),
+            key=lambda group: (len(group), group),
+        )
+
+    @property
+    def profiler(self) -> CycleProfiler | None:
+        """Running profiler, or None if no profile is in progress."""
+        return self._profiler
+
+    @property
+    def export(self) -> TimeSeriesExport | None:
+        """Time-series export, or None if it is disabled."""
+        return self._export
+
+    @property
+    def watch(self) -> CircuitWatchList:
+        """Watched circuits and their recent power samples."""
+        return self._watch
+
+    @property
+    def version(self) -> str:
+        """Version of the values, changed whenever a value or the topology changes."""
+        return f"{self._version_tag}-{self._version}"
+
+    @property
+    def fingerprint_stats(self) -> dict[str, dict[str, int]]:
+        """Unchanged (hits) and changed (misses) responses per endpoint."""
+        return self._fingerprint_stats
+
+    @property
+    def stream_stats(self) -> dict[str, dict[str, int]]:
+        """Responses closed before their end and the bytes not read per endpoint."""
+        return self._stream_stats
+
+    def circuit_index(self, selNo: str) -> int | None:
+        """Current number of a circuit, or None if it is no longer present."""
+        return self._circuit_indexes.get(selNo)
+
+    @property
+    def topology(self) -> list[EcoManeCircuit]:
+        """Circuits discovered on the device or loaded from the cache."""
+        return self._topology
+
     @property
     def usage_sensor_descs(self) -> list[EcoManeUsageSensorEntityDescription]:
         """Usage sensor descriptions."""
         return self._attr_usage_sensor_descs
 
+    @property
+    def connections_created(self) -> int:
+        """Number of HTTP connections opened to the device."""
+        return self._connections_created
+
+    @property
+    def connections_reused(self) -> int:
+        """Number of requests served over a reused keep-alive connection."""
+        return self._connections_reused
+
+    @property
+    def snapshot(self) -> EcoManeData:
+        """Latest values, also available before the first update."""
+        return self._data
+
     @property
     def ip_address(self) -> str:
         """IP address."""
-        return self._data_dict[KEY_IP_ADDRESS]
+        return self._ip_address
@@ -0,0 +1,59 @@
+"""Diagnostics support for Eco Mane HEMS component."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONFIG_SELECTOR_IP, DOMAIN, FLEET_SCHEDULER
+from .coordinator import EcoManeDataCoordinator
+from .scheduler import EcoManeFleetScheduler
+
+# ダウンロードする診断情報から除く項目
+TO_REDACT = {CONFIG_SELECTOR_IP}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: EcoManeDataCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    scheduler: EcoManeFleetScheduler = hass.data[DOMAIN][FLEET_SCHEDULER]
+    telemetry = coordinator.telemetry
+    integrator = coordinator.energy_integrator
+    capture = coordinator.capture
+    return {
+        "config_entry": {
+            "data": async_redact_data(dict(config_entry.data), TO_REDACT),
+            "options": dict(config_entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "poll_interval": coordinator.poll_interval.total_seconds(),
+            "backing_off": coordinator.backing_off,
+            "circuit_total": coordinator.circuit_total,
+            "connections_created": coordinator.connections_created,
+            "connections_reused": coordinator.connections_reused,
+            "fingerprints": coordinator.fingerprint_stats,
+            "streaming": coordinator.stream_stats,
+        },
+        "scheduler": {
+            "lag": scheduler.device_lag(config_entry.entry_id),
+            "missed": scheduler.device_missed(config_entry.entry_id),
+        },
+        # 電力量を積算しない場合は None
+        "energy_integration": integrator.as_dict() if integrator else None,
+        # 監視対象の回路がない場合は None
+        "watch": coordinator.watch.as_dict() if coordinator.watch else None,
+        # 時系列を書き出さない場合は None
+        "export": coordinator.export.as_dict() if coordinator.export else None,
+        # プロファイルの実行中でなければ None
+        "profile": coordinator.profiler.as_dict() if coordinator.profiler else None,
+        # 応答を記録しない場合は None
+        "capture": capture.as_dict() if capture is not None else None,
+        # 計測が無効な場合は None
+        "telemetry": telemetry.as_dict() if telemetry.enabled else None,
+    }
@@ -0,0 +1,234 @@
+"""Columnar time-series export for Eco Mane HEMS component."""
+
+from __future__ import annotations
+
+from array import array
+import bisect
+import contextlib
+from datetime import date
+import gzip
+import logging
+import math
+import mmap
+import os
+from pathlib import Path
+import shutil
+import time
+from typing import Any, Self
+
+from homeassistant.util import dt as dt_util
+
+from .const import EXPORT_FLUSH_INTERVAL
+
+_LOGGER = logging.getLogger(__name__)
+
+# 列ごとのファイル (float64 をこのプラットフォームのバイト順で連結)
+_SUFFIX = ".f64"
+_COMPRESSED_SUFFIX = ".f64.gz"
+_ITEM_SIZE = array("d").itemsize
+TIMESTAMP_COLUMN = "timestamp"  # UNIX 時間 (昇順)
+
+
+def _column_path(directory: Path, column: str) -> Path:
+    """File of a column in a day directory."""
+    return directory / f"{column}{_SUFFIX}"
+
+
+def _columns(directory: Path, suffix: str = _SUFFIX) -> list[str]:
+    """Columns stored in a day directory."""
+    return sorted(path.name[: -len(suffix)] for path in directory.glob(f"*{suffix}"))
+
+
+class TimeSeriesExport:
+    """Append every refreshed sample to daily column files."""
+
+    def __init__(
+        self, directory: Path, flush_interval: float = EXPORT_FLUSH_INTERVAL
+    ) -> None:
+        """Initialize the export in a directory."""
+        self.directory = directory
+        self._flush_interval = flush_interval
+        # 書き込み待ちの行 (日付, 時刻, 列の値)
+        self._pending: list[tuple[str, float, dict[str, float]]] = []
+        self._last_flush = time.monotonic()
+        self._day: str | None = None  # 追記中の日付
+        self._day_columns: set[str] = set()
+        self._day_rows = 0
+        self.rows_written = 0
+
+    def append(self, timestamp: float, values: dict[str, float]) -> None:
+        """Queue a row for the next flush (on the event loop)."""
+        day = dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).date()
+        self._pending.append((day.isoformat(), timestamp, values))
+
+    @property
+    def has_pending(self) -> bool:
+        """Return True if rows wait for a flush."""
+        return bool(self._pending)
+
+    @property
+    def flush_due(self) -> bool:
+        """Return True if the pending rows should be written now."""
+        return (
+            bool(self._pending)
+            and time.monotonic() - self._last_flush >= self._flush_interval
+        )
+
+    def flush(self) -> None:
+        """Write the queued rows to disk (in the executor)."""
+        pending, self._pending = self._pending, []
+        self._last_flush = time.monotonic()
+        start = 0
+        for end in range(1, len(pending) + 1):
+            # 日付ごとにまとめて書き込む
+            if end == len(pending) or pending[end][0] != pending[start][0]:
+                self._write_day(pending[start][0], pending[start:end])
+                start = end
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summary of the export for the diagnostics download."""
+        return {
+            "directory": str(self.directory),
+            "day": self._day,
+            "columns": len(self._day_columns),
+            "rows_written": self.rows_written,
+            "pending": len(self._pending),
+        }
+
+    def _write_day(
+        self, day: str, rows: list[tuple[str, float, dict[str, float]]]
+    ) -> None:
+        """Append rows to the column files of a day."""
+        if day != self._day:
+            self._open_day(day)
+        directory = self.directory / day
+        columns: dict[str, None] = dict.fromkeys(sorted(self._day_columns))
+        for _, _, values in rows:
+            columns.update(dict.fromkeys(values))
+        for column in columns:
+            if column not in self._day_columns:
+                # 途中から現れた列はそれまでの行を NaN で埋める
+                with _column_path(directory, column).open("ab") as file:
+                    file.write(array("d", [math.nan]).tobytes() * self._day_rows)
+                self._day_columns.add(column)
+        with _column_path(directory, TIMESTAMP_COLUMN).open("ab") as file:
+            file.write(array("d", [timestamp for _, timestamp, _ in rows]).tobytes())
+        for column in columns:
+            with _column_path(directory, column).open("ab") as file:
+                file.write(
+                    array(
+                        "d", [values.get(column, math.nan) for _, _, values in rows]
+                    ).tobytes()
+                )
+        self._day_rows += len(rows)
+        self.rows_written += len(rows)
+
+    def _open_day(self, day: str) -> None:
+        """Start appending to a day and compress the earlier ones."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for directory in sorted(self.directory.iterdir()):
+            if directory.is_dir() and directory.name < day:
+                _compress_day(directory)
+        directory = self.directory / day
+        directory.mkdir(exist_ok=True)
+        columns = _columns(directory)
+        # 書き込み中に止まった場合は全ての列を短い方に揃える
+        rows = min(
+            (
+                _column_path(directory, column).stat().st_size // _ITEM_SIZE
+                for column in columns
+            ),
+            default=0,
+        )
+        if TIMESTAMP_COLUMN not in columns:
+            rows = 0
+        for column in columns:
+            os.truncate(_column_path(directory, column), rows * _ITEM_SIZE)
+        columns = [column for column in columns if column != TIMESTAMP_COLUMN]
+        self._day = day
+        self._day_columns = set(columns)
+        self._day_rows = rows
+
+
+def _compress_day(directory: Path) -> None:
+    """Gzip the column files of a finished day."""
+    for column in _columns(directory):
+        path = _column_path(directory, column)
+        with (
+            path.open("rb") as source,
+            gzip.open(directory / f"{column}{_COMPRESSED_SUFFIX}", "wb") as target,
+        ):
+            shutil.copyfileobj(source, target)
+        path.unlink()
+        _LOGGER.debug("Export column %s/%s compressed", directory.name, column)
+
+
+class ExportDay:
+    """Columns of an exported day (memory-mapped unless compressed)."""
+
+    def __init__(self, directory: Path) -> None:
+        """Open the columns of a day directory."""
+        self.directory = directory
+        self._maps: list[mmap.mmap] = []
+        self._views: dict[str, memoryview] = {}
+        for column in _columns(directory):
+            path = _column_path(directory, column)
+            # 追記中の行の途中までは読まない
+            size = path.stat().st_size // _ITEM_SIZE * _ITEM_SIZE
+            if size == 0:
+                self._views[column] = memoryview(b"").cast("d")
+                continue
+            with path.open("rb") as file:
+                mapped = mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ)
+            self._maps.append(mapped)
+            self._views[column] = memoryview(mapped).cast("d")
+        # 前日以前は圧縮されているため展開して読む
+        for column in _columns(directory, _COMPRESSED_SUFFIX):
+            with gzip.open(directory / f"{column}{_COMPRESSED_SUFFIX}", "rb") as file:
+                self._views[column] = memoryview(file.read()).cast("d")
+        # 列の長さを揃える (書き込み中の行は含めない)
+        rows = min((len(view) for view in self._views.values()), default=0)
+        self._views = {column: view[:rows] for column, view in self._views.items()}
+
+    @property
+    def columns(self) -> list[str]:
+        """Names of the columns."""
+        return list(self._views)
+
+    def column(self, name: str) -> memoryview:
+        """All values of a column."""
+        return self._views[name]
+
+    def range(self, start: float, end: float) -> dict[str, memoryview]:
+        """Values of all columns with start <= timestamp < end."""
+        timestamps = self._views.get(TIMESTAMP_COLUMN)
+        if timestamps is None:
+            return {}
+        first = bisect.bisect_left(timestamps, start)
+        last = bisect.bisect_left(timestamps, end, first)
+        return {column: view[first:last] for column, view in self._views.items()}
+
+    def close(self) -> None:
+        """Release the views and unmap the files."""
+        for view in self._views.values():
+            view.release()
+        self._views = {}
+        for mapped in self._maps:
+            # 呼び出し元が値を参照している間は、その解放時に閉じる
+            with contextlib.suppress(BufferError):
+                mapped.close()
+        self._maps = []
+
+    def __enter__(self) -> Self:
+        """Use the day as a context manager."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Close the day."""
+        self.close()
+
+
+def open_export_day(directory: str | os.PathLike[str], day: date | str) -> ExportDay:
+    """Open the columns exported for a day."""
+    name = day.isoformat() if isinstance(day, date) else day
+    return ExportDay(Path(directory) / name)
@@ -0,0 +1,89 @@
+"""Local energy integration for Eco Mane HEMS component."""
+
+from __future__ import annotations
+
+from datetime import date
+import math
+from typing import Any
+
+from .const import ENERGY_INTEGRATION_MAX_GAP
+
+# W·秒 から kWh への換算
+_WATT_SECONDS_PER_KWH = 3_600_000
+
+
+class EnergyIntegrator:
+    """Integrate circuit power samples into today's energy (trapezoidal rule)."""
+
+    def __init__(self) -> None:
+        """Initialize the integrator."""
+        self._last: dict[str, tuple[float, float]] = {}  # selNo: (時刻, 電力 W)
+        self.day: date | None = None  # 積算中の日付 (日付が変わると 0 に戻す)
+        self.reconciliations = 0  # ECOマネの値で補正した回数 (回路ごとの累計)
+        self.last_drift: dict[str, float] = {}  # 回路ごとの直前の補正量 (kWh)
+        self.max_drift = 0.0  # 補正量の絶対値の最大 (kWh)
+        # ECOマネの値より先行した分 (以後の積算から差し引く kWh)
+        self._ahead: dict[str, float] = {}
+
+    def integrate(self, selNo: str, timestamp: float, watts: float) -> float:
+        """Energy (kWh) of a circuit since its previous sample."""
+        if math.isnan(watts):
+            self._last.pop(selNo, None)
+            return 0.0
+        previous = self._last.get(selNo)
+        if previous is not None and timestamp <= previous[0]:
+            # 並行した取得で前後した記録は使わない
+            return 0.0
+        self._last[selNo] = (timestamp, watts)
+        if previous is None:
+            return 0.0
+        last_timestamp, last_watts = previous
+        elapsed = timestamp - last_timestamp
+        # 間隔が空きすぎた場合は推定せず、次の補正に任せる
+        if elapsed > ENERGY_INTEGRATION_MAX_GAP:
+            return 0.0
+        kwh = (last_watts + watts) / 2 * elapsed / _WATT_SECONDS_PER_KWH
+        if ahead := self._ahead.get(selNo):
+            # ECOマネの値が追いつくまで積算した分を差し引く
+            used = min(ahead, kwh)
+            self._ahead[selNo] = ahead - used
+            kwh -= used
+        return kwh
+
+    def reconcile(self, selNo: str, local: float, device: float) -> float:
+        """Energy (kWh) of a circuit after comparing it with the device value."""
+        if math.isnan(local):
+            self._ahead.pop(selNo, None)
+            return device
+        drift = local - device
+        self.reconciliations += 1
+        self.last_drift[selNo] = drift
+        self.max_drift = max(self.max_drift, abs(drift))
+        # 増加し続ける値 (TOTAL_INCREASING) のため下げず、先行した分は
+        # 以後の積算から差し引いて ECOマネの値に合わせる
+        self._ahead[selNo] = max(drift, 0.0)
+        return max(local, device)
+
+    def roll_over(self, day: date) -> None:
+        """Start integrating a new day."""
+        self.day = day
+        self._ahead.clear()
+
+    def forget(self, selNos: set[str]) -> None:
+        """Drop the state of circuits that are no longer present."""
+        for selNo in {*self._last, *self._ahead}:
+            if selNo not in selNos:
+                self._last.pop(selNo, None)
+                self.last_drift.pop(selNo, None)
+                self._ahead.pop(selNo, None)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Drift of the local integration for the diagnostics download."""
+        return {
+            "day": self.day.isoformat() if self.day is not None else None,
+            "reconciliations": self.reconciliations,
+            "max_drift": round(self.max_drift, 4),
+            "last_drift": {
+                selNo: round(drift, 4) for selNo, drift in self.last_drift.items()
+            },
+        }
@@ -0,0 +1,460 @@
+"""Parsers for Eco Mane HEMS pages."""
+
+from __future__ import annotations
+
+import codecs
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+import logging
+import math
+
+from bs4 import BeautifulSoup, NavigableString
+from bs4.element import Tag
+
+from .const import (
+    ENCODING,
+    SENSOR_CIRCUIT_ENERGY_SELECTOR,
+    SENSOR_CIRCUIT_SELECTOR_BUTTON,
+    SENSOR_CIRCUIT_SELECTOR_CIRCUIT,
+    SENSOR_CIRCUIT_SELECTOR_PLACE,
+    SENSOR_CIRCUIT_SELECTOR_POWER,
+    SENSOR_CIRCUIT_SELECTOR_PREFIX,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+CIRCUITS_PER_PAGE = 8  # 1ページあたりの回路数 (ojt_01 〜 ojt_08)
+ENERGY_TODAY_PREFIX = "今日:"
+ENERGY_YESTERDAY_PREFIX = "昨日:"
+ENERGY_UNIT = "kWh"
+POWER_UNIT = "W"
+
+
+# 回路ページの回路
+@dataclass(slots=True)
+class ParsedCircuit:
+    """Circuit found in an elecCheck_6000.cgi page."""
+
+    selNo: str = ""
+    place: str | None = None  # txt
+    circuit: str | None = None  # txt2
+    power: str | None = None  # num
+    watts: float = math.nan  # num の数値 (W)
+
+
+# 回路ページ
+@dataclass(slots=True)
+class ParsedCircuitPage:
+    """Contents of an elecCheck_6000.cgi page."""
+
+    total_page: int = 0  # maxp
+    circuits: list[ParsedCircuit] = field(default_factory=list)
+
+
+def _is_number(value: str | None) -> bool:
+    """Return True if the value can be read as a number."""
+    if value is None:
+        return False
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _to_float(value: str | None) -> float | None:
+    """Convert a parsed value to a number, or None if it is not one."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _sel_no_from_href(href: str) -> str | None:
+    """Extract selNo from javascript:moveCircuitChange('selNo')."""
+    js_parts = href.split("moveCircuitChange('")
+    if len(js_parts) > 1:
+        return js_parts[1].split("')")[0]
+    return None
+
+
+def _today_energy(text: str) -> str | None:
+    """Extract today's energy from 今日:1.02kWh　昨日:3.16kWh."""
+    today_parts = text.split(ENERGY_TODAY_PREFIX)
+    if len(today_parts) > 1:
+        return today_parts[1].split(ENERGY_UNIT)[0]
+    return None
+
+
+def _yesterday_energy(text: str) -> str | None:
+    """Extract yesterday's energy from 今日:1.02kWh　昨日:3.16kWh."""
+    yesterday_parts = text.split(ENERGY_YESTERDAY_PREFIX)
+    if len(yesterday_parts) > 1:
+        return yesterday_parts[1].split(ENERGY_UNIT)[0]
+    return None
+
+
+class _DivTextParser(HTMLParser):
+    """Collect the text of the first div with each of the given ids."""
+
+    def __init__(self, div_ids: Iterable[str]) -> None:
+        super().__init__(convert_charrefs=True)
+        self._wanted = set(div_ids)
+        self._depth = 0  # div の深さ
+        self._capture: tuple[str, int] | None = None  # (id, 開始時の深さ)
+        self._parts: list[str] = []
+        self.values: dict[str, str] = {}
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag != "div":
+            return
+        self._depth += 1
+        if self._capture is None:
+            div_id = dict(attrs).get("id")
+            if div_id in self._wanted and div_id not in self.values:
+                self._capture = (div_id, self._depth)
+                self._parts = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag != "div":
+            return
+        if self._capture is not None and self._capture[1] == self._depth:
+            self.values[self._capture[0]] = "".join(self._parts)
+            self._capture = None
+        self._depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if self._capture is not None:
+            self._parts.append(data)
+
+    @property
+    def done(self) -> bool:
+        """Return True once every wanted div has been closed."""
+        return len(self.values) == len(self._wanted)
+
+
+class StreamingDivParser:
+    """Decode Shift-JIS chunks as they arrive and collect the text of divs."""
+
+    def __init__(self, div_ids: Iterable[str]) -> None:
+        """Initialize the parser for the given div ids."""
+        # 文字の途中で区切られたチャンクは次のチャンクと合わせてデコードする
+        self._decoder = codecs.getincrementaldecoder(ENCODING)(errors="replace")
+        self._parser = _DivTextParser(div_ids)
+
+    def feed(self, chunk: bytes) -> bool:
+        """Parse a chunk and return True once all divs have been seen."""
+        self._parser.feed(self._decoder.decode(chunk))
+        return self._parser.done
+
+    def close(self) -> None:
+        """Parse the rest at the end of the response."""
+        self._parser.feed(self._decoder.decode(b"", final=True))
+        self._parser.close()
+
+    @property
+    def done(self) -> bool:
+        """Return True once all divs have been seen."""
+        return self._parser.done
+
+    @property
+    def values(self) -> dict[str, str]:
+        """Text of the divs seen so far."""
+        return self._parser.values
+
+
+class _CircuitPageParser(HTMLParser):
+    """Collect maxp and the ojt_NN circuit blocks in a single pass."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._depth = 0  # div の深さ
+        self._block: ParsedCircuit | None = None  # 解析中の ojt_NN
+        self._block_depth = 0
+        self._in_button = 0  # btn btn_58 の開始時の深さ (0 は範囲外)
+        self._seen: set[str] = set()  # 解析中の ojt_NN で取得済みの項目
+        self._captures: list[tuple[str, int, list[str]]] = []  # (項目, 深さ, 文字列)
+        self.total_page = 0
+        self.blocks: dict[int, ParsedCircuit] = {}
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == "input":
+            attr_dict = dict(attrs)
+            if attr_dict.get("name") == "maxp" and self.total_page == 0:
+                self.total_page = int(attr_dict.get("value") or "0")
+            return
+        if tag == "a":
+            if self._block is not None and self._in_button and not self._block.selNo:
+                href = dict(attrs).get("href")
+                if href:
+                    self._block.selNo = _sel_no_from_href(href) or ""
+            return
+        if tag != "div":
+            return
+
+        self._depth += 1
+        attr_dict = dict(attrs)
+        if self._block is None:
+            div_id = attr_dict.get("id") or ""
+            prefix = f"{SENSOR_CIRCUIT_SELECTOR_PREFIX}_"
+            if div_id.startswith(prefix) and div_id[len(prefix) :].isdigit():
+                button_num = int(div_id[len(prefix) :])
+                if button_num not in self.blocks:
+                    self._block = self.blocks[button_num] = ParsedCircuit()
+                    self._block_depth = self._depth
+                    self._seen = set()
+            return
+
+        class_attr = attr_dict.get("class") or ""
+        if class_attr == SENSOR_CIRCUIT_SELECTOR_BUTTON and "button" not in self._seen:
+            self._seen.add("button")
+            self._in_button = self._depth
+        classes = class_attr.split()
+        for item in (
+            SENSOR_CIRCUIT_SELECTOR_PLACE,
+            SENSOR_CIRCUIT_SELECTOR_CIRCUIT,
+            SENSOR_CIRCUIT_SELECTOR_POWER,
+        ):
+            if item in classes and item not in self._seen:
+                self._seen.add(item)
+                self._captures.append((item, self._depth, []))
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag != "div":
+            return
+        if self._block is not None:
+            while self._captures and self._captures[-1][1] == self._depth:
+                item, _, parts = self._captures.pop()
+                text = "".join(parts)
+                if item == SENSOR_CIRCUIT_SELECTOR_PLACE:
+                    self._block.place = text
+                elif item == SENSOR_CIRCUIT_SELECTOR_CIRCUIT:
+                    self._block.circuit = text
+                else:
+                    self._block.power = text.split(POWER_UNIT)[0]
+            if self._in_button == self._depth:
+                self._in_button = 0
+            if self._block_depth == self._depth:
+                self._block = None
+                self._captures = []
+        self._depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        for _, _, parts in self._captures:
+            parts.append(data)
+
+
+def _fast_parse_usage_page(text: str, keys: Iterable[str]) -> dict[str, str]:
+    """Parse ecoTopMoni.cgi without building a tree."""
+    parser = _DivTextParser(keys)
+    parser.feed(text)
+    parser.close()
+    return {key: value.strip() for key, value in parser.values.items()}
+
+
+def _bs_parse_usage_page(text: str, keys: Iterable[str]) -> dict[str, str]:
+    """Parse ecoTopMoni.cgi with BeautifulSoup."""
+    # BeautifulSoupを使用してHTMLを解析
+    soup = BeautifulSoup(text, "html.parser")
+    # 指定したIDを持つdivタグの値を取得して辞書に格納
+    values = {}
+    for key in keys:
+        div = soup.find("div", id=key)
+        if div:
+            values[key] = div.text.strip()
+    return values
+
+
+def parse_usage_page(text: str, keys: Iterable[str]) -> dict[str, str]:
+    """Parse the usage values of ecoTopMoni.cgi."""
+    keys = list(keys)
+    values = _fast_parse_usage_page(text, keys)
+    if len(values) == len(keys) and all(map(_is_number, values.values())):
+        return values
+    _LOGGER.debug("Falling back to BeautifulSoup for the usage page")
+    return _bs_parse_usage_page(text, keys)
+
+
+def _fast_parse_circuit_page(text: str) -> ParsedCircuitPage:
+    """Parse elecCheck_6000.cgi without building a tree."""
+    parser = _CircuitPageParser()
+    parser.feed(text)
+    parser.close()
+    page = ParsedCircuitPage(total_page=parser.total_page)
+    for button_num in range(1, CIRCUITS_PER_PAGE + 1):
+        circuit = parser.blocks.get(button_num)
+        if circuit is None:
+            break
+        page.circuits.append(circuit)
+    return page
+
+
+def _bs_parse_circuit_page(text: str) -> ParsedCircuitPage:
+    """Parse elecCheck_6000.cgi with BeautifulSoup."""
+    # BeautifulSoupを使用してHTMLを解析
+    soup = BeautifulSoup(text, "html.parser")
+    page = ParsedCircuitPage()
+    # 最大ページ数を取得
+    maxp = soup.find("input", {"name": "maxp"})
+    if isinstance(maxp, Tag):
+        value = maxp.get("value", "0")
+        # Ensure value is a string before converting to int
+        if isinstance(value, str):
+            page.total_page = int(value)
+
+    # ページ内の各回路のデータを取得
+    for button_num in range(1, CIRCUITS_PER_PAGE + 1):
+        div_id = f"{SENSOR_CIRCUIT_SELECTOR_PREFIX}_{button_num:02d}"  # ojt_??
+        div_element: Tag | NavigableString | None = soup.find("div", id=div_id)
+        if not isinstance(div_element, Tag):
+            break
+        circuit = ParsedCircuit()
+
+        # 回路の(ボタンの)selNo
+        button_div = div_element.find(
+            "div",
+            class_=SENSOR_CIRCUIT_SELECTOR_BUTTON,  # btn btn_58
+        )
+        if isinstance(button_div, Tag):
+            a_tag = button_div.find("a")
+            # <a href="javascript:moveCircuitChange('selNo')">...</a>
+            if isinstance(a_tag, Tag) and "href" in a_tag.attrs:
+                href_value = a_tag["href"]
+                if isinstance(href_value, str):
+                    circuit.selNo = _sel_no_from_href(href_value) or ""
+
+        # 場所
+        element: Tag | NavigableString | int | None = div_element.find(
+            "div",
+            class_=SENSOR_CIRCUIT_SELECTOR_PLACE,  # txt
+        )
+        if isinstance(element, Tag):
+            circuit.place = element.get_text()
+
+        # 回路
+        element = div_element.find(
+            "div",
+            class_=SENSOR_CIRCUIT_SELECTOR_CIRCUIT,  # txt2
+        )
+        if isinstance(element, Tag):
+            circuit.circuit = element.get_text()
+
+        # 電力
+        element = div_element.find(
+            "div",
+            class_=SENSOR_CIRCUIT_SELECTOR_POWER,  # num
+        )
+        if isinstance(element, Tag):
+            circuit.power = element.get_text().split(POWER_UNIT)[0]
+
+        page.circuits.append(circuit)
+    return page
+
+
+def parse_circuit_page(text: str) -> ParsedCircuitPage:
+    """Parse the circuits of an elecCheck_6000.cgi page."""
+    page = _fast_parse_circuit_page(text)
+    if (
+        page.total_page > 0
+        and page.circuits
+        and all(
+            circuit.selNo
+            and circuit.place is not None
+            and circuit.circuit is not None
+            and _is_number(circuit.power)
+            for circuit in page.circuits
+        )
+    ):
+        return page
+    _LOGGER.debug("Falling back to BeautifulSoup for a circuit page")
+    return _bs_parse_circuit_page(text)
+
+
+def _fast_parse_energy_page(
+    text: str, extract: Callable[[str], str | None] = _today_energy
+) -> str | None:
+    """Parse resultGraphDiv_4242.cgi without building a tree."""
+    parser = _DivTextParser([SENSOR_CIRCUIT_ENERGY_SELECTOR])
+    parser.feed(text)
+    parser.close()
+    ttx = parser.values.get(SENSOR_CIRCUIT_ENERGY_SELECTOR)
+    return None if ttx is None else extract(ttx)
+
+
+def _bs_parse_energy_page(
+    text: str, extract: Callable[[str], str | None] = _today_energy
+) -> str | None:
+    """Parse resultGraphDiv_4242.cgi with BeautifulSoup."""
+    # BeautifulSoupを使用してHTMLを解析
+    soup = BeautifulSoup(text, "html.parser")
+    ttx = soup.find("div", id=SENSOR_CIRCUIT_ENERGY_SELECTOR)  # ttx_01
+    if isinstance(ttx, Tag):
+        return extract(ttx.get_text())
+    return None
+
+
+def parse_energy_page(text: str) -> str | None:
+    """Parse today's energy of a resultGraphDiv_4242.cgi page."""
+    # 今日の消費電力量を取得 (<div id="ttx_01" class="ttx">今日:1.02kWh　昨日:3.16kWh</div>)
+    today_energy = _fast_parse_energy_page(text)
+    if _is_number(today_energy):
+        return today_energy
+    _LOGGER.debug("Falling back to BeautifulSoup for an energy page")
+    return _bs_parse_energy_page(text)
+
+
+def parse_energy_history_page(text: str) -> str | None:
+    """Parse yesterday's energy of a resultGraphDiv_4242.cgi page."""
+    # ECOマネのページで数値として読める過去の値は ttx_01 の昨日の電力量のみ
+    yesterday_energy = _fast_parse_energy_page(text, _yesterday_energy)
+    if _is_number(yesterday_energy):
+        return yesterday_energy
+    _LOGGER.debug("Falling back to BeautifulSoup for an energy page")
+    return _bs_parse_energy_page(text, _yesterday_energy)
+
+
+# 以下は受信しながら解析した値の変換 (読めない場合は None を返し、本文全体を解析し直す)
+def streamed_usage(
+    values: dict[str, str], keys: list[str]
+) -> list[float | None] | None:
+    """Usage values of a streamed ecoTopMoni.cgi response (values in keys order)."""
+    usage = [_to_float(values.get(key, "").strip()) for key in keys]
+    return None if None in usage else usage
+
+
+def streamed_energy(values: dict[str, str]) -> float | None:
+    """Today's energy of a streamed resultGraphDiv_4242.cgi response."""
+    ttx = values.get(SENSOR_CIRCUIT_ENERGY_SELECTOR)
+    return None if ttx is None else _to_float(_today_energy(ttx))
+
+
+# 以下は executor で実行するため、バイト列を受け取りデコードから数値への変換までを行う
+def parse_usage_body(body: bytes, keys: list[str]) -> list[float | None]:
+    """Decode and parse an ecoTopMoni.cgi response body (values in keys order)."""
+    values = parse_usage_page(body.decode(ENCODING), keys)
+    return [_to_float(values.get(key)) for key in keys]
+
+
+def parse_circuit_bodies(bodies: list[bytes]) -> list[ParsedCircuitPage]:
+    """Decode and parse a batch of elecCheck_6000.cgi response bodies."""
+    pages = [parse_circuit_page(body.decode(ENCODING)) for body in bodies]
+    for page in pages:
+        for circuit in page.circuits:
+            watts = _to_float(circuit.power)
+            circuit.watts = math.nan if watts is None else watts
+    return pages
+
+
+def parse_energy_bodies(bodies: list[bytes]) -> list[float | None]:
+    """Decode and parse a batch of resultGraphDiv_4242.cgi response bodies."""
+    return [_to_float(parse_energy_page(body.decode(ENCODING))) for body in bodies]
+
+
+def parse_energy_history_bodies(bodies: list[bytes]) -> list[float | None]:
+    """Decode and parse yesterday's energy from resultGraphDiv_4242.cgi bodies."""
+    return [
+        _to_float(parse_energy_history_page(body.decode(ENCODING))) for body in bodies
+    ]
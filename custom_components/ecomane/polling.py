@@ -0,0 +1,72 @@
+"""Adaptive polling interval for Eco Mane HEMS component."""
+
+from __future__ import annotations
+
+import random
+
+from .const import (
+    ADAPTIVE_FAST_RATIO,
+    ADAPTIVE_GROW,
+    ADAPTIVE_MAX_SCALE,
+    ADAPTIVE_MIN_SCALE,
+    ADAPTIVE_SHRINK,
+    ADAPTIVE_SLOW_RATIO,
+    BACKOFF_INITIAL,
+    BACKOFF_MAX,
+    MIN_TIER_INTERVAL,
+)
+
+
+class AdaptivePollingController:
+    """Adjust the polling interval to the health of the device."""
+
+    def __init__(
+        self, base_interval: float, enabled: bool, allow_faster: bool = False
+    ) -> None:
+        """Initialize the controller with the configured interval."""
+        self.enabled = enabled
+        self._base_interval = base_interval  # 設定した間隔 (秒)
+        # 設定した間隔より短くしない場合は倍率の下限を 1 とする
+        self._min_scale = ADAPTIVE_MIN_SCALE if allow_faster else 1.0
+        self.scale = 1.0  # 設定した間隔に対する倍率
+        self.failures = 0  # 連続した失敗の回数
+        self.backoff: float | None = None  # 失敗後の再試行までの時間 (秒)
+
+    @property
+    def steady_interval(self) -> float:
+        """Interval while the device answers (seconds)."""
+        return max(self._base_interval * self.scale, MIN_TIER_INTERVAL)
+
+    @property
+    def interval(self) -> float:
+        """Current effective interval (seconds)."""
+        return self.backoff if self.backoff is not None else self.steady_interval
+
+    def record_success(self, duration: float, changed: bool) -> None:
+        """Adjust the interval after a successful update."""
+        self.failures = 0
+        self.backoff = None
+        if not self.enabled:
+            return
+        interval = self.steady_interval
+        scale = self.scale
+        if duration > interval * ADAPTIVE_SLOW_RATIO:
+            # 応答が遅い場合は間隔を延ばして ECOマネの負荷を下げる
+            scale *= ADAPTIVE_GROW
+        elif duration < interval * ADAPTIVE_FAST_RATIO and (changed or scale > 1):
+            # 応答が速く値が変化している場合は間隔を縮める (許可した場合は設定より短く)
+            scale *= ADAPTIVE_SHRINK
+        elif not changed and scale < 1:
+            # 値が変化しない場合は設定した間隔に戻す
+            scale = min(scale * ADAPTIVE_GROW, 1.0)
+        self.scale = min(max(scale, self._min_scale), ADAPTIVE_MAX_SCALE)
+
+    def record_failure(self) -> float:
+        """Start or extend the exponential backoff after a failed update."""
+        self.failures += 1
+        if not self.enabled:
+            return self.interval
+        delay = min(BACKOFF_INITIAL * 2 ** (self.failures - 1), BACKOFF_MAX)
+        # 複数の ECOマネが同時に再試行しないよう半分をランダムにする
+        self.backoff = delay / 2 + random.uniform(0, delay / 2)
+        return self.backoff
@@ -0,0 +1,143 @@
+"""On-demand profiling of the Eco Mane HEMS refresh cycle."""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+from pathlib import Path
+import pstats
+import time
+import tracemalloc
+from typing import Any
+
+from .const import PROFILE_TOP, PROFILE_TRACEMALLOC_FRAMES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CycleProfiler:
+    """Profile the next update cycles with cProfile and tracemalloc.
+
+    cProfile only sees the event loop thread, so parsing in the executor is
+    covered by the allocation snapshots but not by the function timings.
+    """
+
+    def __init__(self, directory: Path, cycles: int) -> None:
+        """Initialize the profiler for a number of cycles."""
+        self.directory = directory
+        self.cycles = cycles
+        self.completed = 0
+        self._stats: pstats.Stats | None = None  # 全サイクルの合計
+        self._profile: cProfile.Profile | None = None  # 計測中のサイクル
+        self._cycle_start = 0.0
+        self._durations: list[float] = []
+        self._peaks: list[int] = []  # サイクルごとの割り当てのピーク (バイト)
+        # 他で tracemalloc を使っている場合は開始・停止しない
+        self._started_tracing = False
+        self._first: tracemalloc.Snapshot | None = None
+        self._last: tracemalloc.Snapshot | None = None
+
+    @property
+    def started(self) -> bool:
+        """Return True once the baseline snapshot has been taken."""
+        return self._first is not None
+
+    def take_baseline(self) -> None:
+        """Start tracing allocations and take the baseline snapshot (in the executor)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+            self._started_tracing = True
+        self._first = tracemalloc.take_snapshot()
+
+    def start_cycle(self) -> None:
+        """Start profiling a cycle (on the event loop)."""
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as err:
+            # 他のプロファイラが動作中の場合は割り当てのみ計測
+            _LOGGER.warning("Function timings not recorded: %s", err)
+        else:
+            self._profile = profile
+        self._cycle_start = time.perf_counter()
+
+    def stop_cycle(self) -> bool:
+        """Stop profiling a cycle and return True after the last one."""
+        self._durations.append(time.perf_counter() - self._cycle_start)
+        if (profile := self._profile) is not None:
+            profile.disable()
+            self._profile = None
+            if self._stats is None:
+                self._stats = pstats.Stats(profile)
+            else:
+                self._stats.add(profile)
+        self._peaks.append(tracemalloc.get_traced_memory()[1])
+        self.completed += 1
+        return self.completed >= self.cycles
+
+    def cancel(self) -> None:
+        """Stop profiling without writing the results."""
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile = None
+        self._stop_tracing()
+
+    def _stop_tracing(self) -> None:
+        """Stop tracemalloc if this profiler started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def write(self) -> dict[str, Path]:
+        """Write the statistics, snapshots and summary (in the executor)."""
+        # 最後の割り当てのスナップショットは書き込みと合わせて executor で取る
+        if tracemalloc.is_tracing():
+            self._last = tracemalloc.take_snapshot()
+        self._stop_tracing()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        paths: dict[str, Path] = {"summary": self.directory / f"profile-{stamp}.txt"}
+        if self._stats is not None:
+            paths["pstats"] = self.directory / f"profile-{stamp}.pstats"
+            self._stats.dump_stats(paths["pstats"])
+        if self._first is not None and self._last is not None:
+            paths["snapshot_start"] = self.directory / f"profile-{stamp}-start.snapshot"
+            paths["snapshot_end"] = self.directory / f"profile-{stamp}-end.snapshot"
+            self._first.dump(str(paths["snapshot_start"]))
+            self._last.dump(str(paths["snapshot_end"]))
+        paths["summary"].write_text(self.summary(), encoding="utf-8")
+        return paths
+
+    def summary(self) -> str:
+        """Top functions by time and allocation sites by retained memory."""
+        out = io.StringIO()
+        out.write(f"cycles: {self.completed}\n")
+        for number, (duration, peak) in enumerate(
+            zip(self._durations, self._peaks, strict=True), 1
+        ):
+            out.write(
+                f"cycle {number}: {duration * 1000:.1f} ms, "
+                f"peak traced memory {peak / 1024:.1f} KiB\n"
+            )
+        if self._stats is not None:
+            for sort in (pstats.SortKey.TIME, pstats.SortKey.CUMULATIVE):
+                out.write(f"\n--- top {PROFILE_TOP} functions by {sort.value} ---\n")
+                self._stats.stream = out
+                self._stats.sort_stats(sort).print_stats(PROFILE_TOP)
+        if self._first is not None and self._last is not None:
+            # 計測中に確保され、終了時に残っているメモリ
+            out.write(f"\n--- top {PROFILE_TOP} allocation sites by size ---\n")
+            for stat in self._last.compare_to(self._first, "lineno")[:PROFILE_TOP]:
+                out.write(f"{stat}\n")
+        return out.getvalue()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Progress of the profiler for the diagnostics download."""
+        return {
+            "directory": str(self.directory),
+            "cycles": self.cycles,
+            "completed": self.completed,
+        }
@@ -0,0 +1,170 @@
+"""Fleet scheduler for Eco Mane HEMS devices."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import math
+import random
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    FLEET_JITTER_RATIO,
+    FLEET_MAX_JITTER,
+    FLEET_MAX_PARSE_JOBS,
+    FLEET_MAX_REQUESTS,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import EcoManeDataCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# スケジューラに登録されたデバイス
+@dataclass(kw_only=True)
+class FleetDevice:
+    """Device polled by the fleet scheduler."""
+
+    key: str  # config entry の entry_id
+    coordinator: EcoManeDataCoordinator
+    phase: float = 0.0  # polling 間隔内での位置 (0〜1)
+    slot: int | None = None  # 直前の予定の番号 (基準時刻からの polling 間隔の数)
+    interval: float = 0.0  # 直前の予定に使った polling 間隔 (秒)
+    due: float = 0.0  # 次回の予定時刻 (loop.time())
+    lag: float = 0.0  # 直前の更新が次の予定時刻を過ぎた時間 (秒)
+    missed: int = 0  # 更新が間に合わず飛ばした回数の累計
+    timer: asyncio.TimerHandle | None = None
+    task: asyncio.Task | None = None
+
+
+class EcoManeFleetScheduler:
+    """Spread the refreshes of all Eco Mane devices over the polling interval."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._epoch = hass.loop.time()  # 全デバイス共通の基準時刻
+        self._devices: dict[str, FleetDevice] = {}
+        # 統合全体での同時リクエスト数と同時解析数
+        self._request_semaphore = asyncio.Semaphore(FLEET_MAX_REQUESTS)
+        self._parse_semaphore = asyncio.Semaphore(FLEET_MAX_PARSE_JOBS)
+
+    @callback
+    def async_register(
+        self, key: str, coordinator: EcoManeDataCoordinator, refresh_now: bool = False
+    ) -> None:
+        """Add a device to the fleet and schedule its refreshes."""
+        coordinator.set_fleet_limits(self._request_semaphore, self._parse_semaphore)
+        device = self._devices[key] = FleetDevice(key=key, coordinator=coordinator)
+        self._assign_phases()
+        if refresh_now:
+            device.due = self._hass.loop.time()
+            self._async_start(device)
+        else:
+            self._schedule(device)
+
+    @callback
+    def async_unregister(self, key: str) -> None:
+        """Remove a device from the fleet."""
+        device = self._devices.pop(key, None)
+        if device is None:
+            return
+        if device.timer is not None:
+            device.timer.cancel()
+        if device.task is not None:
+            device.task.cancel()
+        self._assign_phases()
+
+    @property
+    def is_empty(self) -> bool:
+        """Return True if no device is registered."""
+        return not self._devices
+
+    def device_lag(self, key: str) -> float:
+        """Seconds by which the last refresh of a device overran its next slot."""
+        device = self._devices.get(key)
+        return 0.0 if device is None else device.lag
+
+    def device_missed(self, key: str) -> int:
+        """Number of slots skipped because the refresh was still running."""
+        device = self._devices.get(key)
+        return 0 if device is None else device.missed
+
+    def _assign_phases(self) -> None:
+        """Spread the devices evenly over the interval."""
+        count = len(self._devices)
+        for index, device in enumerate(self._devices.values()):
+            device.phase = index / count
+            # 更新待ちのデバイスは新しい位置で予定し直す
+            if device.timer is not None:
+                device.timer.cancel()
+                device.slot = None
+                self._schedule(device)
+
+    def _schedule(self, device: FleetDevice) -> None:
+        """Schedule the next refresh of a device after now and its last slot."""
+        coordinator = device.coordinator
+        interval = coordinator.poll_interval.total_seconds()
+        now = self._hass.loop.time()
+        if coordinator.backing_off:
+            # 失敗後の再試行は間隔の揃えを行わず、待ち時間 (ジッター込み) の後に行う
+            device.slot = None
+            device.due = now + interval
+        else:
+            # 間隔が変わった場合は予定の番号を数え直す
+            if interval != device.interval:
+                device.slot = None
+            offset = self._epoch + device.phase * interval
+            slot = math.floor((now - offset) / interval) + 1
+            if device.slot is not None:
+                slot = max(slot, device.slot + 1)
+            # 同じ位置のデバイスが重ならないようにずらす
+            jitter = min(interval * FLEET_JITTER_RATIO, FLEET_MAX_JITTER)
+            # ずらした結果が現在より前になり得る場合は次の予定にする
+            if offset + slot * interval - jitter <= now:
+                slot += 1
+            device.slot = slot
+            device.due = offset + slot * interval + random.uniform(-jitter, jitter)
+        device.interval = interval
+        device.timer = self._hass.loop.call_at(device.due, self._async_start, device)
+
+    @callback
+    def _async_start(self, device: FleetDevice) -> None:
+        """Start a refresh of a device."""
+        device.timer = None
+        device.task = self._hass.async_create_background_task(
+            self._async_run(device), f"ecomane_fleet_refresh_{device.key}"
+        )
+
+    async def _async_run(self, device: FleetDevice) -> None:
+        """Refresh a device and schedule the next one."""
+        coordinator = device.coordinator
+        interval = coordinator.poll_interval.total_seconds()
+        try:
+            await coordinator.async_refresh()
+        finally:
+            device.task = None
+
+        if self._devices.get(device.key) is not device:
+            return
+
+        # 次の予定時刻を過ぎていれば遅れとして記録 (失敗後の再試行中は除く)
+        now = self._hass.loop.time()
+        next_due = device.due + interval
+        device.lag = 0.0 if coordinator.backing_off else max(0.0, now - next_due)
+        if device.lag > 0:
+            missed = math.floor(device.lag / interval) + 1
+            device.missed += missed
+            _LOGGER.warning(
+                "%s refresh overran its polling interval by %.1f seconds (%s slots skipped); "
+                "the fleet has outgrown the interval",
+                device.key,
+                device.lag,
+                missed,
+            )
+        if not self._hass.is_stopping:
+            self._schedule(device)
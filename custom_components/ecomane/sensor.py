@@ -2,42 +2,71 @@
 
 from __future__ import annotations
 
+from array import array
+import asyncio
+import contextlib
 import logging
+import math
+from typing import Any
 
 from homeassistant.components.sensor import (
     DOMAIN as SENSOR_DOMAIN,
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfEnergy, UnitOfPower
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    EntityCategory,
+    Platform,
+    UnitOfEnergy,
+    UnitOfPower,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
+    CIRCUIT_ENTITIES_CIRCUIT,
+    CIRCUIT_GROUP_DEVICE,
+    CONTEXT_CIRCUIT_GROUP,
     DOMAIN,
     SENSOR_CIRCUIT_ENERGY_SELECTOR,
     SENSOR_CIRCUIT_ENERGY_SERVICE_TYPE,
     SENSOR_CIRCUIT_POWER_SERVICE_TYPE,
-    SENSOR_CIRCUIT_PREFIX,
-    SENSOR_CIRCUIT_SELECTOR_CIRCUIT,
-    SENSOR_CIRCUIT_SELECTOR_PLACE,
     SENSOR_CIRCUIT_SELECTOR_POWER,
+    SIGNAL_TOPOLOGY_UPDATED,
+    TIER_ENERGY,
+    TIER_POWER,
+    TIER_USAGE,
 )
 from .coordinator import (
+    EcoManeCircuit,
     EcoManeCircuitEnergySensorEntityDescription,
     EcoManeCircuitPowerSensorEntityDescription,
+    EcoManeData,
     EcoManeDataCoordinator,
     EcoManeUsageSensorEntityDescription,
+    TopologyDiff,
 )
 from .name_to_id import ja_to_entity
+from .telemetry import (
+    EcoManeTelemetrySensorEntityDescription,
+    ecomane_telemetry_sensors_descs,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# 回路をまとめたエンティティの属性
+ATTR_CIRCUITS = "circuits"
+ATTR_ENERGY = "energy"
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -48,36 +77,69 @@ async def async_setup_entry(
     # Access data stored in hass.data
     coordinator: EcoManeDataCoordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    sensor_dict = coordinator.data
-    power_sensor_total = coordinator.circuit_total
+    # 回路の番号による unique_id を selNo によるものに移行 (キャッシュした回路構成)
+    async_migrate_circuit_unique_ids(hass, config_entry, coordinator.topology)
+    # 回路のエンティティの単位を変えた場合は使わなくなったエンティティを無効化
+    async_update_circuit_entity_layout(hass, config_entry, coordinator)
 
     ecomane_energy_sensors_descs = coordinator.usage_sensor_descs
 
     sensors: list[SensorEntity] = []
     _LOGGER.debug("sensor.py async_setup_entry sensors: %s", sensors)
     # 使用量センサーのエンティティのリストを作成
-    for usage_sensor_desc in ecomane_energy_sensors_descs:
-        sensor = EcoManeUsageSensorEntity(coordinator, usage_sensor_desc)
+    for usage_index, usage_sensor_desc in enumerate(ecomane_energy_sensors_descs):
+        sensor = EcoManeUsageSensorEntity(coordinator, usage_index, usage_sensor_desc)
         sensors.append(sensor)
 
-    # 電力センサーのエンティティのリストを作成
-    for sensor_num in range(power_sensor_total):
-        prefix = f"{SENSOR_CIRCUIT_PREFIX}_{sensor_num:02d}"
-        place = sensor_dict[f"{prefix}_{SENSOR_CIRCUIT_SELECTOR_PLACE}"]
-        circuit = sensor_dict[f"{prefix}_{SENSOR_CIRCUIT_SELECTOR_CIRCUIT}"]
+    # 回路ごとのエンティティ (selNo をキー)
+    circuit_entities: dict[str, list[EcoManeSensorEntity]] = {}
+
+    def circuit_sensors(circuit_info: EcoManeCircuit) -> list[EcoManeSensorEntity]:
+        """Create the power and energy entities of a circuit."""
         _LOGGER.debug(
-            "sensor.py async_setup_entry sensor_num: %s, prefix: %s, place: %s, circuit: %s",
-            sensor_num,
-            prefix,
-            place,
-            circuit,
+            "sensor.py circuit_sensors sensor_num: %s, selNo: %s, place: %s, circuit: %s",
+            circuit_info.index,
+            circuit_info.selNo,
+            circuit_info.place,
+            circuit_info.circuit,
         )
-        sensors.append(
-            EcoManeCircuitPowerSensorEntity(coordinator, prefix, place, circuit)
-        )
-        sensors.append(
-            EcoManeCircuitEnergySensorEntity(coordinator, prefix, place, circuit)
+        entities: list[EcoManeSensorEntity] = [
+            EcoManeCircuitPowerSensorEntity(coordinator, circuit_info),
+            EcoManeCircuitEnergySensorEntity(coordinator, circuit_info),
+        ]
+        circuit_entities[circuit_info.selNo] = entities
+        return entities
+
+    # 回路をまとめたエンティティ (グループをキー)
+    group_entities: dict[str, EcoManeCircuitGroupSensorEntity] = {}
+    aggregate = coordinator.circuit_entities != CIRCUIT_ENTITIES_CIRCUIT
+
+    def group_sensors() -> list[EcoManeCircuitGroupSensorEntity]:
+        """Create the aggregate entities of the groups not created yet."""
+        entities = [
+            EcoManeCircuitGroupSensorEntity(coordinator, group)
+            for group in coordinator.circuit_groups
+            if group not in group_entities
+        ]
+        group_entities.update((entity.group, entity) for entity in entities)
+        return entities
+
+    # 電力センサーのエンティティのリストを作成 (回路構成はキャッシュまたは初回取得による)
+    if aggregate:
+        sensors.extend(group_sensors())
+    else:
+        for circuit_info in coordinator.topology:
+            sensors.extend(circuit_sensors(circuit_info))
+    # polling 間隔の診断用センサー
+    sensors.append(EcoManePollIntervalSensorEntity(coordinator))
+
+    # 性能の診断用センサー (計測を有効にした場合のみ)
+    if coordinator.telemetry.enabled:
+        sensors.extend(
+            EcoManeTelemetrySensorEntity(coordinator, telemetry_sensor_desc)
+            for telemetry_sensor_desc in ecomane_telemetry_sensors_descs
         )
+
     # センサーが見つからない場合はエラー
     if not sensors:
         raise ConfigEntryNotReady("No sensors found")
@@ -86,20 +148,189 @@ async def async_setup_entry(
     async_add_entities(sensors, update_before_add=False)
     _LOGGER.debug("sensor.py async_setup_entry has finished async_add_entities")
 
+    async def async_update_groups(diff: TopologyDiff) -> None:
+        """Add or retire the aggregate entities whose circuits changed."""
+        groups = set(coordinator.circuit_groups)
+        retired = [
+            group_entities.pop(group)
+            for group in list(group_entities)
+            if group not in groups
+        ]
+        if retired:
+            await asyncio.gather(*(entity.async_remove() for entity in retired))
+        # なくなったグループは無効化し、再び現れたグループは有効に戻す
+        async_update_circuit_entity_layout(hass, config_entry, coordinator)
+        # 回路の増減したエンティティは属性を更新
+        for entity in group_entities.values():
+            if entity.hass is not None:
+                entity.async_write_ha_state()
+        if added := group_sensors():
+            async_add_entities(added, update_before_add=False)
+
+    async def async_update_topology(diff: TopologyDiff) -> None:
+        """Add or retire the entities of the circuits that changed."""
+        if aggregate:
+            await async_update_groups(diff)
+            return
+        # 削除・名称変更された回路のエンティティを外す (エンティティレジストリには残す)
+        retired = [
+            entity
+            for circuit_info in (*diff.removed, *diff.renamed)
+            for entity in circuit_entities.pop(circuit_info.selNo, [])
+        ]
+        if retired:
+            await asyncio.gather(*(entity.async_remove() for entity in retired))
+        # 追加・名称変更された回路のエンティティを作成 (旧形式の unique_id は先に移行)
+        async_migrate_circuit_unique_ids(
+            hass, config_entry, [*diff.added, *diff.renamed]
+        )
+        added = [
+            entity
+            for circuit_info in (*diff.added, *diff.renamed)
+            for entity in circuit_sensors(circuit_info)
+        ]
+        if added:
+            async_add_entities(added, update_before_add=False)
+
+    # 回路の構成の変化は再読み込みせずに反映
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_TOPOLOGY_UPDATED.format(config_entry.entry_id),
+            async_update_topology,
+        )
+    )
+
+
+def circuit_unique_id(entry_id: str, service_type: str, selNo: str) -> str:
+    """Unique ID of a circuit entity (selNo identifies the circuit)."""
+    return f"{entry_id}_{service_type}_{selNo}"
+
 
-class EcoManeUsageSensorEntity(CoordinatorEntity, SensorEntity):
+def circuit_group_unique_id(entry_id: str, group: str) -> str:
+    """Unique ID of an aggregate entity (page number or all)."""
+    return f"{entry_id}_{CONTEXT_CIRCUIT_GROUP}_{group}"
+
+
+@callback
+def async_update_circuit_entity_layout(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    coordinator: EcoManeDataCoordinator,
+) -> None:
+    """Disable the circuit entities of the other entity unit and enable this one's."""
+    entry_id = config_entry.entry_id
+    circuit_prefixes = tuple(
+        f"{entry_id}_{service_type}_"
+        for service_type in (
+            SENSOR_CIRCUIT_POWER_SERVICE_TYPE,
+            SENSOR_CIRCUIT_ENERGY_SERVICE_TYPE,
+        )
+    )
+    group_prefix = f"{entry_id}_{CONTEXT_CIRCUIT_GROUP}_"
+    aggregate = coordinator.circuit_entities != CIRCUIT_ENTITIES_CIRCUIT
+    # 回路構成が分かるまではページ・デバイスの切り替えによるものは判断しない
+    groups = {
+        circuit_group_unique_id(entry_id, group) for group in coordinator.circuit_groups
+    }
+    registry = er.async_get(hass)
+    for entity_entry in er.async_entries_for_config_entry(registry, entry_id):
+        unique_id = entity_entry.unique_id
+        if unique_id.startswith(circuit_prefixes):
+            stale = aggregate
+        elif unique_id.startswith(group_prefix):
+            if aggregate and not groups:
+                continue
+            stale = unique_id not in groups
+        else:
+            # 使用量・診断用のエンティティは対象外
+            continue
+        # 名前や設定, 長期統計との関連を残すため削除せず無効化し、
+        # 元の単位に戻した時に有効に戻す (ユーザーが無効化したものは変えない)
+        if stale and entity_entry.disabled_by is None:
+            _LOGGER.debug("Disabling %s", entity_entry.entity_id)
+            registry.async_update_entity(
+                entity_entry.entity_id,
+                disabled_by=er.RegistryEntryDisabler.INTEGRATION,
+            )
+        elif (
+            not stale
+            and entity_entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+        ):
+            _LOGGER.debug("Enabling %s", entity_entry.entity_id)
+            registry.async_update_entity(entity_entry.entity_id, disabled_by=None)
+
+
+@callback
+def async_migrate_circuit_unique_ids(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    circuits: list[EcoManeCircuit],
+) -> None:
+    """Move circuit entities from number based unique IDs to selNo based ones."""
+    entry_id = config_entry.entry_id
+    registry = er.async_get(hass)
+    # 旧形式: {entry_id}_{service_type}_em_circuit_NN_{num または ttx_01}
+    for circuit_info in circuits:
+        for service_type, selector in (
+            (SENSOR_CIRCUIT_POWER_SERVICE_TYPE, SENSOR_CIRCUIT_SELECTOR_POWER),
+            (SENSOR_CIRCUIT_ENERGY_SERVICE_TYPE, SENSOR_CIRCUIT_ENERGY_SELECTOR),
+        ):
+            legacy_id = f"{entry_id}_{service_type}_{circuit_info.prefix}_{selector}"
+            entity_id = registry.async_get_entity_id(Platform.SENSOR, DOMAIN, legacy_id)
+            if entity_id is None:
+                continue
+            unique_id = circuit_unique_id(entry_id, service_type, circuit_info.selNo)
+            if registry.async_get_entity_id(Platform.SENSOR, DOMAIN, unique_id):
+                # 新形式のエンティティが既にある場合は旧形式のものを削除
+                _LOGGER.debug("Removing %s replaced by %s", entity_id, unique_id)
+                registry.async_remove(entity_id)
+                continue
+            _LOGGER.debug("Migrating %s to %s", entity_id, unique_id)
+            registry.async_update_entity(entity_id, new_unique_id=unique_id)
+
+
+class EcoManeSensorEntity(CoordinatorEntity, RestoreSensor):
+    """Base class of the EcoMane sensors."""
+
+    _attr_tier: str  # 更新の種別
+    _attr_restored_value: float | None = None  # 再起動前の値
+
+    def __init__(self, coordinator: EcoManeDataCoordinator, key: int | str) -> None:
+        """Subscribe to the changes of the value (tier, usage number or selNo) only."""
+        super().__init__(coordinator=coordinator, context=(self._attr_tier, key))
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last known value until the device answers."""
+        await super().async_added_to_hass()
+        last_sensor_data = await self.async_get_last_sensor_data()
+        if last_sensor_data is not None and last_sensor_data.native_value is not None:
+            with contextlib.suppress(TypeError, ValueError):
+                self._attr_restored_value = float(last_sensor_data.native_value)
+
+    def _coordinator_value(self, values: array, index: int | None) -> float | None:
+        """Value from the coordinator, or the restored value before the first update."""
+        value = math.nan if index is None else EcoManeData.value(values, index)
+        if math.isnan(value):
+            return self._attr_restored_value
+        return value
+
+
+class EcoManeUsageSensorEntity(EcoManeSensorEntity):
     """EcoMane UsageS ensor."""
 
     _attr_has_entity_name = True
     # _attr_name = None # Noneでも値を設定するとtranslationがされない
     _attr_unique_id: str | None = None
     _attr_attribution = "Usage data provided by Panasonic ECO Mane HEMS"
+    _attr_tier = TIER_USAGE
     _attr_entity_description: EcoManeUsageSensorEntityDescription | None = None
     _attr_device_class: SensorDeviceClass | None = None
     _attr_state_class: str | None = None
     _attr_native_unit_of_measurement: str | None = None
 
     _attr_div_id: str = ""
+    _attr_usage_index: int  # 使用量の順番 (EcoManeData.usage の位置)
     _attr_description: str | None = None
 
     _ip_address: str | None = None
@@ -107,10 +338,12 @@ class EcoManeUsageSensorEntity(CoordinatorEntity, SensorEntity):
     def __init__(
         self,
         coordinator: EcoManeDataCoordinator,
+        usage_index: int,
         usage_sensor_desc: EcoManeUsageSensorEntityDescription,
     ) -> None:
         """Pass coordinator to CoordinatorEntity."""
-        super().__init__(coordinator=coordinator)
+        super().__init__(coordinator, usage_index)
+        self._attr_usage_index = usage_index
 
         # ip_address を設定
         self._ip_address = coordinator.ip_address
@@ -155,12 +388,11 @@ class EcoManeUsageSensorEntity(CoordinatorEntity, SensorEntity):
         )
 
     @property
-    def native_value(self) -> str:
+    def native_value(self) -> float | None:
         """State."""
-        value = self.coordinator.data.get(self._attr_div_id)  # 使用量
-        if value is None:
-            return ""
-        return str(value)
+        return self._coordinator_value(
+            self.coordinator.snapshot.usage, self._attr_usage_index
+        )  # 使用量
 
     @property
     def device_info(
@@ -176,7 +408,7 @@ class EcoManeUsageSensorEntity(CoordinatorEntity, SensorEntity):
         )
 
 
-class EcoManeCircuitPowerSensorEntity(CoordinatorEntity, SensorEntity):
+class EcoManeCircuitPowerSensorEntity(EcoManeSensorEntity):
     """EcoManePowerSensor."""
 
     _attr_has_entity_name = True
@@ -187,19 +419,23 @@ class EcoManeCircuitPowerSensorEntity(CoordinatorEntity, SensorEntity):
     _attr_device_class = SensorDeviceClass.POWER
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfPower.WATT
+    _attr_tier = TIER_POWER
     _attr_sensor_id: str
+    _attr_sel_no: str  # 回路の selNo (回路の番号は変わることがあるため都度引く)
 
     _ip_address: str | None = None
 
     def __init__(
         self,
         coordinator: EcoManeDataCoordinator,
-        prefix: str,
-        place: str,
-        circuit: str,
+        circuit_info: EcoManeCircuit,
     ) -> None:
         """Pass coordinator to CoordinatorEntity."""
-        super().__init__(coordinator=coordinator)
+        super().__init__(coordinator, circuit_info.selNo)
+        self._attr_sel_no = circuit_info.selNo
+        prefix = circuit_info.prefix
+        place = circuit_info.place
+        circuit = circuit_info.circuit
 
         # ip_address を設定
         self._ip_address = coordinator.ip_address
@@ -231,15 +467,19 @@ class EcoManeCircuitPowerSensorEntity(CoordinatorEntity, SensorEntity):
             and coordinator.config_entry is not None
             and description is not None
         ):
-            self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{description.service_type}_{description.key}"
+            self._attr_unique_id = circuit_unique_id(
+                coordinator.config_entry.entry_id,
+                description.service_type,
+                circuit_info.selNo,
+            )
 
     @property
-    def native_value(self) -> str:
+    def native_value(self) -> float | None:
         """State."""
-        value = self.coordinator.data.get(self._attr_sensor_id)  # 回路別電力
-        if value is None:
-            return ""
-        return str(value)
+        return self._coordinator_value(
+            self.coordinator.snapshot.power,
+            self.coordinator.circuit_index(self._attr_sel_no),
+        )  # 回路別電力
 
     @property
     def device_info(
@@ -255,7 +495,7 @@ class EcoManeCircuitPowerSensorEntity(CoordinatorEntity, SensorEntity):
         )
 
 
-class EcoManeCircuitEnergySensorEntity(CoordinatorEntity, SensorEntity):
+class EcoManeCircuitEnergySensorEntity(EcoManeSensorEntity):
     """EcoManeCircuitEnergySensor."""
 
     _attr_has_entity_name = True
@@ -266,19 +506,23 @@ class EcoManeCircuitEnergySensorEntity(CoordinatorEntity, SensorEntity):
     _attr_device_class = SensorDeviceClass.ENERGY
     _attr_state_class = SensorStateClass.TOTAL_INCREASING
     _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    _attr_tier = TIER_ENERGY
     _attr_sensor_id: str
+    _attr_sel_no: str  # 回路の selNo (回路の番号は変わることがあるため都度引く)
 
     _ip_address: str | None = None
 
     def __init__(
         self,
         coordinator: EcoManeDataCoordinator,
-        prefix: str,
-        place: str,
-        circuit: str,
+        circuit_info: EcoManeCircuit,
     ) -> None:
         """Pass coordinator to CoordinatorEntity."""
-        super().__init__(coordinator=coordinator)
+        super().__init__(coordinator, circuit_info.selNo)
+        self._attr_sel_no = circuit_info.selNo
+        prefix = circuit_info.prefix
+        place = circuit_info.place
+        circuit = circuit_info.circuit
 
         # ip_address を設定
         self._ip_address = coordinator.ip_address
@@ -310,15 +554,19 @@ class EcoManeCircuitEnergySensorEntity(CoordinatorEntity, SensorEntity):
             and coordinator.config_entry is not None
             and description is not None
         ):
-            self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{description.service_type}_{description.key}"
+            self._attr_unique_id = circuit_unique_id(
+                coordinator.config_entry.entry_id,
+                description.service_type,
+                circuit_info.selNo,
+            )
 
     @property
-    def native_value(self) -> str:
+    def native_value(self) -> float | None:
         """State."""
-        value = self.coordinator.data.get(self._attr_sensor_id)  # 回路別電力量
-        if value is None:
-            return ""
-        return str(value)
+        return self._coordinator_value(
+            self.coordinator.snapshot.energy,
+            self.coordinator.circuit_index(self._attr_sel_no),
+        )  # 回路別電力量
 
     @property
     def device_info(
@@ -332,3 +580,164 @@ class EcoManeCircuitEnergySensorEntity(CoordinatorEntity, SensorEntity):
             manufacturer="Panasonic",
             translation_key="energy_consumption",
         )
+
+
+class EcoManeCircuitGroupSensorEntity(CoordinatorEntity, SensorEntity):
+    """EcoManeCircuitGroupSensor."""
+
+    _attr_has_entity_name = True
+    _attr_attribution = "Power data provided by Panasonic ECO Mane HEMS"
+    _attr_device_class = SensorDeviceClass.POWER
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfPower.WATT
+    # 回路ごとの値はレコーダーに記録しない (合計の履歴のみでデータベースの増加を抑える)
+    _unrecorded_attributes = frozenset({ATTR_CIRCUITS, ATTR_ENERGY})
+
+    def __init__(self, coordinator: EcoManeDataCoordinator, group: str) -> None:
+        """Subscribe to the changes of the circuits of the group only."""
+        super().__init__(
+            coordinator=coordinator, context=(CONTEXT_CIRCUIT_GROUP, group)
+        )
+        self.group = group
+        self._ip_address = coordinator.ip_address
+
+        # まとめたエンティティの translation_key, entity_id を設定
+        if group == CIRCUIT_GROUP_DEVICE:
+            self._attr_translation_key = "circuits"
+            self.entity_id = f"{SENSOR_DOMAIN}.{DOMAIN}_circuits"
+        else:
+            self._attr_translation_key = "circuits_page"
+            self._attr_translation_placeholders = {"page": group}
+            self.entity_id = f"{SENSOR_DOMAIN}.{DOMAIN}_circuits_page_{group}"
+        if coordinator.config_entry is not None:
+            self._attr_unique_id = circuit_group_unique_id(
+                coordinator.config_entry.entry_id, group
+            )
+
+    @property
+    def native_value(self) -> float | None:
+        """State."""
+        # グループの回路別電力の合計 (値の分からない回路を除く)
+        power = self.coordinator.snapshot.power
+        values = [
+            value
+            for circuit in self.coordinator.circuit_group_members(self.group)
+            if not math.isnan(value := EcoManeData.value(power, circuit.index))
+        ]
+        return sum(values) if values else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Power and today's energy of each circuit (selNo as key)."""
+        data = self.coordinator.snapshot
+        circuits: dict[str, dict[str, Any]] = {}
+        energy_total = 0.0
+        for circuit in self.coordinator.circuit_group_members(self.group):
+            power = EcoManeData.value(data.power, circuit.index)
+            energy = EcoManeData.value(data.energy, circuit.index)
+            circuits[circuit.selNo] = {
+                "name": f"{circuit.place} {circuit.circuit}",
+                "power": None if math.isnan(power) else power,
+                "energy": None if math.isnan(energy) else energy,
+            }
+            if not math.isnan(energy):
+                energy_total += energy
+        return {ATTR_ENERGY: round(energy_total, 3), ATTR_CIRCUITS: circuits}
+
+    @property
+    def device_info(
+        self,
+    ) -> DeviceInfo:  # エンティティ群をデバイスに分類するための情報を提供
+        """Return the device info."""
+        ip_address = self._ip_address
+        return DeviceInfo(  # 回路別電力のデバイス情報
+            identifiers={(DOMAIN, "power_consumption_" + (ip_address or ""))},
+            name="Power Consumption",
+            manufacturer="Panasonic",
+            translation_key="power_consumption",
+        )
+
+
+class EcoManeTelemetrySensorEntity(CoordinatorEntity, SensorEntity):
+    """EcoManeTelemetrySensor."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity_description: EcoManeTelemetrySensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: EcoManeDataCoordinator,
+        telemetry_sensor_desc: EcoManeTelemetrySensorEntityDescription,
+    ) -> None:
+        """Pass coordinator to CoordinatorEntity."""
+        super().__init__(coordinator=coordinator)
+        self.entity_description = telemetry_sensor_desc
+        self._ip_address = coordinator.ip_address
+
+        # 診断用センサー entity_id, _attr_unique_id を設定
+        self.entity_id = f"{SENSOR_DOMAIN}.{DOMAIN}_{telemetry_sensor_desc.key}"
+        if coordinator.config_entry is not None:
+            self._attr_unique_id = f"{coordinator.config_entry.entry_id}_telemetry_{telemetry_sensor_desc.key}"
+
+    @property
+    def native_value(self) -> float | int:
+        """State."""
+        # 直前の更新の計測値
+        return getattr(
+            self.coordinator.telemetry.last_cycle, self.entity_description.attribute
+        )
+
+    @property
+    def device_info(
+        self,
+    ) -> DeviceInfo:  # エンティティ群をデバイスに分類するための情報を提供
+        """Return the device info."""
+        return diagnostics_device_info(self._ip_address)
+
+
+class EcoManePollIntervalSensorEntity(CoordinatorEntity, SensorEntity):
+    """EcoManePollIntervalSensor."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_translation_key = "poll_interval"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_suggested_display_precision = 0
+
+    def __init__(self, coordinator: EcoManeDataCoordinator) -> None:
+        """Pass coordinator to CoordinatorEntity."""
+        super().__init__(coordinator=coordinator)
+        self._ip_address = coordinator.ip_address
+
+        # 診断用センサー entity_id, _attr_unique_id を設定
+        self.entity_id = f"{SENSOR_DOMAIN}.{DOMAIN}_{self._attr_translation_key}"
+        if coordinator.config_entry is not None:
+            self._attr_unique_id = (
+                f"{coordinator.config_entry.entry_id}_{self._attr_translation_key}"
+            )
+
+    @property
+    def native_value(self) -> float:
+        """State."""
+        # 現在の polling 間隔 (失敗後は再試行までの時間)
+        return self.coordinator.poll_interval.total_seconds()
+
+    @property
+    def device_info(
+        self,
+    ) -> DeviceInfo:  # エンティティ群をデバイスに分類するための情報を提供
+        """Return the device info."""
+        return diagnostics_device_info(self._ip_address)
+
+
+def diagnostics_device_info(ip_address: str | None) -> DeviceInfo:
+    """Device info of the diagnostic sensors."""
+    return DeviceInfo(  # 診断情報のデバイス情報
+        identifiers={(DOMAIN, "diagnostics_" + (ip_address or ""))},
+        name="Diagnostics",
+        manufacturer="Panasonic",
+        translation_key="diagnostics",
+    )
@@ -0,0 +1,109 @@
+"""Services of the Eco Mane HEMS integration."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_CYCLES,
+    BACKFILLS,
+    DEFAULT_PROFILE_CYCLES,
+    DOMAIN,
+    MAX_PROFILE_CYCLES,
+    SERVICE_BACKFILL,
+    SERVICE_PROFILE,
+)
+from .coordinator import EcoManeDataCoordinator
+
+if TYPE_CHECKING:
+    from .backfill import EcoManeBackfill
+
+_LOGGER = logging.getLogger(__name__)
+
+BACKFILL_SCHEMA = vol.Schema({vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string})
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_CYCLES, default=DEFAULT_PROFILE_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PROFILE_CYCLES)
+        ),
+    }
+)
+
+
+def _coordinators(
+    hass: HomeAssistant, call: ServiceCall
+) -> dict[str, EcoManeDataCoordinator]:
+    """Coordinators targeted by a service call (all of them if none is given)."""
+    coordinators = {
+        entry.entry_id: coordinator
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if (coordinator := hass.data.get(DOMAIN, {}).get(entry.entry_id)) is not None
+    }
+    if (entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID)) is None:
+        return coordinators
+    if entry_id not in coordinators:
+        raise HomeAssistantError(f"Eco Mane entry {entry_id} is not loaded")
+    return {entry_id: coordinators[entry_id]}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    if hass.services.has_service(DOMAIN, SERVICE_BACKFILL):
+        return
+
+    async def async_backfill(call: ServiceCall) -> None:
+        """Import yesterday's energy of the circuits into long-term statistics."""
+        if "recorder" not in hass.config.components:
+            raise HomeAssistantError("The recorder integration is not loaded")
+        # recorder は任意の依存のため、使う時に読み込む
+        from .backfill import EcoManeBackfill
+
+        backfills: dict[str, EcoManeBackfill] = hass.data[DOMAIN].setdefault(
+            BACKFILLS, {}
+        )
+        for entry_id, coordinator in _coordinators(hass, call).items():
+            if (backfill := backfills.get(entry_id)) is None:
+                backfill = backfills[entry_id] = EcoManeBackfill(
+                    hass, entry_id, coordinator
+                )
+            if not backfill.async_start():
+                _LOGGER.info("Backfill of %s is already running", entry_id)
+
+    async def async_profile(call: ServiceCall) -> None:
+        """Profile the next update cycles of the Eco Mane devices."""
+        for entry_id, coordinator in _coordinators(hass, call).items():
+            if not coordinator.async_start_profile(call.data[ATTR_CYCLES]):
+                _LOGGER.info("Profile of %s is already running", entry_id)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL, async_backfill, schema=BACKFILL_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_profile, schema=PROFILE_SCHEMA
+    )
+
+
+@callback
+def async_unload_entry_services(hass: HomeAssistant, entry_id: str) -> None:
+    """Stop the service work of an unloaded config entry."""
+    backfills: dict[str, EcoManeBackfill] = hass.data[DOMAIN].get(BACKFILLS, {})
+    if (backfill := backfills.pop(entry_id, None)) is not None:
+        backfill.async_cancel()
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the services when the last config entry is unloaded."""
+    hass.services.async_remove(DOMAIN, SERVICE_BACKFILL)
+    hass.services.async_remove(DOMAIN, SERVICE_PROFILE)
+    hass.data[DOMAIN].pop(BACKFILLS, None)
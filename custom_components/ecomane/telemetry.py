@@ -0,0 +1,233 @@
+"""Performance telemetry for Eco Mane HEMS component."""
+
+from __future__ import annotations
+
+import bisect
+from collections.abc import Iterator
+import contextlib
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import PERCENTAGE, UnitOfInformation, UnitOfTime
+
+from .const import TELEMETRY_BUCKETS
+
+# 計測が無効な場合に使う何もしない context manager
+_NULL_TIMER = contextlib.nullcontext()
+
+
+class LatencyHistogram:
+    """Histogram of durations in seconds."""
+
+    __slots__ = ("buckets", "count", "max", "total")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = [0] * (len(TELEMETRY_BUCKETS) + 1)  # 最後は上限なし
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add a duration."""
+        self.buckets[bisect.bisect_left(TELEMETRY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summary and cumulative buckets of the histogram."""
+        cumulative = 0
+        buckets: dict[str, int] = {}
+        for bound, count in zip(
+            (*TELEMETRY_BUCKETS, "+Inf"), self.buckets, strict=True
+        ):
+            cumulative += count
+            buckets[f"le_{bound}"] = cumulative
+        return {
+            "count": self.count,
+            "total": round(self.total, 6),
+            "mean": round(self.total / self.count, 6) if self.count else None,
+            "max": round(self.max, 6),
+            "buckets": buckets,
+        }
+
+
+# 1回の更新の計測値
+@dataclass(slots=True)
+class CycleStats:
+    """Measurements of one update cycle."""
+
+    duration: float = 0.0  # 更新にかかった時間 (秒)
+    budget: float = 0.0  # polling 間隔に対する更新時間の割合 (%)
+    requests: int = 0  # リクエスト数
+    bytes_received: int = 0  # 受信したバイト数
+    loop_blocking: float = 0.0  # event loop を占有した時間 (ミリ秒)
+    success: bool = True
+
+
+class EcoManeTelemetry:
+    """Collect latency, traffic and event loop blocking of the coordinator."""
+
+    def __init__(self, enabled: bool) -> None:
+        """Initialize the telemetry."""
+        self.enabled = enabled
+        self.latency: dict[str, LatencyHistogram] = {}  # 処理 (update_*, parse_*)
+        self.fetch_latency: dict[str, LatencyHistogram] = {}  # エンドポイント
+        self.loop_blocking: dict[str, LatencyHistogram] = {}  # 処理 (parse_*)
+        self.requests: dict[str, int] = {}  # エンドポイントごとのリクエスト数
+        self.bytes_received: dict[str, int] = {}  # エンドポイントごとの受信量
+        self.cycles = 0
+        self.failed_cycles = 0
+        self.cycle_latency = LatencyHistogram()
+        self.last_cycle = CycleStats()
+        self._cycle = CycleStats()  # 計測中の更新
+
+    @contextlib.contextmanager
+    def _timer(self, name: str) -> Iterator[None]:
+        """Measure the duration of a block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._histogram(self.latency, name).record(time.perf_counter() - start)
+
+    def timer(self, name: str) -> contextlib.AbstractContextManager[None]:
+        """Context manager measuring an update_* or parse_* call."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timer(name)
+
+    @staticmethod
+    def _histogram(
+        histograms: dict[str, LatencyHistogram], name: str
+    ) -> LatencyHistogram:
+        """Histogram of a name, created on first use."""
+        if (histogram := histograms.get(name)) is None:
+            histogram = histograms[name] = LatencyHistogram()
+        return histogram
+
+    def record_fetch(
+        self, endpoint: str, seconds: float, size: int, cycle: bool = True
+    ) -> None:
+        """Record a request to the device (cycle=False if outside the update)."""
+        if not self.enabled:
+            return
+        self._histogram(self.fetch_latency, endpoint).record(seconds)
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+        self.bytes_received[endpoint] = self.bytes_received.get(endpoint, 0) + size
+        if not cycle:
+            # 監視・統計の取り込みの取得は更新ごとの値に含めない
+            return
+        self._cycle.requests += 1
+        self._cycle.bytes_received += size
+
+    def record_loop(self, name: str, seconds: float) -> None:
+        """Record time spent on the event loop."""
+        if not self.enabled:
+            return
+        self._histogram(self.loop_blocking, name).record(seconds)
+        self._cycle.loop_blocking += seconds * 1000
+
+    def start_cycle(self) -> None:
+        """Start measuring an update cycle."""
+        if self.enabled:
+            self._cycle = CycleStats()
+
+    def end_cycle(self, duration: float, interval: float, success: bool) -> None:
+        """Finish measuring an update cycle."""
+        if not self.enabled:
+            return
+        cycle = self._cycle
+        cycle.duration = duration
+        cycle.budget = duration / interval * 100 if interval > 0 else 0.0
+        cycle.success = success
+        self.cycles += 1
+        if not success:
+            self.failed_cycles += 1
+        self.cycle_latency.record(duration)
+        self.last_cycle = cycle
+
+    def as_dict(self) -> dict[str, Any]:
+        """All measurements for the diagnostics download."""
+
+        def histograms(values: dict[str, LatencyHistogram]) -> dict[str, Any]:
+            return {name: histogram.as_dict() for name, histogram in values.items()}
+
+        last = self.last_cycle
+        return {
+            "cycles": self.cycles,
+            "failed_cycles": self.failed_cycles,
+            "last_cycle": {
+                "duration": round(last.duration, 6),
+                "budget": round(last.budget, 2),
+                "requests": last.requests,
+                "bytes_received": last.bytes_received,
+                "loop_blocking_ms": round(last.loop_blocking, 3),
+                "success": last.success,
+            },
+            "cycle_latency": self.cycle_latency.as_dict(),
+            "latency": histograms(self.latency),
+            "fetch_latency": histograms(self.fetch_latency),
+            "loop_blocking": histograms(self.loop_blocking),
+            "requests": dict(self.requests),
+            "bytes_received": dict(self.bytes_received),
+        }
+
+
+# 性能の診断用センサーのエンティティのディスクリプション
+@dataclass(frozen=True, kw_only=True)
+class EcoManeTelemetrySensorEntityDescription(SensorEntityDescription):
+    """Describes EcoManeTelemetry sensor entity."""
+
+    attribute: str  # CycleStats の属性名
+
+
+ecomane_telemetry_sensors_descs = [
+    EcoManeTelemetrySensorEntityDescription(
+        key="cycle_duration",
+        translation_key="cycle_duration",
+        attribute="duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+    ),
+    EcoManeTelemetrySensorEntityDescription(
+        key="cycle_budget",
+        translation_key="cycle_budget",
+        attribute="budget",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    EcoManeTelemetrySensorEntityDescription(
+        key="cycle_requests",
+        translation_key="cycle_requests",
+        attribute="requests",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    EcoManeTelemetrySensorEntityDescription(
+        key="cycle_bytes_received",
+        translation_key="cycle_bytes_received",
+        attribute="bytes_received",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    EcoManeTelemetrySensorEntityDescription(
+        key="cycle_loop_blocking",
+        translation_key="cycle_loop_blocking",
+        attribute="loop_blocking",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+]
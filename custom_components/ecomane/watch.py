@@ -0,0 +1,86 @@
+"""High-resolution sampling of watched circuits for Eco Mane HEMS component."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from .const import WATCH_BUFFER_SIZE
+from .parser import ParsedCircuitPage
+
+
+# 監視対象の回路の電力の記録
+@dataclass(frozen=True, slots=True)
+class PowerSample:
+    """Power of a watched circuit at a point in time."""
+
+    timestamp: float  # 取得時刻 (UNIX 時間)
+    watts: float
+
+
+class CircuitWatchList:
+    """Watched circuits with a bounded buffer of their recent power samples."""
+
+    def __init__(
+        self, circuits: Iterable[str], buffer_size: int = WATCH_BUFFER_SIZE
+    ) -> None:
+        """Initialize the watch list with the selNo of the watched circuits."""
+        self.circuits = frozenset(circuits)
+        # 回路ごとのリングバッファ (古い記録から捨てる)
+        self._samples: dict[str, deque[PowerSample]] = {
+            selNo: deque(maxlen=buffer_size) for selNo in self.circuits
+        }
+        # ページごとの応答のハッシュと解析結果 (変化していないページは解析しない)
+        self._pages: dict[int, tuple[bytes, ParsedCircuitPage]] = {}
+        self.refreshes = 0
+        self.failures = 0
+
+    def __bool__(self) -> bool:
+        """Return True if any circuit is watched."""
+        return bool(self.circuits)
+
+    def pages(self, circuit_pages: Iterable[tuple[str, int]]) -> list[int]:
+        """Pages holding the watched circuits, from (selNo, page) pairs."""
+        return sorted({page for selNo, page in circuit_pages if selNo in self.circuits})
+
+    def cached_page(self, page_num: int, digest: bytes) -> ParsedCircuitPage | None:
+        """Parsed page if the response of the page is unchanged."""
+        cached = self._pages.get(page_num)
+        if cached is None or cached[0] != digest:
+            return None
+        return cached[1]
+
+    def cache_page(
+        self, page_num: int, digest: bytes, page: ParsedCircuitPage
+    ) -> ParsedCircuitPage:
+        """Remember the parsed page of a response."""
+        self._pages[page_num] = (digest, page)
+        return page
+
+    def record(self, selNo: str, timestamp: float, watts: float) -> None:
+        """Add a sample of a watched circuit."""
+        if (samples := self._samples.get(selNo)) is not None:
+            samples.append(PowerSample(timestamp, watts))
+
+    def samples(self, selNo: str) -> list[PowerSample]:
+        """Samples of a watched circuit, oldest first."""
+        return list(self._samples.get(selNo, ()))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summary of the watch list for the diagnostics download."""
+        return {
+            "circuits": sorted(self.circuits),
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "samples": {
+                selNo: {
+                    "count": len(samples),
+                    "last": (
+                        [samples[-1].timestamp, samples[-1].watts] if samples else None
+                    ),
+                }
+                for selNo, samples in self._samples.items()
+            },
+        }
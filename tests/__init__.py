@@ -0,0 +1 @@
+"""Tests for the Eco Mane HEMS integration."""
@@ -0,0 +1,102 @@
+"""Round trips of the columnar export and the response capture archive."""
+
+from __future__ import annotations
+
+import math
+from pathlib import Path
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.ecomane.capture import ResponseArchive, read_archive
+from custom_components.ecomane.export import (
+    TIMESTAMP_COLUMN,
+    TimeSeriesExport,
+    open_export_day,
+)
+
+# 2024-01-01 12:00 (UTC)
+NOON = 1704110400.0
+
+
+def local_day(timestamp: float) -> str:
+    """Directory of the day a timestamp is exported to."""
+    return dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).date().isoformat()
+
+
+def test_export_round_trip(tmp_path: Path) -> None:
+    """Rows written in batches are read back as columns."""
+    export = TimeSeriesExport(tmp_path, flush_interval=0)
+    export.append(NOON, {"power_1": 100.0, "power_2": 200.0})
+    export.append(NOON + 60, {"power_1": 110.0, "power_2": 210.0})
+    export.flush()
+    # 途中から現れた列と値のない列
+    export.append(NOON + 120, {"power_1": 120.0, "power_3": 5.0})
+    export.flush()
+    assert export.rows_written == 3
+
+    with open_export_day(tmp_path, local_day(NOON)) as day:
+        assert sorted(day.columns) == [
+            "power_1",
+            "power_2",
+            "power_3",
+            TIMESTAMP_COLUMN,
+        ]
+        assert list(day.column(TIMESTAMP_COLUMN)) == [NOON, NOON + 60, NOON + 120]
+        assert list(day.column("power_1")) == [100.0, 110.0, 120.0]
+        power_2 = list(day.column("power_2"))
+        assert power_2[:2] == [200.0, 210.0]
+        assert math.isnan(power_2[2])
+        power_3 = list(day.column("power_3"))
+        assert all(math.isnan(value) for value in power_3[:2])
+        assert power_3[2] == 5.0
+        assert list(day.range(NOON + 30, NOON + 120)["power_1"]) == [110.0]
+
+
+def test_export_resumes_and_compresses_previous_days(tmp_path: Path) -> None:
+    """A new export appends to today's files and gzips the finished days."""
+    export = TimeSeriesExport(tmp_path, flush_interval=0)
+    export.append(NOON, {"power_1": 100.0})
+    export.flush()
+    # 再起動後の書き込み (同じ日は追記し、翌日に移ると前日を圧縮する)
+    export = TimeSeriesExport(tmp_path, flush_interval=0)
+    export.append(NOON + 60, {"power_1": 110.0})
+    export.append(NOON + 86400, {"power_1": 120.0})
+    export.flush()
+
+    first = tmp_path / local_day(NOON)
+    assert not list(first.glob("*.f64"))
+    assert list(first.glob("*.f64.gz"))
+    with open_export_day(tmp_path, local_day(NOON)) as day:
+        assert list(day.column("power_1")) == [100.0, 110.0]
+    with open_export_day(tmp_path, local_day(NOON + 86400)) as day:
+        assert list(day.column("power_1")) == [120.0]
+
+
+def test_capture_round_trip(tmp_path: Path) -> None:
+    """Captured responses are read back in order across segments."""
+    archive = ResponseArchive(tmp_path, segment_bytes=100)
+    bodies = [bytes([number]) * 80 for number in range(5)]
+    for number, body in enumerate(bodies):
+        archive.append("ecoTopMoni.cgi", f"http://127.0.0.1/{number}", body)
+        archive.flush()
+    assert archive.captured == 5
+    assert len(list(tmp_path.glob("capture-*.bin.gz"))) > 1
+
+    responses = list(read_archive(tmp_path))
+    assert [response.body for response in responses] == bodies
+    assert [response.url for response in responses] == [
+        f"http://127.0.0.1/{number}" for number in range(5)
+    ]
+    assert {response.endpoint for response in responses} == {"ecoTopMoni.cgi"}
+
+
+def test_capture_drops_oldest_segments(tmp_path: Path) -> None:
+    """The archive stays within its size limit by removing old segments."""
+    archive = ResponseArchive(tmp_path, max_bytes=1000, segment_bytes=100)
+    for number in range(10):
+        # 圧縮の効かない本文
+        archive.append("ecoTopMoni.cgi", "http://127.0.0.1/", bytes(range(number, 256)))
+        archive.flush()
+    responses = list(read_archive(tmp_path))
+    assert 0 < len(responses) < 10
+    assert responses[-1].body == bytes(range(9, 256))
@@ -0,0 +1,137 @@
+"""Tests of the local energy integration."""
+
+from __future__ import annotations
+
+from array import array
+import asyncio
+from datetime import date, timedelta
+import math
+from pathlib import Path
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.ecomane.const import (
+    ENERGY_INTEGRATION_MAX_GAP,
+    OPTION_ENERGY_INTEGRATION,
+)
+from custom_components.ecomane.coordinator import (
+    EcoManeCircuit,
+    EcoManeDataCoordinator,
+)
+from custom_components.ecomane.integration import EnergyIntegrator
+
+
+def test_reconcile_never_lowers_energy() -> None:
+    """A device value below the local energy keeps the local one."""
+    integrator = EnergyIntegrator()
+    assert integrator.reconcile("1", 0.05, 0.02) == 0.05
+    assert integrator.last_drift["1"] == pytest.approx(0.03)
+    # ECOマネの値が上回れば置き換える
+    assert integrator.reconcile("1", 0.05, 0.07) == 0.07
+    assert integrator.last_drift["1"] == pytest.approx(-0.02)
+
+
+def test_reconcile_subtracts_lead_from_later_integration() -> None:
+    """The lead over the device is taken from the following samples."""
+    integrator = EnergyIntegrator()
+    integrator.integrate("1", 0.0, 1000.0)
+    energy = integrator.reconcile("1", 0.05, 0.02)
+    # 1000 W で 72秒 = 0.02 kWh は先行した 0.03 kWh に満たない
+    assert integrator.integrate("1", 72.0, 1000.0) == 0.0
+    # 残りの 0.01 kWh を差し引いた分だけ増える
+    kwh = integrator.integrate("1", 144.0, 1000.0)
+    assert kwh == pytest.approx(0.01)
+    energy += kwh
+    assert integrator.reconcile("1", energy, 0.06) == pytest.approx(0.06)
+    assert integrator.integrate("1", 216.0, 1000.0) == pytest.approx(0.02)
+
+
+def test_reconcile_without_local_energy() -> None:
+    """The device value is used as is until there is a local value."""
+    integrator = EnergyIntegrator()
+    assert integrator.reconcile("1", float("nan"), 0.5) == 0.5
+    assert integrator.reconciliations == 0
+    assert "1" not in integrator.last_drift
+
+
+def test_integrate_trapezoid() -> None:
+    """Energy between samples is the mean power times the elapsed time."""
+    integrator = EnergyIntegrator()
+    assert integrator.integrate("1", 0.0, 1000.0) == 0.0
+    assert integrator.integrate("1", 60.0, 2000.0) == pytest.approx(0.025)
+
+
+def test_integrate_skips_gaps_and_unknown_power() -> None:
+    """Long gaps, unknown power and out-of-order samples add nothing."""
+    integrator = EnergyIntegrator()
+    integrator.integrate("1", 0.0, 1000.0)
+    assert integrator.integrate("1", ENERGY_INTEGRATION_MAX_GAP + 1, 1000.0) == 0.0
+    assert integrator.integrate("1", ENERGY_INTEGRATION_MAX_GAP, 1000.0) == 0.0
+    assert integrator.integrate("1", 2000.0, math.nan) == 0.0
+    # 不明な電力の後は次の記録から積算し直す
+    assert integrator.integrate("1", 2060.0, 1000.0) == 0.0
+    assert integrator.integrate("1", 2120.0, 1000.0) > 0.0
+
+
+def test_roll_over_drops_the_lead() -> None:
+    """A new day starts without the lead over the device."""
+    integrator = EnergyIntegrator()
+    integrator.integrate("1", 0.0, 1000.0)
+    integrator.reconcile("1", 0.05, 0.02)
+    integrator.roll_over(date(2024, 1, 2))
+    assert integrator.day == date(2024, 1, 2)
+    assert integrator.integrate("1", 72.0, 1000.0) == pytest.approx(0.02)
+
+
+def test_forget_removed_circuits() -> None:
+    """Circuits that are gone no longer report drift."""
+    integrator = EnergyIntegrator()
+    integrator.integrate("1", 0.0, 1000.0)
+    integrator.reconcile("2", 0.05, 0.02)
+    integrator.forget({"1"})
+    assert integrator.as_dict()["last_drift"] == {}
+    assert integrator.integrate("1", 60.0, 1000.0) > 0.0
+
+
+def test_coordinator_resets_energy_at_midnight(tmp_path: Path) -> None:
+    """The integrated energy of every circuit restarts from zero each day."""
+
+    async def roll_over() -> tuple[bool, list[float], bool]:
+        hass = HomeAssistant(str(tmp_path))
+        coordinator = EcoManeDataCoordinator(
+            hass, "127.0.0.1", {OPTION_ENERGY_INTEGRATION: True}
+        )
+        try:
+            coordinator._set_topology(
+                [
+                    EcoManeCircuit(
+                        index=index,
+                        selNo=str(index + 1),
+                        place="台所",
+                        circuit="回路",
+                        page=1,
+                    )
+                    for index in range(3)
+                ]
+            )
+            coordinator._data.resize(3)
+            coordinator._data.energy[:] = array("d", [1.5, math.nan, 2.5])
+            integrator = coordinator.energy_integrator
+            assert integrator is not None
+            # 初回は日付を記録するだけ
+            first = coordinator._roll_over_energy()
+            integrator.day = dt_util.now().date() - timedelta(days=1)
+            rolled_over = coordinator._roll_over_energy()
+            return first, list(coordinator._data.energy), rolled_over
+        finally:
+            await coordinator.async_close()
+
+    first, energy, rolled_over = asyncio.run(roll_over())
+    assert not first
+    assert rolled_over
+    assert energy[0] == 0.0
+    assert math.isnan(energy[1])
+    assert energy[2] == 0.0
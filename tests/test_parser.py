@@ -0,0 +1,218 @@
+"""Parity tests of the single-pass parsers against the BeautifulSoup ones."""
+
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from custom_components.ecomane.const import ENCODING
+from custom_components.ecomane.coordinator import ecomane_usage_sensors_descs
+from custom_components.ecomane.parser import (
+    StreamingDivParser,
+    _bs_parse_circuit_page,
+    _bs_parse_energy_page,
+    _bs_parse_usage_page,
+    _fast_parse_circuit_page,
+    _fast_parse_energy_page,
+    _fast_parse_usage_page,
+    _yesterday_energy,
+    parse_circuit_bodies,
+    parse_circuit_page,
+    parse_energy_bodies,
+    parse_energy_history_page,
+    parse_energy_page,
+    parse_usage_body,
+    parse_usage_page,
+    streamed_energy,
+    streamed_usage,
+)
+
+USAGE_KEYS = [desc.key for desc in ecomane_usage_sensors_descs]
+
+
+def usage_html(values: dict[str, str]) -> str:
+    """ecoTopMoni.cgi with a div for each value."""
+    divs = "\n".join(
+        f'<div class="num" id="{key}">{value}</div>' for key, value in values.items()
+    )
+    return (
+        "<html><head><title>省エネモニター</title></head><body>\n"
+        f'<div id="main">\n{divs}\n</div>\n</body></html>'
+    )
+
+
+def circuit_block(button_num: int, sel_no: str, place: str, circuit: str, power: str):
+    """ojt_NN block of elecCheck_6000.cgi."""
+    return (
+        f'<div id="ojt_{button_num:02d}" class="ojt">\n'
+        '<div class="btn btn_58">'
+        f"<a href=\"javascript:moveCircuitChange('{sel_no}')\">"
+        f'<div class="txt">{place}</div>'
+        f'<div class="txt2">{circuit}</div>'
+        f'<div class="num">{power}</div>'
+        "</a></div>\n</div>"
+    )
+
+
+def circuit_html(blocks: list[str], maxp: str | None = "2") -> str:
+    """elecCheck_6000.cgi with the given circuit blocks."""
+    form = "" if maxp is None else f'<input type="hidden" name="maxp" value="{maxp}">'
+    return (
+        "<html><head><title>回路別電力</title></head><body>\n"
+        f'<form><input type="hidden" name="page" value="1">{form}</form>\n'
+        + "\n".join(blocks)
+        + "\n</body></html>"
+    )
+
+
+def energy_html(ttx: str | None) -> str:
+    """resultGraphDiv_4242.cgi with the given ttx_01 text."""
+    div = "" if ttx is None else f'<div id="ttx_01" class="ttx">{ttx}</div>\n'
+    return (
+        "<html><head><title>グラフ</title></head><body>\n"
+        f'<div id="graph"><canvas></canvas></div>\n{div}</body></html>'
+    )
+
+
+USAGE_PAGES = {
+    "complete": usage_html(
+        dict(zip(USAGE_KEYS, ["1.10", "2.20", "3.30", "4", "0", "0.5", "12"]))
+    ),
+    "missing_div": usage_html(
+        {"num_L1": "1.10", "num_L4": "3.30", "num_R2": "0", "num_R3": "12"}
+    ),
+    "malformed_number": usage_html(
+        dict(zip(USAGE_KEYS, ["1.10", "--.-", "", "4", "1,234", "0.5", "-"]))
+    ),
+    "whitespace_and_charref": usage_html(
+        {"num_L1": "\n  1.10 ", "num_L2": "&#50;.20", "num_L4": "3.30"}
+    ),
+    "nested_div": usage_html({"num_L1": "<div><span>1</span>.10</div>"}),
+    "duplicate_id": usage_html({"num_L1": "1.10"})
+    + '<div class="num" id="num_L1">9.99</div>',
+    "empty": "",
+}
+
+CIRCUIT_PAGES = {
+    "complete": circuit_html(
+        [
+            circuit_block(n, str(100 + n), "キッチン", f"回路{n}", f"{n * 10}W")
+            for n in range(1, 9)
+        ]
+    ),
+    "partial_page": circuit_html(
+        [circuit_block(n, str(100 + n), "寝室", f"回路{n}", "0W") for n in (1, 2, 3)]
+    ),
+    "missing_block": circuit_html(
+        [circuit_block(n, str(100 + n), "寝室", f"回路{n}", "5W") for n in (1, 3)]
+    ),
+    "missing_num": circuit_html(
+        [
+            circuit_block(1, "101", "居間", "照明", "12W").replace(
+                '<div class="num">12W</div>', ""
+            )
+        ]
+    ),
+    "malformed_power": circuit_html(
+        [
+            circuit_block(1, "101", "居間", "照明", "---W"),
+            circuit_block(2, "102", "居間", "エアコン", "W"),
+            circuit_block(3, "103", "居間", "テレビ", "1,200W"),
+        ]
+    ),
+    "missing_sel_no": circuit_html(
+        [
+            circuit_block(1, "101", "居間", "照明", "12W").replace(
+                "moveCircuitChange", "x"
+            )
+        ]
+    ),
+    "missing_maxp": circuit_html(
+        [circuit_block(1, "101", "居間", "照明", "12W")], maxp=None
+    ),
+    "empty_text": circuit_html([circuit_block(1, "101", "", "", "0W")]),
+    "empty": "",
+}
+
+ENERGY_PAGES = {
+    "complete": energy_html("今日:1.02kWh　昨日:3.16kWh"),
+    "missing_div": energy_html(None),
+    "malformed_today": energy_html("今日:--kWh　昨日:3.16kWh"),
+    "missing_yesterday": energy_html("今日:1.02kWh"),
+    "missing_prefix": energy_html("1.02kWh"),
+    "empty": "",
+}
+
+
+@pytest.mark.parametrize("text", USAGE_PAGES.values(), ids=USAGE_PAGES)
+def test_usage_page_parity(text: str) -> None:
+    """The usage values match BeautifulSoup."""
+    expected = _bs_parse_usage_page(text, USAGE_KEYS)
+    assert _fast_parse_usage_page(text, USAGE_KEYS) == expected
+    assert parse_usage_page(text, USAGE_KEYS) == expected
+
+
+@pytest.mark.parametrize("text", CIRCUIT_PAGES.values(), ids=CIRCUIT_PAGES)
+def test_circuit_page_parity(text: str) -> None:
+    """The circuits and page count match BeautifulSoup."""
+    expected = _bs_parse_circuit_page(text)
+    assert _fast_parse_circuit_page(text) == expected
+    assert parse_circuit_page(text) == expected
+
+
+@pytest.mark.parametrize("text", ENERGY_PAGES.values(), ids=ENERGY_PAGES)
+def test_energy_page_parity(text: str) -> None:
+    """Today's and yesterday's energy match BeautifulSoup."""
+    assert _fast_parse_energy_page(text) == _bs_parse_energy_page(text)
+    assert parse_energy_page(text) == _bs_parse_energy_page(text)
+    expected = _bs_parse_energy_page(text, _yesterday_energy)
+    assert _fast_parse_energy_page(text, _yesterday_energy) == expected
+    assert parse_energy_history_page(text) == expected
+
+
+@pytest.mark.parametrize("text", USAGE_PAGES.values(), ids=USAGE_PAGES)
+def test_streamed_usage_parity(text: str) -> None:
+    """Values read while streaming byte by byte match the full parse."""
+    parser = StreamingDivParser(USAGE_KEYS)
+    body = text.encode(ENCODING)
+    for offset in range(len(body)):
+        # Shift-JIS の文字の途中で区切る
+        parser.feed(body[offset : offset + 1])
+    parser.close()
+    expected = parse_usage_body(body, USAGE_KEYS)
+    # 読めない値がある場合は本文全体の解析に任せる
+    assert streamed_usage(parser.values, USAGE_KEYS) == (
+        None if None in expected else expected
+    )
+
+
+@pytest.mark.parametrize("text", ENERGY_PAGES.values(), ids=ENERGY_PAGES)
+def test_streamed_energy_parity(text: str) -> None:
+    """Today's energy read while streaming matches the full parse."""
+    parser = StreamingDivParser(["ttx_01"])
+    body = text.encode(ENCODING)
+    for offset in range(0, len(body), 3):
+        parser.feed(body[offset : offset + 3])
+    parser.close()
+    assert streamed_energy(parser.values) == parse_energy_bodies([body])[0]
+
+
+def test_usage_body_numbers() -> None:
+    """Malformed or missing usage values are None."""
+    body = USAGE_PAGES["malformed_number"].encode(ENCODING)
+    assert parse_usage_body(body, USAGE_KEYS) == [1.1, None, None, 4.0, None, 0.5, None]
+    body = USAGE_PAGES["missing_div"].encode(ENCODING)
+    assert parse_usage_body(body, USAGE_KEYS) == [1.1, None, 3.3, None, None, 0.0, 12.0]
+
+
+def test_circuit_bodies_watts() -> None:
+    """Malformed powers are NaN watts."""
+    (page,) = parse_circuit_bodies([CIRCUIT_PAGES["malformed_power"].encode(ENCODING)])
+    assert [circuit.selNo for circuit in page.circuits] == ["101", "102", "103"]
+    assert all(math.isnan(circuit.watts) for circuit in page.circuits)
+    (page,) = parse_circuit_bodies([CIRCUIT_PAGES["complete"].encode(ENCODING)])
+    assert page.total_page == 2
+    assert [circuit.watts for circuit in page.circuits] == [
+        n * 10.0 for n in range(1, 9)
+    ]
@@ -0,0 +1,70 @@
+"""Tests of the adaptive polling interval."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.ecomane.const import (
+    ADAPTIVE_MAX_SCALE,
+    ADAPTIVE_MIN_SCALE,
+    BACKOFF_INITIAL,
+    BACKOFF_MAX,
+)
+from custom_components.ecomane.polling import AdaptivePollingController
+
+
+def test_backoff_grows_exponentially_up_to_the_limit() -> None:
+    """Each failure doubles the backoff, half of which is random."""
+    controller = AdaptivePollingController(60, enabled=True)
+    for failures in range(1, 12):
+        delay = min(BACKOFF_INITIAL * 2 ** (failures - 1), BACKOFF_MAX)
+        backoff = controller.record_failure()
+        assert delay / 2 <= backoff <= delay
+        assert controller.interval == backoff
+    assert controller.failures == 11
+    # 成功すると通常の間隔に戻る
+    controller.record_success(1.0, changed=True)
+    assert controller.backoff is None
+    assert controller.failures == 0
+    assert controller.interval == 60
+
+
+def test_disabled_controller_keeps_the_interval() -> None:
+    """Without adaptive polling the configured interval is always used."""
+    controller = AdaptivePollingController(60, enabled=False)
+    assert controller.record_failure() == 60
+    controller.record_success(50.0, changed=True)
+    assert controller.interval == 60
+
+
+def test_slow_updates_lengthen_the_interval() -> None:
+    """Updates taking more than half of the interval slow down polling."""
+    controller = AdaptivePollingController(60, enabled=True)
+    for _ in range(10):
+        controller.record_success(controller.interval, changed=True)
+    assert controller.scale == ADAPTIVE_MAX_SCALE
+
+
+def test_not_faster_than_configured_by_default() -> None:
+    """Fast updates only shorten an interval that was lengthened."""
+    controller = AdaptivePollingController(60, enabled=True)
+    for _ in range(10):
+        controller.record_success(0.1, changed=True)
+    assert controller.interval == 60
+    controller.record_success(60.0, changed=True)
+    assert controller.interval > 60
+    for _ in range(10):
+        controller.record_success(0.1, changed=True)
+    assert controller.interval == 60
+
+
+def test_faster_than_configured_when_allowed() -> None:
+    """With the opt-in, fast and changing updates shorten the interval."""
+    controller = AdaptivePollingController(60, enabled=True, allow_faster=True)
+    for _ in range(10):
+        controller.record_success(0.1, changed=True)
+    assert controller.scale == pytest.approx(ADAPTIVE_MIN_SCALE)
+    # 値が変化しなくなると設定した間隔に戻す
+    for _ in range(10):
+        controller.record_success(0.1, changed=False)
+    assert controller.scale == 1.0
@@ -0,0 +1,18 @@
+"""Tests of the performance telemetry."""
+
+from __future__ import annotations
+
+from custom_components.ecomane.telemetry import EcoManeTelemetry
+
+
+def test_fetch_outside_cycle_not_counted_per_update() -> None:
+    """Watch and backfill requests only count towards the endpoint totals."""
+    telemetry = EcoManeTelemetry(enabled=True)
+    telemetry.start_cycle()
+    telemetry.record_fetch("elecCheck_6000.cgi", 0.01, 1000)
+    telemetry.record_fetch("elecCheck_6000.cgi", 0.01, 500, cycle=False)
+    telemetry.end_cycle(0.1, 60.0, success=True)
+    assert telemetry.last_cycle.requests == 1
+    assert telemetry.last_cycle.bytes_received == 1000
+    assert telemetry.requests == {"elecCheck_6000.cgi": 2}
+    assert telemetry.bytes_received == {"elecCheck_6000.cgi": 1500}
@@ -0,0 +1,62 @@
+"""Tests of the circuit topology changes and the values that follow them."""
+
+from __future__ import annotations
+
+from array import array
+import math
+
+from custom_components.ecomane.coordinator import (
+    EcoManeCircuit,
+    EcoManeData,
+    TopologyDiff,
+)
+
+
+def circuit(
+    index: int, selNo: str, place: str = "台所", page: int = 1
+) -> EcoManeCircuit:
+    """Circuit with a name derived from its selNo."""
+    return EcoManeCircuit(
+        index=index, selNo=selNo, place=place, circuit=f"回路{selNo}", page=page
+    )
+
+
+def test_topology_diff_moved_circuits_are_no_change() -> None:
+    """Circuits found at other indexes keep their selNo and are not changed."""
+    old = [circuit(0, "1"), circuit(1, "2"), circuit(2, "3")]
+    new = [circuit(0, "2"), circuit(1, "3"), circuit(2, "1", page=2)]
+    assert not TopologyDiff.between(old, new)
+
+
+def test_topology_diff_added_removed_renamed() -> None:
+    """Circuits are compared by selNo."""
+    old = [circuit(0, "1"), circuit(1, "2"), circuit(2, "3")]
+    # 2 が削除されて 3 が前に詰まり、3 は場所が変わり 4 が追加された
+    new = [circuit(0, "1"), circuit(1, "3", place="居間"), circuit(2, "4")]
+    diff = TopologyDiff.between(old, new)
+    assert [c.selNo for c in diff.added] == ["4"]
+    assert [c.selNo for c in diff.removed] == ["2"]
+    assert diff.renamed == [new[1]]
+    assert diff
+
+
+def test_move_energy_follows_shifted_selno() -> None:
+    """The energy of each circuit moves to its new index."""
+    data = EcoManeData(0)
+    data.resize(3)
+    data.energy[:] = array("d", [1.0, 2.0, 3.0])
+    # 先頭の回路 (selNo 1) が削除され、selNo 2, 3 が 0, 1 に詰まった
+    data.move_energy({1: 0, 2: 1}, 2)
+    assert list(data.energy) == [2.0, 3.0]
+
+
+def test_move_energy_unknown_circuits_are_nan() -> None:
+    """Circuits without a previous index have no energy yet."""
+    data = EcoManeData(0)
+    data.resize(2)
+    data.energy[0] = 5.0
+    data.energy[1] = 6.0
+    # selNo 1 は 2 番目に移り、先頭に新しい回路が追加された
+    data.move_energy({0: 1, 1: 2}, 3)
+    assert math.isnan(data.energy[0])
+    assert list(data.energy[1:]) == [5.0, 6.0]
@@ -0,0 +1,228 @@
+"""Benchmark full update cycles of EcoManeDataCoordinator against the simulator.
+
+Reports full-cycle latency, requests per cycle, CPU time per cycle, the
+number of entities, the state writes per cycle (one recorder row each) and
+the size of the per-circuit attributes of the aggregate entities.
+
+The simulator runs in its own process, so the CPU time is that of the
+coordinator and the event loop only (the parser worker processes of the
+process executor are not included) and the requests are counted from the
+coordinator's connections.
+
+Usage:
+    python tools/benchmark.py --circuits 8 40 200 --cycles 10 --latency 0.02
+    python tools/benchmark.py --circuits 40 200 --concurrency 1 2 4 8 16
+    python tools/benchmark.py --active-ratio 0.1 --value-period 0.5  # 静かな家
+    python tools/benchmark.py --circuits 200 --option circuit_entities=page
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import AsyncIterator
+import contextlib
+from pathlib import Path
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from custom_components.ecomane.const import (
+    DEFAULT_ENERGY_CONCURRENCY,
+    OPTION_ENERGY_CONCURRENCY,
+)
+from custom_components.ecomane.coordinator import EcoManeDataCoordinator
+from custom_components.ecomane.sensor import EcoManeCircuitGroupSensorEntity
+from ecomane_simulator import SimulatorConfig
+
+SIMULATOR = Path(__file__).resolve().parent / "ecomane_simulator.py"
+SIMULATOR_START_TIMEOUT = 10.0  # シミュレータの起動を待つ時間: 10秒
+
+
+@contextlib.asynccontextmanager
+async def simulator_process(config: SimulatorConfig) -> AsyncIterator[int]:
+    """Run the simulator in its own process and yield its port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    args = [
+        f"--port={port}",
+        f"--circuits={config.circuits}",
+        f"--latency={config.latency}",
+        f"--jitter={config.jitter}",
+        f"--error-rate={config.error_rate}",
+        f"--value-period={config.value_period}",
+        f"--active-ratio={config.active_ratio}",
+    ]
+    if config.seed is not None:
+        args.append(f"--seed={config.seed}")
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        str(SIMULATOR),
+        *args,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        # 待ち受けを開始するまで待つ
+        deadline = time.monotonic() + SIMULATOR_START_TIMEOUT
+        while True:
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", port)
+            except OSError:
+                if time.monotonic() > deadline or process.returncode is not None:
+                    raise RuntimeError("The simulator did not start") from None
+                await asyncio.sleep(0.05)
+            else:
+                writer.close()
+                await writer.wait_closed()
+                break
+        yield port
+    finally:
+        if process.returncode is None:
+            process.terminate()
+        await process.wait()
+
+
+async def benchmark(
+    circuits: int, cycles: int, config: SimulatorConfig, options: dict
+) -> dict[str, float]:
+    """Run full update cycles against a simulator with the given circuits."""
+    config.circuits = circuits
+    async with simulator_process(config) as port:
+        return await _benchmark(port, circuits, cycles, options)
+
+
+async def _benchmark(
+    port: int, circuits: int, cycles: int, options: dict
+) -> dict[str, float]:
+    """Run full update cycles against a running simulator."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        coordinator = EcoManeDataCoordinator(hass, f"127.0.0.1:{port}", options)
+        try:
+            # 1回目はページ数の取得を含むため計測しない
+            try:
+                await coordinator._async_update_data()
+            except UpdateFailed:
+                pass
+            failures = 0
+            latencies: list[float] = []
+            cpu_times: list[float] = []
+            requests: list[int] = []
+            changed: list[int] = []
+            for _ in range(cycles):
+                # 全種別 (電力・電力量・使用量) を更新対象にする
+                coordinator._tier_last_refresh.clear()
+                start_requests = _requests(coordinator)
+                start_cpu = time.process_time()
+                start = time.perf_counter()
+                try:
+                    await coordinator._async_update_data()
+                except UpdateFailed:
+                    failures += 1
+                latencies.append(time.perf_counter() - start)
+                cpu_times.append(time.process_time() - start_cpu)
+                requests.append(_requests(coordinator) - start_requests)
+                # エンティティの単位に応じた状態の書き込み数
+                changed.append(len(coordinator._contexts(coordinator.changed_keys)))
+            groups = coordinator.circuit_groups
+            # まとめたエンティティの記録しない属性の大きさ
+            attributes = sum(
+                len(
+                    json_bytes(
+                        EcoManeCircuitGroupSensorEntity(
+                            coordinator, group
+                        ).extra_state_attributes
+                    )
+                )
+                for group in groups
+            )
+        finally:
+            await coordinator.async_close()
+    return {
+        "circuits": circuits,
+        "latency_mean": statistics.fmean(latencies),
+        "latency_max": max(latencies),
+        "requests": statistics.fmean(requests),
+        "cpu_mean": statistics.fmean(cpu_times),
+        "failures": failures,
+        "changed": statistics.fmean(changed),
+        # 使用量と回路ごと (電力・電力量) またはまとめた回路のエンティティ数
+        "entities": len(coordinator.usage_sensor_descs)
+        + (len(groups) if groups else 2 * coordinator.circuit_total),
+        "attributes": attributes,
+    }
+
+
+def _requests(coordinator: EcoManeDataCoordinator) -> int:
+    """Requests sent by the coordinator (each uses a new or reused connection)."""
+    return coordinator.connections_created + coordinator.connections_reused
+
+
+async def main() -> None:
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--circuits", type=int, nargs="+", default=[8, 40, 200])
+    parser.add_argument("--cycles", type=int, default=10)
+    # 回路別電力量の同時取得数の上限 (複数指定すると回路数ごとに比較)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[DEFAULT_ENERGY_CONCURRENCY]
+    )
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    # 既定では毎回値が変わり、全ページの解析が必要になる
+    parser.add_argument("--value-period", type=float, default=1e-6)
+    parser.add_argument("--active-ratio", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--option", action="append", default=[], metavar="KEY=VALUE")
+    args = parser.parse_args()
+    options: dict[str, int | str] = {}
+    for option in args.option:
+        key, _, value = option.partition("=")
+        options[key] = int(value) if value.isdigit() else value
+
+    print(
+        f"{'circuits':>8} {'cap':>4} {'latency ms':>11} {'max ms':>9} "
+        f"{'requests':>9} {'cpu ms':>9} {'failures':>9} {'writes':>7} {'entities':>8} "
+        f"{'attrs KB':>8}"
+    )
+    for circuits in args.circuits:
+        for concurrency in args.concurrency:
+            config = SimulatorConfig(
+                latency=args.latency,
+                jitter=args.jitter,
+                error_rate=args.error_rate,
+                value_period=args.value_period,
+                active_ratio=args.active_ratio,
+                seed=args.seed,
+            )
+            result = await benchmark(
+                circuits,
+                args.cycles,
+                config,
+                {**options, OPTION_ENERGY_CONCURRENCY: concurrency},
+            )
+            print(
+                f"{result['circuits']:>8} {concurrency:>4} "
+                f"{result['latency_mean'] * 1000:>11.1f} "
+                f"{result['latency_max'] * 1000:>9.1f} {result['requests']:>9.1f} "
+                f"{result['cpu_mean'] * 1000:>9.1f} {result['failures']:>9} "
+                f"{result['changed']:>7.1f} {result['entities']:>8} "
+                f"{result['attributes'] / 1000:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,217 @@
+"""Local stand-in for the Eco Mane HEMS web server.
+
+Serves the three pages read by the integration in Shift-JIS:
+
+* ecoTopMoni.cgi
+* elecCheck_6000.cgi?disp=2&page=N (maxp と ojt_NN)
+* resultGraphDiv_4242.cgi?...&selNo=N (ttx_01)
+
+Usage:
+    python tools/ecomane_simulator.py --circuits 40 --latency 0.05 --port 8080
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import math
+import random
+import time
+
+from aiohttp import web
+
+ENCODING = "shift-jis"
+CIRCUITS_PER_PAGE = 8
+SEL_NO_BASE = 100  # 回路の selNo は 100 から連番
+USAGE_KEYS = ["num_L1", "num_L2", "num_L4", "num_L5", "num_R1", "num_R2", "num_R3"]
+PLACES = [
+    "キッチン",
+    "ダイニング",
+    "リビング",
+    "寝室",
+    "洗面所",
+    "玄関",
+    "書斎",
+    "和室",
+]
+CIRCUITS = ["照明＆コンセント", "エアコン", "コンセント", "食器洗い乾燥機", "照明"]
+
+
+@dataclass(kw_only=True)
+class SimulatorConfig:
+    """Behaviour of the simulated device."""
+
+    circuits: int = 40  # 回路数
+    latency: float = 0.0  # 1リクエストの応答遅延 (秒)
+    jitter: float = 0.0  # 応答遅延のばらつき (秒)
+    error_rate: float = 0.0  # HTTP 500 を返す確率
+    value_period: float = 10.0  # 電力値が変化する周期 (秒)
+    active_ratio: float = 1.0  # 値が変化する回路の割合 (残りは一定)
+    seed: int | None = None
+
+
+@dataclass
+class SimulatorStats:
+    """Requests served by the simulator."""
+
+    requests: int = 0
+    errors: int = 0
+    bytes_sent: int = 0
+    per_endpoint: dict[str, int] = field(default_factory=dict)
+
+
+class EcoManeSimulator:
+    """aiohttp application imitating an Eco Mane controller."""
+
+    def __init__(self, config: SimulatorConfig) -> None:
+        """Initialize the simulator."""
+        self.config = config
+        self.stats = SimulatorStats()
+        self._random = random.Random(config.seed)
+        self._start = time.monotonic()
+        self.app = web.Application()
+        self.app.router.add_get("/ecoTopMoni.cgi", self._usage)
+        self.app.router.add_get("/elecCheck_6000.cgi", self._circuit_page)
+        self.app.router.add_get("/resultGraphDiv_4242.cgi", self._energy)
+
+    @property
+    def total_page(self) -> int:
+        """Number of circuit pages (maxp)."""
+        return max(1, math.ceil(self.config.circuits / CIRCUITS_PER_PAGE))
+
+    def _bucket(self) -> int:
+        """Time bucket used to change the values periodically."""
+        return int((time.monotonic() - self._start) / self.config.value_period)
+
+    def _circuit_bucket(self, index: int) -> int:
+        """Time bucket of a circuit (always 0 for idle circuits)."""
+        if random.Random(index).random() >= self.config.active_ratio:
+            return 0
+        return self._bucket()
+
+    def _power(self, index: int) -> int:
+        """Current power of a circuit (W)."""
+        return random.Random(index * 7919 + self._circuit_bucket(index)).randint(
+            0, 1500
+        )
+
+    def _energy_today(self, index: int) -> float:
+        """Today's energy of a circuit (kWh)."""
+        bucket = self._circuit_bucket(index)
+        return round((index % 10 + 1) * 0.1 * (1 + bucket / 100), 2)
+
+    async def _respond(self, endpoint: str, html: str) -> web.Response:
+        """Apply latency and error injection, then send Shift-JIS HTML."""
+        config = self.config
+        delay = config.latency + self._random.uniform(-config.jitter, config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self.stats.requests += 1
+        self.stats.per_endpoint[endpoint] = self.stats.per_endpoint.get(endpoint, 0) + 1
+        if self._random.random() < config.error_rate:
+            self.stats.errors += 1
+            return web.Response(status=500, text="Internal Server Error")
+        body = html.encode(ENCODING)
+        self.stats.bytes_sent += len(body)
+        return web.Response(body=body, content_type="text/html", charset=ENCODING)
+
+    def usage_html(self) -> str:
+        """ecoTopMoni.cgi page."""
+        bucket = self._bucket()
+        divs = "\n".join(
+            f'<div class="num" id="{key}">{(number + 1) * 1.1 + bucket * 0.01:.2f}</div>'
+            for number, key in enumerate(USAGE_KEYS)
+        )
+        return (
+            "<html><head><title>省エネモニター</title></head><body>\n"
+            f'<div id="main">\n{divs}\n</div>\n</body></html>'
+        )
+
+    def circuit_page_html(self, page: int) -> str:
+        """elecCheck_6000.cgi page of circuits."""
+        first = (page - 1) * CIRCUITS_PER_PAGE
+        last = min(first + CIRCUITS_PER_PAGE, self.config.circuits)
+        blocks = []
+        for button_num, index in enumerate(range(first, last), start=1):
+            blocks.append(
+                f'<div id="ojt_{button_num:02d}" class="ojt">\n'
+                '<div class="btn btn_58">'
+                f"<a href=\"javascript:moveCircuitChange('{SEL_NO_BASE + index}')\">"
+                f'<div class="txt">{PLACES[index % len(PLACES)]}</div>'
+                f'<div class="txt2">{CIRCUITS[index % len(CIRCUITS)]}{index}</div>'
+                f'<div class="num">{self._power(index)}W</div>'
+                "</a></div>\n</div>"
+            )
+        return (
+            "<html><head><title>回路別電力</title></head><body>\n<form>"
+            f'<input type="hidden" name="page" value="{page}">'
+            f'<input type="hidden" name="maxp" value="{self.total_page}">'
+            "</form>\n" + "\n".join(blocks) + "\n</body></html>"
+        )
+
+    def energy_html(self, index: int) -> str:
+        """resultGraphDiv_4242.cgi page of a circuit."""
+        today = self._energy_today(index)
+        return (
+            "<html><head><title>グラフ</title></head><body>\n"
+            '<div id="graph"><canvas></canvas></div>\n'
+            f'<div id="ttx_01" class="ttx">今日:{today:.2f}kWh　昨日:3.16kWh</div>\n'
+            "</body></html>"
+        )
+
+    async def _usage(self, request: web.Request) -> web.Response:
+        """ecoTopMoni.cgi."""
+        return await self._respond("ecoTopMoni.cgi", self.usage_html())
+
+    async def _circuit_page(self, request: web.Request) -> web.Response:
+        """elecCheck_6000.cgi?disp=2&page=N."""
+        page = int(request.query.get("page", "1"))
+        return await self._respond("elecCheck_6000.cgi", self.circuit_page_html(page))
+
+    async def _energy(self, request: web.Request) -> web.Response:
+        """resultGraphDiv_4242.cgi?...&selNo=N."""
+        index = int(request.query.get("selNo", str(SEL_NO_BASE))) - SEL_NO_BASE
+        return await self._respond("resultGraphDiv_4242.cgi", self.energy_html(index))
+
+
+async def start_simulator(
+    config: SimulatorConfig, host: str = "127.0.0.1", port: int = 0
+) -> tuple[EcoManeSimulator, web.AppRunner, int]:
+    """Start a simulator and return it with its runner and port."""
+    simulator = EcoManeSimulator(config)
+    runner = web.AppRunner(simulator.app)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    sockets = site._server.sockets
+    return simulator, runner, sockets[0].getsockname()[1]
+
+
+def main() -> None:
+    """Run the simulator from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--circuits", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--value-period", type=float, default=10.0)
+    parser.add_argument("--active-ratio", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    config = SimulatorConfig(
+        circuits=args.circuits,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        value_period=args.value_period,
+        active_ratio=args.active_ratio,
+        seed=args.seed,
+    )
+    web.run_app(EcoManeSimulator(config).app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
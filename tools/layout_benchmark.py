@@ -0,0 +1,195 @@
+"""Compare startup time and recorder growth of the circuit entity layouts.
+
+Sets up the integration in a minimal Home Assistant with the recorder
+(SQLite in a temporary directory) against the simulator, once per layout
+(circuit, page, device):
+
+* the first start crawls the device, creates the entities and records the
+  given number of update cycles, after which the database size and the rows
+  of the states and state_attributes tables are reported;
+* the second start reuses the saved topology and entity registry, and its
+  setup time (until every sensor has a state) is reported as the startup.
+
+Usage:
+    python tools/layout_benchmark.py --circuits 40 200 --cycles 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+import contextlib
+import os
+from pathlib import Path
+import sqlite3
+import sys
+import tempfile
+import time
+
+from homeassistant import bootstrap, config_entries, loader
+from homeassistant.components.recorder import get_instance
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_START,
+    EVENT_HOMEASSISTANT_STARTED,
+    EVENT_HOMEASSISTANT_STOP,
+)
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.helpers import recorder
+from homeassistant.setup import async_setup_component
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchmark import simulator_process
+from custom_components.ecomane.config_flow import EcoManeConfigFlow
+from custom_components.ecomane.const import (
+    CIRCUIT_ENTITIES,
+    CONFIG_SELECTOR_IP,
+    DOMAIN,
+    OPTION_CIRCUIT_ENTITIES,
+)
+from custom_components.ecomane.coordinator import EcoManeDataCoordinator
+from ecomane_simulator import SimulatorConfig
+
+CUSTOM_COMPONENTS = Path(__file__).resolve().parents[1] / "custom_components"
+DATABASE = "home-assistant_v2.db"
+
+
+async def start_hass(config_dir: str) -> HomeAssistant:
+    """Start a Home Assistant with the recorder and the registries."""
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    recorder.async_initialize_recorder(hass)
+    # 書き込みをまとめずに毎回コミットし、計測の終わりに全て反映されるようにする
+    assert await async_setup_component(
+        hass,
+        "recorder",
+        {
+            "recorder": {
+                "db_url": f"sqlite:///{config_dir}/{DATABASE}",
+                "commit_interval": 0,
+            }
+        },
+    )
+    hass.set_state(CoreState.running)
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+    assert await recorder.async_wait_recorder(hass)
+    return hass
+
+
+async def stop_hass(hass: HomeAssistant) -> None:
+    """Stop a Home Assistant and wait for the recorder to finish."""
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_stop()
+
+
+async def wait_for(predicate: Callable[[], bool], timeout: float = 60.0) -> None:
+    """Wait until a condition holds."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError("Condition not met")
+        await asyncio.sleep(0.01)
+
+
+def database_rows(path: Path) -> dict[str, int]:
+    """Rows of the tables that grow with the state writes."""
+    with contextlib.closing(sqlite3.connect(path)) as connection:
+        return {
+            table: connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("states", "state_attributes")
+        }
+
+
+async def run_layout(
+    layout: str, circuits: int, cycles: int, port: int
+) -> dict[str, float]:
+    """Record cycles and measure the cached startup of a layout."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        # custom_components を設定ディレクトリから読み込む
+        os.symlink(CUSTOM_COMPONENTS, Path(config_dir) / "custom_components")
+
+        # 1回目の起動: 回路の巡回, エンティティの作成と更新の記録
+        hass = await start_hass(config_dir)
+        entry = config_entries.ConfigEntry(
+            version=EcoManeConfigFlow.VERSION,
+            minor_version=EcoManeConfigFlow.MINOR_VERSION,
+            domain=DOMAIN,
+            title="Eco Mane",
+            data={CONFIG_SELECTOR_IP: f"127.0.0.1:{port}"},
+            source=config_entries.SOURCE_USER,
+            options={OPTION_CIRCUIT_ENTITIES: layout},
+        )
+        await hass.config_entries.async_add(entry)
+        coordinator: EcoManeDataCoordinator = hass.data[DOMAIN][entry.entry_id]
+        await wait_for(lambda: coordinator.circuit_total == circuits)
+        # 初回の巡回に続く電力量の取得を含め、記録の前に一巡させる
+        await asyncio.sleep(1)
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        await get_instance(hass).async_block_till_done()
+        entities = len(hass.states.async_all("sensor"))
+        start_rows = database_rows(Path(config_dir) / DATABASE)
+        for _ in range(cycles):
+            # 全種別 (電力・電力量・使用量) を更新対象にする
+            coordinator._tier_last_refresh.clear()
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+        await get_instance(hass).async_block_till_done()
+        rows = database_rows(Path(config_dir) / DATABASE)
+        await stop_hass(hass)
+        size = sum(
+            path.stat().st_size for path in Path(config_dir).glob(f"{DATABASE}*")
+        )
+
+        # 2回目の起動: 保存した回路構成とエンティティレジストリから作成
+        hass = await start_hass(config_dir)
+        start = time.perf_counter()
+        assert await async_setup_component(hass, DOMAIN, {})
+        await wait_for(lambda: len(hass.states.async_all("sensor")) >= entities)
+        startup = time.perf_counter() - start
+        await stop_hass(hass)
+    return {
+        "entities": entities,
+        "startup": startup,
+        "states": (rows["states"] - start_rows["states"]) / cycles,
+        "attributes": rows["state_attributes"],
+        "size": size,
+    }
+
+
+async def main() -> None:
+    """Run the comparison from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--circuits", type=int, nargs="+", default=[40, 200])
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--layout", choices=CIRCUIT_ENTITIES, nargs="+")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"{'circuits':>8} {'layout':>8} {'entities':>8} {'startup ms':>11} "
+        f"{'rows/cycle':>10} {'attr rows':>9} {'db KB':>8}"
+    )
+    for circuits in args.circuits:
+        for layout in args.layout or CIRCUIT_ENTITIES:
+            # 毎回値が変わり、全ての状態が書き込まれる
+            config = SimulatorConfig(
+                circuits=circuits, value_period=1e-6, seed=args.seed
+            )
+            async with simulator_process(config) as port:
+                result = await run_layout(layout, circuits, args.cycles, port)
+            print(
+                f"{circuits:>8} {layout:>8} {result['entities']:>8} "
+                f"{result['startup'] * 1000:>11.1f} {result['states']:>10.1f} "
+                f"{result['attributes']:>9} {result['size'] / 1024:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
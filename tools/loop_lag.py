@@ -0,0 +1,152 @@
+"""Measure how long update cycles block the event loop for each parser executor.
+
+Runs full update cycles against the simulator (in its own process) while a
+probe task sleeps for a millisecond at a time and records how late it wakes
+up, and the time the coordinator spent parsing on the event loop. Parsing
+inline on the event loop (as before the executor) is compared with the
+thread and process executors.
+
+Usage:
+    python tools/loop_lag.py --circuits 40 200 --cycles 10
+    python tools/loop_lag.py --mode inline thread  # プロセスを使わない
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchmark import simulator_process
+from custom_components.ecomane.const import (
+    OPTION_PARSER_EXECUTOR,
+    PARSER_EXECUTOR_PROCESS,
+    PARSER_EXECUTOR_THREAD,
+)
+from custom_components.ecomane.coordinator import EcoManeDataCoordinator
+from ecomane_simulator import SimulatorConfig
+
+_T = TypeVar("_T")
+
+MODE_INLINE = "inline"
+MODES = [MODE_INLINE, PARSER_EXECUTOR_THREAD, PARSER_EXECUTOR_PROCESS]
+PROBE_INTERVAL = 0.001  # 遅れを測るための sleep: 1ミリ秒
+STALL = 0.001  # この時間を超える遅れを event loop の停止とみなす: 1ミリ秒
+
+
+class InlineParseCoordinator(EcoManeDataCoordinator):
+    """Coordinator that parses on the event loop, as before the executor."""
+
+    async def _async_parse(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Decode and parse response bodies on the event loop."""
+        start = time.perf_counter()
+        result = func(*args)
+        self._record_loop_time(func.__name__, time.perf_counter() - start)
+        return result
+
+
+async def probe(lags: list[float], stop: asyncio.Event) -> None:
+    """Record how late each short sleep wakes up."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(max(time.perf_counter() - start - PROBE_INTERVAL, 0.0))
+
+
+async def measure(
+    mode: str, circuits: int, cycles: int, config: SimulatorConfig
+) -> dict[str, float]:
+    """Run update cycles in a mode and summarize the loop lag."""
+    config.circuits = circuits
+    async with simulator_process(config) as port:
+        with tempfile.TemporaryDirectory() as config_dir:
+            hass = HomeAssistant(config_dir)
+            if mode == MODE_INLINE:
+                coordinator: EcoManeDataCoordinator = InlineParseCoordinator(
+                    hass, f"127.0.0.1:{port}", {}
+                )
+            else:
+                coordinator = EcoManeDataCoordinator(
+                    hass, f"127.0.0.1:{port}", {OPTION_PARSER_EXECUTOR: mode}
+                )
+            lags: list[float] = []
+            try:
+                # 1回目はページ数の取得と worker の起動を含むため計測しない
+                try:
+                    await coordinator._async_update_data()
+                except UpdateFailed:
+                    pass
+                stop = asyncio.Event()
+                task = asyncio.create_task(probe(lags, stop))
+                latencies: list[float] = []
+                parse_times: list[float] = []
+                for _ in range(cycles):
+                    # 全種別 (電力・電力量・使用量) を更新対象にする
+                    coordinator._tier_last_refresh.clear()
+                    start = time.perf_counter()
+                    try:
+                        await coordinator._async_update_data()
+                    except UpdateFailed:
+                        pass
+                    latencies.append(time.perf_counter() - start)
+                    parse_times.append(coordinator._parse_loop_time)
+                stop.set()
+                await task
+            finally:
+                await coordinator.async_close()
+    lags.sort()
+    return {
+        "latency_mean": statistics.fmean(latencies),
+        # 1サイクルあたりの event loop 上の解析時間
+        "parse_loop": statistics.fmean(parse_times),
+        "lag_p50": lags[len(lags) // 2],
+        "lag_p99": lags[int(len(lags) * 0.99)],
+        "lag_max": lags[-1],
+        # 1サイクルあたりに event loop が止まっていた時間の合計
+        "blocked": sum(lag for lag in lags if lag > STALL) / cycles,
+    }
+
+
+async def main() -> None:
+    """Run the measurement from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--circuits", type=int, nargs="+", default=[40, 200])
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--mode", choices=MODES, nargs="+", default=MODES)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"{'circuits':>8} {'mode':>8} {'latency ms':>11} {'parse ms':>9} "
+        f"{'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'blocked ms':>11}"
+    )
+    for circuits in args.circuits:
+        for mode in args.mode:
+            # 毎回値が変わり、全ページの解析が必要になる
+            config = SimulatorConfig(
+                latency=args.latency, value_period=1e-6, seed=args.seed
+            )
+            result = await measure(mode, circuits, args.cycles, config)
+            print(
+                f"{circuits:>8} {mode:>8} {result['latency_mean'] * 1000:>11.1f} "
+                f"{result['parse_loop'] * 1000:>9.1f} "
+                f"{result['lag_p50'] * 1000:>8.2f} {result['lag_p99'] * 1000:>8.2f} "
+                f"{result['lag_max'] * 1000:>8.2f} {result['blocked'] * 1000:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+"""Microbenchmark the single-pass page parsers against BeautifulSoup.
+
+Parses the pages served by the simulator with both parsers and reports the
+time per page, the speedup and whether the results agree.
+
+Usage:
+    python tools/parser_benchmark.py
+    python tools/parser_benchmark.py --number 2000 --repeat 7
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+import sys
+import timeit
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from custom_components.ecomane.const import ENCODING
+from custom_components.ecomane.parser import (
+    _bs_parse_circuit_page,
+    _bs_parse_energy_page,
+    _bs_parse_usage_page,
+    _fast_parse_circuit_page,
+    _fast_parse_energy_page,
+    _fast_parse_usage_page,
+)
+from ecomane_simulator import USAGE_KEYS, EcoManeSimulator, SimulatorConfig
+
+
+def pages() -> dict[str, str]:
+    """Usage, circuit and energy pages as served by the simulator."""
+    simulator = EcoManeSimulator(SimulatorConfig(circuits=8))
+    return {
+        "ecoTopMoni.cgi": simulator.usage_html(),
+        "elecCheck_6000.cgi": simulator.circuit_page_html(1),
+        "resultGraphDiv_4242.cgi": simulator.energy_html(0),
+    }
+
+
+def best(function: Callable[[], Any], number: int, repeat: int) -> float:
+    """Best time of a call (seconds)."""
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = pages()
+    cases: list[tuple[str, Callable[[str], Any], Callable[[str], Any]]] = [
+        (
+            "ecoTopMoni.cgi",
+            lambda text: _fast_parse_usage_page(text, USAGE_KEYS),
+            lambda text: _bs_parse_usage_page(text, USAGE_KEYS),
+        ),
+        ("elecCheck_6000.cgi", _fast_parse_circuit_page, _bs_parse_circuit_page),
+        ("resultGraphDiv_4242.cgi", _fast_parse_energy_page, _bs_parse_energy_page),
+    ]
+    print(
+        f"{'page':<24} {'bytes':>6} {'fast µs':>9} {'bs4 µs':>9} "
+        f"{'speedup':>8} {'parity':>7}"
+    )
+    for name, fast, soup in cases:
+        text = texts[name]
+        fast_time = best(partial(fast, text), args.number, args.repeat)
+        soup_time = best(partial(soup, text), args.number, args.repeat)
+        print(
+            f"{name:<24} {len(text.encode(ENCODING)):>6} "
+            f"{fast_time * 1e6:>9.1f} {soup_time * 1e6:>9.1f} "
+            f"{soup_time / fast_time:>7.1f}x {fast(text) == soup(text)!s:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
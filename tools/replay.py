@@ -0,0 +1,53 @@
+"""Replay a capture archive through the Eco Mane parsers.
+
+Reads the responses saved by the capture option (ecomane_capture/<entry_id>
+in the Home Assistant configuration directory) and parses them at full
+speed, reporting the throughput and the responses that could not be parsed.
+
+Usage:
+    python tools/replay.py /config/ecomane_capture/<entry_id> --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.ecomane.capture import read_archive, replay_archive
+from custom_components.ecomane.coordinator import ecomane_usage_sensors_descs
+
+
+def main() -> None:
+    """Replay an archive from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("archive", type=Path)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    # 読み込みの時間を含めないよう先に全て読む
+    responses = list(read_archive(args.archive))
+    usage_keys = [desc.key for desc in ecomane_usage_sensors_descs]
+    print(f"{len(responses)} responses in {args.archive}")
+    print(
+        f"{'run':>4} {'responses':>10} {'failures':>9} {'MB':>8} {'seconds':>8} {'MB/s':>8}"
+    )
+    for run in range(1, args.repeat + 1):
+        stats = replay_archive(iter(responses), usage_keys)
+        print(
+            f"{run:>4} {sum(stats.responses.values()):>10} "
+            f"{sum(stats.failures.values()):>9} {stats.bytes_parsed / 1e6:>8.2f} "
+            f"{stats.seconds:>8.3f} {stats.throughput / 1e6:>8.2f}"
+        )
+    for endpoint, count in stats.responses.items():
+        print(
+            f"  {endpoint}: {count} responses, {stats.failures.get(endpoint, 0)} failures"
+        )
+
+
+if __name__ == "__main__":
+    main()